@@ -11,10 +11,16 @@
     functions.
     For readers that do not support either "__no_tag__", "__unknown_tag__" or both,
     delete these tags from self.specific_doc_readers when overriding init_specific_doc_readers.
+    Documents are composed with LibYAML's C composer when PyYAML was built with it.
+    Otherwise, if config var PARSED_YAML_CACHE_DIR is defined, composed documents are pickled there, keyed
+    by the checksum of the file's name and text, so reading an unchanged file again skips parsing.
 """
 
 import os
 import io
+import pickle
+import hashlib
+from pathlib import Path
 import yaml
 from contextlib import contextmanager
 import urllib.error
@@ -52,6 +58,14 @@ class YamlNodeStack(object):
 
 
 class YamlReader(object):
+    # the C composer creates the same nodes (and marks) as the pure python one, only much faster
+    yaml_loader = getattr(yaml, "CLoader", yaml.Loader)
+    # unpickling composed nodes is ~3 times faster than the pure python composer,
+    # but slower than the C composer, so the cache is only used if LibYAML is not available
+    use_parsed_yaml_cache = yaml_loader is yaml.Loader
+    parsed_yaml_cache_version = 1
+    parsed_yaml_cache_max_files = 64
+
     def __init__(self, config_vars) -> None:
         self.config_vars = config_vars
         self.path_searcher = None
@@ -147,7 +161,7 @@ class YamlReader(object):
         pass
 
     def read_yaml_from_stream(self, the_stream, *args, **kwargs):
-        for a_node in yaml.compose_all(the_stream):
+        for a_node in self.compose_yaml_documents(the_stream):
             with kwargs['node-stack'](a_node):
                 try:
                     self.read_yaml_from_node(a_node, *args, **kwargs)
@@ -155,6 +169,60 @@ class YamlReader(object):
                     print(ex)
                     raise
 
+    def compose_yaml_documents(self, the_stream):
+        """ return the list of composed documents in the_stream,
+            from the parsed yaml cache if the same text was composed before
+        """
+        cache_file_path = self.parsed_yaml_cache_path(the_stream)
+        if cache_file_path is not None:
+            try:
+                with open(cache_file_path, "rb") as rfd:
+                    cache_key, retVal = pickle.load(rfd)
+                if cache_key == self.parsed_yaml_cache_key():
+                    os.utime(cache_file_path)  # so recently used files are not removed from the cache
+                    return retVal
+            except FileNotFoundError:
+                pass
+            except Exception as ex:  # a broken cache file is ignored and will be overwritten
+                log.debug(f"""failed to read parsed yaml cache {cache_file_path}; {ex}""")
+
+        retVal = list(yaml.compose_all(the_stream, Loader=self.yaml_loader))
+
+        if cache_file_path is not None:
+            self.write_parsed_yaml_cache(cache_file_path, retVal)
+        return retVal
+
+    def parsed_yaml_cache_key(self):
+        return YamlReader.parsed_yaml_cache_version, yaml.__version__, self.yaml_loader.__name__
+
+    def parsed_yaml_cache_path(self, the_stream):
+        """ return the path to the parsed yaml cache file for the_stream,
+            or None if PARSED_YAML_CACHE_DIR is not defined
+        """
+        retVal = None
+        cache_dir = self.config_vars.get("PARSED_YAML_CACHE_DIR", "").str()
+        if self.use_parsed_yaml_cache and cache_dir and self.config_vars.is_str_resolved(cache_dir) and hasattr(the_stream, "getvalue"):
+            checksum = hashlib.sha1()
+            # name of the file is part of the key since it's recorded in the nodes' marks
+            checksum.update(os.fspath(getattr(the_stream, "name", "")).encode("utf-8", errors="backslashreplace"))
+            checksum.update(the_stream.getvalue().encode("utf-8", errors="backslashreplace"))
+            retVal = Path(cache_dir, f"{checksum.hexdigest()}.pickle")
+        return retVal
+
+    def write_parsed_yaml_cache(self, cache_file_path, yaml_documents):
+        try:
+            cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file_path = cache_file_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(temp_file_path, "wb") as wfd:
+                pickle.dump((self.parsed_yaml_cache_key(), yaml_documents), wfd, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file_path, cache_file_path)
+            # keep only the most recently used cache files
+            cache_files = sorted(cache_file_path.parent.glob("*.pickle"), key=lambda f: f.stat().st_mtime, reverse=True)
+            for old_cache_file in cache_files[self.parsed_yaml_cache_max_files:]:
+                utils.safe_remove_file(old_cache_file)
+        except Exception as ex:  # failing to cache should not fail reading
+            log.debug(f"""failed to write parsed yaml cache {cache_file_path}; {ex}""")
+
     def read_json_from_stream(self, the_stream, *args, **kwargs):
         json_obj = json.load(the_stream)
         if isinstance(json_obj, dict):
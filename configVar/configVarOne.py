@@ -6,6 +6,7 @@
     Licensed under BSD 3 clause license, see LICENSE file for details.
 """
 import collections
+import itertools
 import os
 from pathlib import PurePath, Path
 from typing import List, Optional, Union
@@ -31,6 +32,10 @@ def something_to_bool(something, default=False):
     return retVal
 
 
+# generations are unique across all ConfigVars, so a generation identifies both a ConfigVar and the state of its values
+generation_counter = itertools.count(1)
+
+
 def value_is_set(name, value):
     """ for debugging 'set' of specific config var.
         in ConfigVar.__init__ call:
@@ -57,13 +62,16 @@ class ConfigVar:
         self.name - the name under which the owner keeps the ConfigVar
              name is useful for debugging, but in runtime ConfigVar has
              no (and should have no) use for it's own name
+        self.generation - changes whenever values are added or cleared, used by the owner
+            to know if resolved strings that referred to this ConfigVar are still valid
     """
-    __slots__ = ("owner", "name", "values", "callback_when_value_is_set", "callback_when_value_is_get", "dynamic")
+    __slots__ = ("owner", "name", "values", "callback_when_value_is_set", "callback_when_value_is_get", "dynamic", "generation")
 
     def __init__(self, owner, name: str, *values, callback_when_value_is_set=None, callback_when_value_is_get=None) -> None:
         self.owner = owner
         self.name = name
         self.dynamic = False
+        self.generation = next(generation_counter)
         self.set_callback_when_value_is_get(callback_when_value_is_get)
         self.set_callback_when_value_is_set(callback_when_value_is_set)
         self.values: List[str] = list()
@@ -84,6 +92,7 @@ class ConfigVar:
         else:
             self.callback_when_value_is_get = new_callback_when_value_is_get
             self.dynamic = True
+            self.generation = next(generation_counter)
 
     def __len__(self) -> int:
         """ :return: number of values """
@@ -232,6 +241,7 @@ class ConfigVar:
         """
         if value is not None:
             self.values.append(str(value))
+            self.generation = next(generation_counter)
             self.callback_when_value_is_set(self.name, value)
 
     def extend(self, values):
@@ -256,6 +266,7 @@ class ConfigVar:
         """ erase all values """
         if self.values:
             self.values.clear()
+            self.generation = next(generation_counter)
 
     def raw(self, join_sep: Optional[str] = "") -> Union[str, List[str]]:
         """ return the list of values unresolved"""
@@ -2,6 +2,7 @@
 
 import re
 import string
+import functools
 from collections import namedtuple
 from typing import Optional, Callable, Dict
 
@@ -262,6 +263,48 @@ def var_parse_imp(f_string, resolve_indicator='$'):
         raise ValueError(f"failed to parse {f_string}")
 
 
+simple_var_ref_re_template = r"""\((?P<variable_name>[A-Za-z0-9_\-]+)\)"""
+PARSE_TEMPLATE_CACHE_SIZE = 4096
+
+
+def var_parse_fast(f_string, resolve_indicator='$'):
+    """
+        Yield the same parsed sections as var_parse_imp, but jump from one resolve_indicator to the next
+        with str.find instead of going through the state machine char by char.
+        Simple variable references, e.g. "$(LOCAL_REPO_SYNC_DIR)", are matched with a regex.
+        When a reference that is not simple is found (params, array index, whitespace, nested parenthesis,
+        unterminated, resolve_indicator as last character...) the rest of the string, starting after the last yielded variable, is parsed by var_parse_imp.
+    """
+    simple_var_ref_re = re.compile(re.escape(resolve_indicator) + simple_var_ref_re_template)
+    literal_start = 0  # start of literal text that was not yielded yet
+    search_from = 0
+    while (indicator_pos := f_string.find(resolve_indicator, search_from)) != -1:
+        match = simple_var_ref_re.match(f_string, indicator_pos)
+        if match:
+            yield ParseRetVal(f_string[literal_start:indicator_pos], match.group(0), None, match.group('variable_name'), None, None, None, None)
+            literal_start = search_from = match.end()
+        elif f_string.startswith('(', indicator_pos+1) or indicator_pos+1 == len(f_string):
+            # var_parse_imp would be in literal state with empty literal text at literal_start
+            # so parsing the rest of the string from there yields the same results as parsing the whole string
+            yield from var_parse_imp(f_string[literal_start:], resolve_indicator)
+            return
+        else:  # resolve_indicator not followed by '(' is part of the literal text
+            search_from = indicator_pos + 1
+    yield ParseRetVal(f_string[literal_start:], None, None, None, None, None, None, None)
+
+
+@functools.lru_cache(maxsize=PARSE_TEMPLATE_CACHE_SIZE)
+def parse_template(f_string, resolve_indicator='$'):
+    """
+        Return the parsed sections of f_string, as a tuple of ParseRetVal, same as tuple(var_parse_imp(f_string)).
+        Parsing does not depend on the values of variables so the results for the same template can be reused
+        and are kept in a bounded LRU cache. parse_template.cache_info() gives the cache hits & misses.
+        positional_params & key_word_params of the returned values are shared, and should not be modified.
+    """
+    retVal = tuple(var_parse_fast(f_string, resolve_indicator))
+    return retVal
+
+
 def resolve_variable_1(parse_retVal, default=""):
     retVal = "".join(("!", parse_retVal.variable_name))
     if parse_retVal.array_index_str is not None:
@@ -278,7 +321,7 @@ def resolve_variable_2(parse_retVal, default=""):
 
 def parse_str(str_to_parse, var_resolver):
     parsed_str = ""
-    for parse_retVal in var_parse_imp(str_to_parse):
+    for parse_retVal in parse_template(str_to_parse):
         if parse_retVal.literal_text:
             parsed_str += parse_retVal.literal_text
         if parse_retVal.variable_name is not None:
@@ -9,12 +9,29 @@
 
 import os
 import re
+import threading
+from collections import namedtuple
 from contextlib import contextmanager
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 import aYaml
 from .configVarOne import ConfigVar
-from .configVarParser import var_parse_imp
+from .configVarParser import parse_template, var_parse_fast
+
+
+# a cached resolve: the resolved parts & statistics as returned by resolve_str_to_list_with_statistics
+# and the ((name, stack depth), generation) of every ConfigVar that was read while resolving,
+# stack depth and generation are -1 for names that were not found.
+ResolveCacheEntry = namedtuple("ResolveCacheEntry", ["resolved_parts", "num_literals", "num_variables", "dependencies"])
+
+
+class ResolveFrames(threading.local):
+    """ the resolves in progress, kept per thread so resolving from worker threads does not mix
+        the ConfigVars read by one thread into the dependencies recorded by another
+    """
+    def __init__(self) -> None:
+        self.dependencies: List[Dict] = list()  # ConfigVars read by the resolves in progress, inner-most last
+        self.params_scope_depth: Optional[int] = None  # stack depth of the outer-most scope pushed for ConfigVar params
 
 
 class ConfigVarStack:
@@ -39,11 +56,37 @@ class ConfigVarStack:
         simple resolve:
             when a string to resolve does not contain '$' it need not go through parsing
             this proved to save relatively a lot of resolve time (-60% ~500ms for large installations) - much more than caching
+        parse caching:
+            unlike resolved values, the parsing of a string to literals and variable references does not depend
+            on the values of ConfigVars, so parsed strings are cached by configVarParser.parse_template
+            without the need to ever purge the cache.
+        generation stamped caching:
+            each ConfigVar has a generation that changes whenever its values change, generations are
+            unique across all ConfigVars. A resolved string is cached together with the name, stack depth
+            and generation of every ConfigVar that was read while resolving it (including names that were not found).
+            A cached value is used only if looking up these names still finds the same generations at the same depths,
+            so nothing needs to be purged when ConfigVars are changed, added, removed or scopes are pushed and popped.
+            ConfigVars created by resolving a ConfigVar with params live in a scope that is popped right after,
+            reads of these are not recorded for the resolved string, and strings that were resolved
+            while reading them are not cached at all.
+            Strings that read a dynamic ConfigVar are never cached.
+            Strings longer than resolve_cache_max_str_len (e.g. whole blocks of a batch file) are unlikely to be
+            resolved again, and are neither cached nor parsed through the parse cache.
+            The cache is used only by the main thread, other threads resolve without it.
     """
+    resolve_cache_max_size = 16 * 1024
+    resolve_cache_max_str_len = 1024
+
     def __init__(self) -> None:
         self.var_list: List[Dict] = [dict()]
         self.resolve_counter: int = 0
         self.simple_resolve_counter: int = 0
+        self.use_resolve_cache = True
+        self.resolve_cache: Dict[Tuple[str, str], ResolveCacheEntry] = dict()
+        self.resolve_cache_hits: int = 0
+        self.resolve_cache_misses: int = 0
+        self.resolve_cache_invalidations: int = 0
+        self.resolve_frames = ResolveFrames()
         self.resolve_time: float = 0.0
         self.resolve_indicator = '$'  # default is $ but can be changed for special cases
 
@@ -195,6 +238,7 @@ class ConfigVarStack:
         """ clear all stack levels"""
         self.var_list.clear()
         self.var_list.append(dict())
+        self.resolve_cache.clear()
 
     def variable_params_to_config_vars(self, parser_retVal):
         """ parse positional and/or key word params and create
@@ -228,27 +272,131 @@ class ConfigVarStack:
 
         return array_range
 
+    def find_config_var(self, key: str):
+        """ return the stack depth and the ConfigVar found by self[key], or (-1, None) if key is not found """
+        depth = len(self.var_list)
+        for var_dict in reversed(self.var_list):
+            depth -= 1
+            if key in var_dict:
+                return depth, var_dict[key]
+        return -1, None
+
+    def find_config_var_for_resolve(self, key: str):
+        """ same as find_config_var, and record the ConfigVar's generation as a dependency of the resolves in progress """
+        depth, config_var = self.find_config_var(key)
+        if self.resolve_dependencies:
+            if config_var is None:
+                generation = -1
+            elif config_var.dynamic:
+                generation = None  # dynamic values cannot be cached
+            else:
+                generation = config_var.generation
+            self.resolve_dependencies[-1][(key, depth)] = generation
+        return config_var
+
+    @property
+    def resolve_dependencies(self) -> List[Dict]:
+        return self.resolve_frames.dependencies
+
+    @property
+    def params_scope_depth(self) -> Optional[int]:
+        return self.resolve_frames.params_scope_depth
+
+    @params_scope_depth.setter
+    def params_scope_depth(self, value: Optional[int]) -> None:
+        self.resolve_frames.params_scope_depth = value
+
+    def resolve_dependencies_are_current(self, dependencies):
+        for (key, depth), generation in dependencies.items():
+            found_depth, config_var = self.find_config_var(key)
+            if found_depth != depth or (config_var is not None and config_var.generation != generation):
+                return False
+        return True
+
+    def resolve_dependencies_are_cacheable(self, dependencies):
+        retVal = None not in dependencies.values()
+        if retVal and self.params_scope_depth is not None:
+            retVal = all(depth < self.params_scope_depth for _, depth in dependencies)
+        return retVal
+
     def resolve_str_to_list_with_statistics(self, str_to_resolve):
         """ resolve a string to a list, return the list and also the number of variables and literal in the list.
             Returning these statistic can help with debugging
         """
+        cache_key = (str_to_resolve, self.resolve_indicator)
+        if self.use_resolve_cache and len(str_to_resolve) <= self.resolve_cache_max_str_len \
+                and threading.current_thread() is threading.main_thread():
+            cache_entry = self.resolve_cache.get(cache_key)
+            if cache_entry is not None:
+                if self.resolve_dependencies_are_current(cache_entry.dependencies):
+                    self.resolve_cache_hits += 1
+                    if self.resolve_dependencies:
+                        self.resolve_dependencies[-1].update(cache_entry.dependencies)
+                    return list(cache_entry.resolved_parts), cache_entry.num_literals, cache_entry.num_variables
+                self.resolve_cache_invalidations += 1
+            self.resolve_cache_misses += 1
+        else:
+            return self.resolve_str_to_list_with_statistics_no_cache(str_to_resolve)
+
+        self.resolve_dependencies.append(dict())
+        try:
+            resolved_parts, num_literals, num_variables = self.resolve_str_to_list_with_statistics_no_cache(str_to_resolve)
+        finally:
+            dependencies = self.resolve_dependencies.pop()
+        if self.resolve_dependencies:
+            self.resolve_dependencies[-1].update(dependencies)
+        if self.resolve_dependencies_are_cacheable(dependencies):
+            if len(self.resolve_cache) >= self.resolve_cache_max_size:
+                del self.resolve_cache[next(iter(self.resolve_cache))]  # oldest entry
+            self.resolve_cache[cache_key] = ResolveCacheEntry(tuple(resolved_parts), num_literals, num_variables, dependencies)
+        return resolved_parts, num_literals, num_variables
+
+    def resolve_str_to_list_with_statistics_no_cache(self, str_to_resolve):
         resolved_parts = list()
         num_literals = 0
         num_variables = 0
-        for parser_retVal in var_parse_imp(str_to_resolve, self.resolve_indicator):
+        if len(str_to_resolve) <= self.resolve_cache_max_str_len:
+            parsed_sections = parse_template(str_to_resolve, self.resolve_indicator)
+        else:
+            parsed_sections = var_parse_fast(str_to_resolve, self.resolve_indicator)
+        for parser_retVal in parsed_sections:
             if parser_retVal.literal_text:
                 resolved_parts.append(parser_retVal.literal_text)
                 num_literals += 1
             if parser_retVal.variable_name:
-                if parser_retVal.variable_name in self:
+                if self.find_config_var_for_resolve(parser_retVal.variable_name) is not None:
                     with self.push_scope_context(use_cache=False):
-                        array_range = self.variable_params_to_config_vars(parser_retVal)
-                        resolved_parts.extend(list(self[parser_retVal.variable_name])[array_range[0]:array_range[1]])
+                        resolved_parts.extend(self.resolve_variable_with_params(parser_retVal))
                 else:
                     resolved_parts.append(parser_retVal.variable_str)
                 num_variables += 1
         return resolved_parts, num_literals, num_variables
 
+    def resolve_variable_with_params(self, parser_retVal):
+        """ resolve a variable reference in the scope pushed for the variable's params.
+            ConfigVars read from this scope are not dependencies of the string being resolved.
+        """
+        if not self.resolve_dependencies:  # dependencies are not recorded when resolve cache is not used
+            array_range = self.variable_params_to_config_vars(parser_retVal)
+            retVal = list(self[parser_retVal.variable_name])[array_range[0]:array_range[1]]
+            return retVal
+
+        scope_depth = len(self.var_list) - 1
+        previous_params_scope_depth = self.params_scope_depth
+        if previous_params_scope_depth is None:
+            self.params_scope_depth = scope_depth
+        self.resolve_dependencies.append(dict())
+        try:
+            array_range = self.variable_params_to_config_vars(parser_retVal)
+            config_var = self.find_config_var_for_resolve(parser_retVal.variable_name)
+            retVal = list(config_var)[array_range[0]:array_range[1]]
+        finally:
+            self.params_scope_depth = previous_params_scope_depth
+            scope_dependencies = self.resolve_dependencies.pop()
+        self.resolve_dependencies[-1].update((key_and_depth, generation) for key_and_depth, generation in scope_dependencies.items()
+                                             if key_and_depth[1] < scope_depth)
+        return retVal
+
     def resolve_str(self, val_to_resolve: str) -> str:
         #start_time = time.perf_counter()
 
@@ -405,6 +553,13 @@ class ConfigVarStack:
             print(f"{len(self)} ConfigVars")
             print(f"{self.resolve_counter} resolves")
             print(f"{self.simple_resolve_counter} simple resolves")
+            parse_cache_info = parse_template.cache_info()
+            num_parses = parse_cache_info.hits + parse_cache_info.misses
+            parse_hit_rate = (parse_cache_info.hits / num_parses)*100 if num_parses else 0.0
+            print(f"{num_parses} parsed resolves, {parse_cache_info.currsize} parsed strings cached, {parse_hit_rate:.1f}% parse cache hits")
+            num_cache_lookups = self.resolve_cache_hits + self.resolve_cache_misses
+            resolve_hit_rate = (self.resolve_cache_hits / num_cache_lookups)*100 if num_cache_lookups else 0.0
+            print(f"{len(self.resolve_cache)} resolved strings cached, {resolve_hit_rate:.1f}% resolve cache hits, {self.resolve_cache_invalidations} invalidated")
             average_resolve_ms = (self.resolve_time / self.resolve_counter)*1000 if self.resolve_counter else 0.0
             print(f"{average_resolve_ms:.4}ms per resolve")
             print(f"{self.resolve_time:.3}sec total resolve time")
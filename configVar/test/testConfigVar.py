@@ -5,6 +5,9 @@ import os
 import unittest
 from pathlib import Path
 import time, datetime
+import io
+import tempfile
+from unittest import mock
 
 sys.path.append(os.path.realpath(os.path.join(__file__, os.pardir, os.pardir, os.pardir)))
 sys.path.append(os.path.realpath(os.path.join(__file__, os.pardir, os.pardir)))
@@ -111,6 +114,29 @@ class TestConfigVar(unittest.TestCase):
         self.assertEqual.__self__.maxDiff = None
         self.assertEqual(out_lines, expected_lines)
 
+    def test_readFile_parsed_yaml_cache(self):
+        input_file_path = Path(__file__).parent.joinpath("test_input.yaml")
+        with tempfile.TemporaryDirectory() as cache_dir:
+            variables_as_yaml = list()
+            for i in range(2):
+                config_vars.clear()
+                config_vars["PARSED_YAML_CACHE_DIR"] = cache_dir
+                reader = ConfigVarYamlReader(config_vars)
+                reader.use_parsed_yaml_cache = True
+                if i == 0:
+                    reader.read_yaml_file(input_file_path)
+                    self.assertEqual(len(list(Path(cache_dir).glob("*.pickle"))), 1)
+                else:  # second time the documents should come from the cache
+                    with mock.patch("yaml.compose_all", side_effect=AssertionError("yaml should not be parsed")):
+                        reader.read_yaml_file(input_file_path)
+                del config_vars["READ_YAML_FILES"]
+                del config_vars["PARSED_YAML_CACHE_DIR"]
+                yaml_doc = aYaml.YamlDumpDocWrap(config_vars.repr_for_yaml(), '!define', "", explicit_start=True, sort_mappings=True)
+                out_stream = io.StringIO()
+                aYaml.writeAsYaml(yaml_doc, out_stream)
+                variables_as_yaml.append(out_stream.getvalue())
+            self.assertEqual(variables_as_yaml[0], variables_as_yaml[1])
+
     def test_resolve_time(self):
         config_vars["PRINT_STATISTICS"] = "True"
 
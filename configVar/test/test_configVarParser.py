@@ -0,0 +1,52 @@
+#!/usr/bin/env python3.12
+
+import sys
+import os
+import random
+import unittest
+
+sys.path.append(os.path.realpath(os.path.join(__file__, os.pardir, os.pardir, os.pardir)))
+
+import utils  # do not remove, prevents cyclic import problems
+from configVar.configVarParser import var_parse_imp, var_parse_fast, parse_template
+
+
+strs_to_parse = ["$(a[0)", "$(a[)", "$(a[!)", "$(A)", "$(A", "$(a)$(b<>)$(c)", "$(a[0])", "$(a[])", "$(a[!])",
+                 "$(a[0]", "$(a[]", "$(a[!]", "", "chunga chunga", "chunga$chunga",
+                 "abc$(def)gh$kl$(BOO<aaaa=bbbb>)nm$(op", "$(MAMA_MIA)", "$(MAMA_MIA<>)", "$(MAMA_MIA<K=k>)",
+                 "$(MAMA_MIA<K=k,L=l>)", "aaa $(DDD<GGG=SSS>bonbon", "aaa $(DDD<GGG=SSS>bonbon$(LILI)",
+                 "aaa $(DDD<GGG=SSS> )", "aaa $(DDD <GGG=SSS>)", "aaa $(DDD <GGG=SSS> )", "$(a)$(b)$(c)",
+                 "$(a)$(b$(c)", "1$(a)2$(b)3$(c)4", "1$(a)2$(b3$(c)4", "$(a)$(b<)>)$(c)",
+                 "$$(a)", "$()", "$(a(b))c", "$(a-b)/$(C_D[-1])/$(E<1, 2, x=y>)", "$(WAVES_DIR_FOR_$(TARGET_OS))"]
+
+
+class TestConfigVarParser(unittest.TestCase):
+    def test_fast_parse_same_as_state_machine(self):
+        for str_to_parse in strs_to_parse:
+            self.assertEqual(list(var_parse_fast(str_to_parse)), list(var_parse_imp(str_to_parse)), str_to_parse)
+
+    def test_fast_parse_random_strings(self):
+        rand = random.Random(1234)
+        alphabet = "$()<>[]=, aZ0_-!"
+        for _ in range(5000):
+            str_to_parse = "".join(rand.choice(alphabet) for _ in range(rand.randint(0, 16)))
+            self.assertEqual(list(var_parse_fast(str_to_parse)), list(var_parse_imp(str_to_parse)), str_to_parse)
+
+    def test_other_resolve_indicator(self):
+        for str_to_parse in ("@(A)/@(B<x>)", "$(A)@(B)", "@@(A)@"):
+            self.assertEqual(list(var_parse_fast(str_to_parse, '@')), list(var_parse_imp(str_to_parse, '@')), str_to_parse)
+
+    def test_parse_template_cache(self):
+        parse_template.cache_clear()
+        first = parse_template("$(LOCAL_REPO_SYNC_DIR)/$(REPO_NAME)")
+        second = parse_template("$(LOCAL_REPO_SYNC_DIR)/$(REPO_NAME)")
+        self.assertIs(first, second)
+        self.assertEqual(first, tuple(var_parse_imp("$(LOCAL_REPO_SYNC_DIR)/$(REPO_NAME)")))
+        # resolve_indicator is part of the cache key
+        self.assertEqual(parse_template("$(A)", '@'), tuple(var_parse_imp("$(A)", '@')))
+        cache_info = parse_template.cache_info()
+        self.assertEqual((cache_info.hits, cache_info.misses), (1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3.12
+
+import sys
+import os
+import random
+import threading
+import unittest
+
+sys.path.append(os.path.realpath(os.path.join(__file__, os.pardir, os.pardir, os.pardir)))
+
+import utils  # do not remove, prevents cyclic import problems
+from configVar.configVarStack import ConfigVarStack
+
+
+class TestResolveCache(unittest.TestCase):
+    def setUp(self):
+        self.config_vars = ConfigVarStack()
+        self.config_vars["SYNC_DIR"] = "$(CACHE_DIR)/$(REPO_NAME)/sync"
+        self.config_vars["CACHE_DIR"] = "/cache"
+        self.config_vars["REPO_NAME"] = "V15"
+
+    def test_hit(self):
+        self.assertEqual(self.config_vars.resolve_str("$(SYNC_DIR)/Mac"), "/cache/V15/sync/Mac")
+        hits_before = self.config_vars.resolve_cache_hits
+        self.assertEqual(self.config_vars.resolve_str("$(SYNC_DIR)/Mac"), "/cache/V15/sync/Mac")
+        self.assertEqual(self.config_vars.resolve_cache_hits, hits_before + 1)
+
+    def test_changed_values(self):
+        self.assertEqual(self.config_vars["SYNC_DIR"].str(), "/cache/V15/sync")
+        self.config_vars["REPO_NAME"] = "V16"
+        self.assertEqual(self.config_vars["SYNC_DIR"].str(), "/cache/V16/sync")
+        self.config_vars["REPO_NAME"].append("b")
+        self.assertEqual(self.config_vars["SYNC_DIR"].str(), "/cache/V16b/sync")
+        self.config_vars["REPO_NAME"].clear()
+        self.assertEqual(self.config_vars["SYNC_DIR"].str(), "/cache//sync")
+        del self.config_vars["REPO_NAME"]
+        self.assertEqual(self.config_vars["SYNC_DIR"].str(), "/cache/$(REPO_NAME)/sync")
+        self.config_vars["REPO_NAME"] = "V17"
+        self.assertEqual(self.config_vars["SYNC_DIR"].str(), "/cache/V17/sync")
+        self.assertGreater(self.config_vars.resolve_cache_invalidations, 0)
+
+    def test_scopes(self):
+        self.assertEqual(self.config_vars["SYNC_DIR"].str(), "/cache/V15/sync")
+        with self.config_vars.push_scope_context():
+            self.config_vars["REPO_NAME"] = "V16"
+            self.assertEqual(self.config_vars["SYNC_DIR"].str(), "/cache/V16/sync")
+        self.assertEqual(self.config_vars["SYNC_DIR"].str(), "/cache/V15/sync")
+
+    def test_params(self):
+        self.config_vars["FOLDER"] = "$(SYNC_DIR)/$(__FOLDER_1__)/$(sub)"
+        self.assertEqual(self.config_vars.resolve_str("$(FOLDER<Mac, sub=a>)"), "/cache/V15/sync/Mac/a")
+        self.assertEqual(self.config_vars.resolve_str("$(FOLDER<Win, sub=b>)"), "/cache/V15/sync/Win/b")
+        hits_before = self.config_vars.resolve_cache_hits
+        self.assertEqual(self.config_vars.resolve_str("$(FOLDER<Mac, sub=a>)"), "/cache/V15/sync/Mac/a")
+        self.assertEqual(self.config_vars.resolve_cache_hits, hits_before + 1)
+        self.config_vars["REPO_NAME"] = "V16"
+        self.assertEqual(self.config_vars.resolve_str("$(FOLDER<Mac, sub=a>)"), "/cache/V16/sync/Mac/a")
+        # param ConfigVars are gone after resolving
+        self.assertEqual(self.config_vars.resolve_str("$(sub)"), "$(sub)")
+        # strings that depend on params are not cached
+        self.assertFalse(any("$(sub)" in key[0] for key in self.config_vars.resolve_cache if key[0] != "$(sub)"))
+
+    def test_dynamic_not_cached(self):
+        counter = iter(range(100))
+        self.config_vars.set_dynamic_var("__COUNTER__", lambda val: str(next(counter)))
+        self.config_vars["COUNTED"] = "count $(__COUNTER__)"
+        self.assertEqual(self.config_vars["COUNTED"].str(), "count 0")
+        self.assertEqual(self.config_vars["COUNTED"].str(), "count 1")
+        self.assertNotIn(("count $(__COUNTER__)", "$"), self.config_vars.resolve_cache)
+
+    def test_worker_thread(self):
+        """ a worker thread resolving while the main thread is in the middle of a resolve does not see or change
+            the main thread's dependencies, and does not use the cache
+        """
+        worker_results = dict()
+
+        def worker():
+            worker_results["dependencies"] = list(self.config_vars.resolve_dependencies)
+            worker_results["resolved"] = self.config_vars.resolve_str("$(SYNC_DIR)/Win")
+
+        def resolve_in_worker(val):
+            main_dependencies = [dict(frame) for frame in self.config_vars.resolve_dependencies]
+            worker_thread = threading.Thread(target=worker)
+            worker_thread.start()
+            worker_thread.join()
+            worker_results["main_dependencies_unchanged"] = main_dependencies == self.config_vars.resolve_dependencies
+            return "x"
+        self.config_vars.set_dynamic_var("__RESOLVE_IN_WORKER__", resolve_in_worker)
+        self.assertEqual(self.config_vars.resolve_str("$(REPO_NAME)/$(__RESOLVE_IN_WORKER__)"), "V15/x")
+        self.assertEqual(worker_results, {"dependencies": [], "resolved": "/cache/V15/sync/Win", "main_dependencies_unchanged": True})
+        self.assertNotIn(("$(SYNC_DIR)/Win", "$"), self.config_vars.resolve_cache)
+
+    def test_same_as_without_cache(self):
+        rand = random.Random(4321)
+        # each ConfigVar refers only to ConfigVars before it, so there are no recursive references
+        values = {"A": ["a", "", "$(nope)"],
+                  "B": ["b", "$(A)", "$(A)$(A)"],
+                  "C": ["$(B)-$(A)", "$(B[0])", "$(E<$(A)>)"],
+                  "D": ["$(C)", "$(F<$(B), x=$(C)>)", "$(C[-1])/$(A)"]}
+        cache_vars = ConfigVarStack()
+        no_cache_vars = ConfigVarStack()
+        no_cache_vars.use_resolve_cache = False
+        for config_vars in (cache_vars, no_cache_vars):
+            config_vars["F"] = "$(x)/$(__F_1__)"
+        for _ in range(3000):
+            name = rand.choice(list(values))
+            match rand.randrange(6):
+                case 0 | 1:
+                    new_values = rand.sample(values[name], rand.randint(1, 2))
+                    for config_vars in (cache_vars, no_cache_vars):
+                        config_vars[name] = new_values
+                case 2 if name in no_cache_vars:
+                    for config_vars in (cache_vars, no_cache_vars):
+                        del config_vars[name]
+                case 3 if cache_vars.stack_size() < 3:
+                    for config_vars in (cache_vars, no_cache_vars):
+                        config_vars.push_scope()
+                case 4 if cache_vars.stack_size() > 1:
+                    for config_vars in (cache_vars, no_cache_vars):
+                        config_vars.pop_scope()
+                case 5:
+                    new_value = rand.choice(["e$(__E_1__)", "$(B)", "$(A)"])
+                    for config_vars in (cache_vars, no_cache_vars):
+                        config_vars["E"] = new_value
+            to_resolve = rand.choice(["$(A)", "$(B)", "$(C)", "$(D)", "$(D)/$(E<$(C)>)", "$(C<x=1>)"])
+            self.assertEqual(cache_vars.resolve_str_to_list(to_resolve), no_cache_vars.resolve_str_to_list(to_resolve), to_resolve)
+        self.assertGreater(cache_vars.resolve_cache_hits, 0)
+        self.assertGreater(cache_vars.resolve_cache_invalidations, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
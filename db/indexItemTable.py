@@ -7,8 +7,11 @@ import io
 from collections import OrderedDict
 from collections import defaultdict
 import re
+import itertools
+import hashlib
+import json
 import yaml
-from typing import List
+from typing import List, Tuple
 import logging
 log = logging.getLogger()
 
@@ -48,6 +51,12 @@ class IndexItemsTable(object):
         self.add_triggers()
         self.add_views()
         self.defines_for_iids = dict()  # defines which are specific to an iid
+        # config vars that reading index nodes depended on: ('template', name) -> raw template text,
+        # ('depends', unresolved value) -> resolved values. Used to check that index db cache is still valid
+        self.config_var_dependencies = dict()
+        # (cache_file, cache_key, first detail _id, last detail _id) for each index db cache read or written,
+        # used by resolve_index_items to cache the rows added by resolving
+        self.index_db_caches = list()
         self.iid_location_in_file = dict()  # for debugging, used in read_index_node_one_by_one to track duplicate IIDs
 
     def __del__(self):
@@ -435,7 +444,6 @@ class IndexItemsTable(object):
     def resolve_inheritance(self) -> None:
         # utils.add_to_actions_stack("resolving inheritance")
         inherit_order, inherit_dict = self.prepare_inherit_order()
-        resolve_items_script = ""
         if bool(config_vars.get("DEBUG_INDEX_DB", False)):
             with self.db.transaction() as curs:
                 for iid in inherit_order:
@@ -446,10 +454,18 @@ class IndexItemsTable(object):
                         log.info(f"db exception resolving inheritance for {iid}, {ex}")
                 curs.execute("""CREATE INDEX IF NOT EXISTS ix_svn_index_item_detail_t_owner_iid ON index_item_detail_t(owner_iid)""")
         else:
-            for iid in inherit_order:
-                resolve_items_script += self.get_resolve_item_query_for_iid(iid, inherit_dict[iid])
+            inherited_details = self.get_inherited_details(inherit_order, inherit_dict)
             with self.db.transaction() as curs:
-                curs.executescript(resolve_items_script) #to imporove perofrmance we first execute, then create the index
+                curs.executemany("""
+                    INSERT INTO index_item_detail_t(original_iid,
+                                                    owner_iid,
+                                                    os_id,
+                                                    detail_name,
+                                                    detail_value,
+                                                    generation,
+                                                    tag,
+                                                    os_is_active)
+                    VALUES(?,?,?,?,?,?,?,?)""", inherited_details)  #to imporove perofrmance we first insert, then create the index
                 curs.execute("""CREATE INDEX IF NOT EXISTS ix_svn_index_item_detail_t_owner_iid ON index_item_detail_t(owner_iid)""")
                 # creating these indexes did not improve DB performance and added 20s to preparing __ALL_GUIDS__ installation
                 #curs.execute("""CREATE INDEX IF NOT EXISTS ix_svn_index_item_detail_t_value ON index_item_detail_t(detail_value)""")
@@ -492,17 +508,66 @@ class IndexItemsTable(object):
         check_inherit_order()
         return inherit_order, inherit_dict
 
+    def get_inherited_details(self, inherit_order, inherit_dict) -> List[Tuple]:
+        """ calculate in memory the details each iid inherits, same as running
+            get_resolve_item_query_for_iid for each iid in inherit_order, but with one SELECT.
+            Since inherit_order has each iid after the iids it inherits from, details an iid inherited are
+            already in details_by_owner when it's own inheritors are resolved.
+            A detail inherited again through another path (diamond inheritance) is skipped, like
+            INSERT OR IGNORE does in get_resolve_item_query_for_iid.
+            :return: list of rows ready to be inserted to index_item_detail_t
+        """
+        retVal = list()
+        details_by_owner = defaultdict(list)
+        query_text = f"""
+            SELECT index_item_detail_t._id,
+                   original_iid,
+                   owner_iid,
+                   os_id,
+                   detail_name,
+                   detail_value,
+                   generation,
+                   tag,
+                   index_item_detail_t.os_is_active
+            FROM index_item_detail_t
+              JOIN active_operating_systems_t
+                ON active_operating_systems_t._id=index_item_detail_t.os_id
+                AND active_operating_systems_t.os_is_active = 1
+            WHERE detail_name NOT IN {utils.quoteme_single_list_for_sql(self.not_inherit_details)}
+            ORDER BY index_item_detail_t._id
+            """
+        next_id = 0
+        with self.db.selection() as curs:
+            for _id, original_iid, owner_iid, os_id, detail_name, detail_value, generation, tag, os_is_active in curs.execute(query_text):
+                details_by_owner[owner_iid].append((_id, original_iid, os_id, detail_name, detail_value, generation, tag, os_is_active))
+                next_id = _id + 1
+
+        for iid in inherit_order:
+            # details are ordered by _id as if they were inserted to the table
+            inherited = sorted(itertools.chain.from_iterable(details_by_owner.get(from_iid, ()) for from_iid in dict.fromkeys(inherit_dict[iid])), key=lambda detail: detail[0])
+            already_inherited = set()
+            for _id, original_iid, os_id, detail_name, detail_value, generation, tag, os_is_active in inherited:
+                unique_key = (original_iid, os_id, detail_name, detail_value, generation)
+                if unique_key in already_inherited:
+                    continue
+                already_inherited.add(unique_key)
+                details_by_owner[iid].append((next_id, original_iid, os_id, detail_name, detail_value, generation+1, tag, os_is_active))
+                retVal.append((original_iid, iid, os_id, detail_name, detail_value, generation+1, tag, os_is_active))
+                next_id += 1
+        return retVal
+
     def get_resolve_item_query_for_iid(self, iid_to_resolve, inherit_from_iids, generation=0):
         # print("-"*generation, " ", item_to_resolve.iid)
+        # OR IGNORE: with diamond inheritance the same detail is inherited through two paths, but should be inserted once
         query_text = """
-            INSERT INTO index_item_detail_t(original_iid,
-                                            owner_iid,
-                                            os_id,
-                                            detail_name,
-                                            detail_value,
-                                            generation,
-                                            tag,
-                                            os_is_active)
+            INSERT OR IGNORE INTO index_item_detail_t(original_iid,
+                                                      owner_iid,
+                                                      os_id,
+                                                      detail_name,
+                                                      detail_value,
+                                                      generation,
+                                                      tag,
+                                                      os_is_active)
             SELECT
               inherited_details_t.original_iid,
               {inheritor_iid} AS owner_id,
@@ -585,6 +650,8 @@ class IndexItemsTable(object):
                                     elif detail_name == "depends":
                                         # depends might have an item which is a list of items when resolving
                                         values = config_vars.resolve_str_to_list(value)
+                                        if values != [value]:
+                                            self.config_var_dependencies[('depends', value)] = json.dumps(values)
                                         for value in values:
                                             new_detail = (the_iid, the_iid, self.os_names_to_num[the_os], detail_name, value, tag)
                                             details.append(new_detail)
@@ -646,6 +713,205 @@ class IndexItemsTable(object):
             curs.execute("""CREATE UNIQUE INDEX IF NOT EXISTS ix_index_item_t_iid ON index_item_t(iid)""")
             curs.execute("""CREATE INDEX IF NOT EXISTS ix_index_item_t_owner_iid ON index_item_detail_t(owner_iid)""")
 
+    # columns copied to/from index db cache, these are all the columns set by read_index_node
+    index_db_cache_item_columns = ("iid", "from_index")
+    index_db_cache_detail_columns = ("original_iid", "owner_iid", "os_id", "detail_name", "detail_value", "tag")
+
+    def get_max_ids(self) -> Tuple[int, int]:
+        """ return the highest _id in index_item_t and index_item_detail_t,
+            rows added later will have higher _id
+        """
+        max_item_id = self.db.curs.execute("""SELECT COALESCE(MAX(_id), 0) FROM index_item_t""").fetchone()[0]
+        max_detail_id = self.db.curs.execute("""SELECT COALESCE(MAX(_id), 0) FROM index_item_detail_t""").fetchone()[0]
+        return max_item_id, max_detail_id
+
+    def config_var_dependencies_are_current(self, config_var_dependencies) -> bool:
+        """ return True if the config vars in config_var_dependencies still have the values they had when the index was read """
+        for (kind, name), value in config_var_dependencies:
+            match kind:
+                case 'template':
+                    current_value = config_vars[name].raw() if name in config_vars else None
+                case 'depends':
+                    current_value = json.dumps(config_vars.resolve_str_to_list(name))
+                case _:
+                    current_value = None
+            if current_value != value:
+                log.info(f"index db cache is stale, {kind} {name} changed")
+                return False
+        return True
+
+    def load_index_db_cache(self, cache_file, cache_key, progress_callback=None) -> bool:
+        """ copy index rows and iid specific defines from cache_file if cache_file exists and was saved with cache_key,
+            and the config vars that reading the index depended on did not change.
+            return True if rows were copied.
+        """
+        retVal = False
+        if not os.path.isfile(cache_file):
+            return retVal
+        item_columns = ", ".join(self.index_db_cache_item_columns)
+        detail_columns = ", ".join(self.index_db_cache_detail_columns)
+        try:
+            self.db.curs.execute("""ATTACH DATABASE ? AS index_cache_db""", (os.fspath(cache_file),))
+            try:
+                saved_key = self.db.curs.execute("""SELECT cache_key FROM index_cache_db.cache_info_t""").fetchone()[0]
+                if saved_key == cache_key:
+                    config_var_dependencies = {(kind, name): value for kind, name, value in
+                                               self.db.curs.execute("""SELECT kind, name, value FROM index_cache_db.config_var_dependencies_t""")}
+                    if self.config_var_dependencies_are_current(config_var_dependencies.items()):
+                        defines_for_iids = {iid: yaml.compose(define_text) for iid, define_text in
+                                            self.db.curs.execute("""SELECT iid, define_text FROM index_cache_db.defines_for_iids_t ORDER BY _id""")}
+                        description = f"read index db cache from {cache_file}"
+                        from_ids = self.get_max_ids()
+                        with self.db.transaction(description=description, progress_callback=progress_callback) as curs:
+                            curs.execute(f"""INSERT INTO main.index_item_t ({item_columns})
+                                             SELECT {item_columns} FROM index_cache_db.index_item_t ORDER BY _id""")
+                            curs.execute(f"""INSERT INTO main.index_item_detail_t ({detail_columns})
+                                             SELECT {detail_columns} FROM index_cache_db.index_item_detail_t ORDER BY _id""")
+                            curs.execute("""CREATE UNIQUE INDEX IF NOT EXISTS ix_index_item_t_iid ON index_item_t(iid)""")
+                            curs.execute("""CREATE INDEX IF NOT EXISTS ix_index_item_t_owner_iid ON index_item_detail_t(owner_iid)""")
+                            retVal = True
+                        if retVal:
+                            self.defines_for_iids.update(defines_for_iids)
+                            self.config_var_dependencies.update(config_var_dependencies)
+                            self.index_db_caches.append((os.fspath(cache_file), cache_key, from_ids[1]+1, self.get_max_ids()[1]))
+            finally:
+                self.db.curs.execute("""DETACH DATABASE index_cache_db""")
+            if retVal:
+                os.utime(cache_file)  # so recently used files are not removed from the cache
+        except Exception as ex:  # a broken or incompatible cache is ignored and index is read from the yaml
+            log.info(f"ignoring index db cache {cache_file}; {ex}")
+            retVal = False
+        return retVal
+
+    def save_index_db_cache(self, cache_file, cache_key, from_ids=(0, 0), defines_for_iids=None, config_var_dependencies=None) -> None:
+        """ write rows of index_item_t and index_item_detail_t with _id higher than from_ids to cache_file,
+            together with defines_for_iids (as yaml text) and config_var_dependencies, tagged with cache_key.
+            cache is written to a temp file and renamed, so a partial cache is never used.
+        """
+        cache_file = os.fspath(cache_file)
+        temp_cache_file = cache_file + ".tmp"
+        utils.safe_remove_file(temp_cache_file)
+        item_columns = ", ".join(self.index_db_cache_item_columns)
+        detail_columns = ", ".join(self.index_db_cache_detail_columns)
+        cache_written = False
+        try:
+            defines_texts = [(iid, yaml.serialize(define_node)) for iid, define_node in (defines_for_iids or {}).items()]
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            self.db.curs.execute("""ATTACH DATABASE ? AS index_cache_db""", (temp_cache_file,))
+            try:
+                with self.db.transaction(description=f"write index db cache {cache_file}") as curs:
+                    curs.execute(f"""CREATE TABLE index_cache_db.index_item_t AS
+                                     SELECT _id, {item_columns} FROM main.index_item_t WHERE _id > ?""", (from_ids[0],))
+                    curs.execute(f"""CREATE TABLE index_cache_db.index_item_detail_t AS
+                                     SELECT _id, {detail_columns} FROM main.index_item_detail_t WHERE _id > ?""", (from_ids[1],))
+                    curs.execute("""CREATE TABLE index_cache_db.defines_for_iids_t (_id INTEGER PRIMARY KEY, iid TEXT, define_text TEXT)""")
+                    curs.executemany("""INSERT INTO index_cache_db.defines_for_iids_t (iid, define_text) VALUES (?, ?)""", defines_texts)
+                    curs.execute("""CREATE TABLE index_cache_db.config_var_dependencies_t (kind TEXT, name TEXT, value TEXT)""")
+                    curs.executemany("""INSERT INTO index_cache_db.config_var_dependencies_t (kind, name, value) VALUES (?, ?, ?)""",
+                                     [(kind, name, value) for (kind, name), value in (config_var_dependencies or {}).items()])
+                    curs.execute("""CREATE TABLE index_cache_db.cache_info_t (cache_key TEXT)""")
+                    curs.execute("""INSERT INTO index_cache_db.cache_info_t (cache_key) VALUES (?)""", (cache_key,))
+                    cache_written = True
+            finally:
+                self.db.curs.execute("""DETACH DATABASE index_cache_db""")
+            if cache_written:
+                os.replace(temp_cache_file, cache_file)
+                utils.chown_on_path(cache_file)
+                self.index_db_caches.append((cache_file, cache_key, from_ids[1]+1, self.get_max_ids()[1]))
+            else:
+                utils.safe_remove_file(temp_cache_file)
+        except (sqlite3.Error, yaml.YAMLError, OSError) as ex:
+            log.info(f"failed to write index db cache {cache_file}; {ex}")
+            utils.safe_remove_file(temp_cache_file)
+
+    def resolve_index_items(self, with_default_items=False, iids_to_ignore=()) -> None:
+        """ resolve_inheritance and, if with_default_items, create_default_items.
+            When the index was read through an index db cache, the rows added by resolving are saved to the same
+            cache file, and copied from there when the tables are in the same state before resolving.
+        """
+        resolved_key = self.resolved_index_db_cache_key(with_default_items, iids_to_ignore)
+        if resolved_key is not None and self.load_resolved_index_db_cache(resolved_key):
+            log.info("read resolved index from cache")
+            return
+        from_ids = self.get_max_ids()
+        self.resolve_inheritance()
+        if with_default_items:
+            self.create_default_items(iids_to_ignore=iids_to_ignore)
+        if resolved_key is not None:
+            self.save_resolved_index_db_cache(resolved_key, from_ids)
+
+    def resolved_index_db_cache_key(self, with_default_items, iids_to_ignore):
+        """ return a key for the state of the tables before resolving, or None if the index was not read through exactly one index db cache.
+            Rows copied from the cache are represented by the cache key, all other rows (e.g. from require.yaml)
+            and the active oses are checksummed.
+        """
+        retVal = None
+        if len(self.index_db_caches) == 1:
+            cache_file, cache_key, first_detail_id, last_detail_id = self.index_db_caches[0]
+            rows_checksum = hashlib.sha1()
+            with self.db.selection() as curs:
+                for query_text, params in (("""SELECT * FROM active_operating_systems_t ORDER BY _id""", ()),
+                                           ("""SELECT * FROM index_item_t ORDER BY _id""", ()),
+                                           ("""SELECT * FROM index_item_detail_t WHERE _id NOT BETWEEN ? AND ? ORDER BY _id""", (first_detail_id, last_detail_id))):
+                    for row in curs.execute(query_text, params):
+                        rows_checksum.update(repr(tuple(row)).encode('utf-8'))
+            retVal = f"{cache_key}-{rows_checksum.hexdigest()}-{int(with_default_items)}-{','.join(sorted(iids_to_ignore))}"
+        return retVal
+
+    def table_columns_without_id(self, table_name):
+        return [column_info[1] for column_info in self.db.curs.execute(f"""PRAGMA main.table_info({table_name})""") if column_info[1] != "_id"]
+
+    def load_resolved_index_db_cache(self, resolved_key) -> bool:
+        """ copy the rows added by resolving from the index db cache, if they were saved with resolved_key.
+            return True if rows were copied.
+        """
+        retVal = False
+        cache_file = self.index_db_caches[0][0]
+        item_columns = ", ".join(self.table_columns_without_id("index_item_t"))
+        detail_columns = ", ".join(self.table_columns_without_id("index_item_detail_t"))
+        try:
+            self.db.curs.execute("""ATTACH DATABASE ? AS index_cache_db""", (cache_file,))
+            try:
+                has_resolved = self.db.curs.execute("""SELECT name FROM index_cache_db.sqlite_master WHERE name='resolved_info_t'""").fetchone()
+                if has_resolved is not None:
+                    row = self.db.curs.execute("""SELECT resolved_key FROM index_cache_db.resolved_info_t""").fetchone()
+                    if row is not None and row[0] == resolved_key:
+                        with self.db.transaction(description=f"read resolved index from {cache_file}") as curs:
+                            curs.execute(f"""INSERT INTO main.index_item_t ({item_columns})
+                                             SELECT {item_columns} FROM index_cache_db.resolved_item_t ORDER BY _id""")
+                            curs.execute(f"""INSERT INTO main.index_item_detail_t ({detail_columns})
+                                             SELECT {detail_columns} FROM index_cache_db.resolved_item_detail_t ORDER BY _id""")
+                            curs.execute("""CREATE INDEX IF NOT EXISTS ix_svn_index_item_detail_t_owner_iid ON index_item_detail_t(owner_iid)""")
+                            retVal = True
+            finally:
+                self.db.curs.execute("""DETACH DATABASE index_cache_db""")
+        except (sqlite3.Error, OSError) as ex:
+            log.info(f"ignoring resolved index in db cache {cache_file}; {ex}")
+            retVal = False
+        return retVal
+
+    def save_resolved_index_db_cache(self, resolved_key, from_ids) -> None:
+        """ write rows of index_item_t and index_item_detail_t with _id higher than from_ids to the index db cache,
+            replacing rows saved before with a different resolved_key.
+        """
+        cache_file = self.index_db_caches[0][0]
+        try:
+            self.db.curs.execute("""ATTACH DATABASE ? AS index_cache_db""", (cache_file,))
+            try:
+                with self.db.transaction(description=f"write resolved index to {cache_file}") as curs:
+                    for table_name in ("resolved_info_t", "resolved_item_t", "resolved_item_detail_t"):
+                        curs.execute(f"""DROP TABLE IF EXISTS index_cache_db.{table_name}""")
+                    curs.execute("""CREATE TABLE index_cache_db.resolved_item_t AS
+                                    SELECT * FROM main.index_item_t WHERE _id > ?""", (from_ids[0],))
+                    curs.execute("""CREATE TABLE index_cache_db.resolved_item_detail_t AS
+                                    SELECT * FROM main.index_item_detail_t WHERE _id > ?""", (from_ids[1],))
+                    curs.execute("""CREATE TABLE index_cache_db.resolved_info_t (resolved_key TEXT)""")
+                    curs.execute("""INSERT INTO index_cache_db.resolved_info_t (resolved_key) VALUES (?)""", (resolved_key,))
+            finally:
+                self.db.curs.execute("""DETACH DATABASE index_cache_db""")
+        except (sqlite3.Error, OSError) as ex:
+            log.info(f"failed to write resolved index to db cache {cache_file}; {ex}")
+
     def read_index_node_one_by_one(self, a_node: yaml.MappingNode, **kwargs) -> None:
         """ for debugging problems with reading index.yaml use read_index_node_one_by_one instead of read_index_node"""
         insert_item_q =        """INSERT INTO index_item_t(iid, from_index) VALUES(?, ?)"""
@@ -726,6 +992,7 @@ class IndexItemsTable(object):
             template_args = template_match['template_args'].split(',')
             template_args = [a.strip() for a in template_args]
             template_text = config_vars[template_name].raw()
+            self.config_var_dependencies[('template', template_name)] = template_text
             yaml_stream = io.StringIO("--- !index\n")
             for instance_node in instances_node.value:
                 with kwargs['node-stack'](instance_node):
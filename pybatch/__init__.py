@@ -6,9 +6,9 @@ from .conditionalBatchCommands import If, IsFile, IsDir, IsSymlink, IsEq, IsNotE
     IsEnvironVarEq, IsEnvironVarNotEq, IsConfigVarDefined, ForInConfigVar
 from .copyBatchCommands import CopyDirContentsToDir, CopyDirToDir, CopyFileToDir, CopyFileToFile, MoveDirToDir, \
     RenameFile, CopyBundle, CopyGlobToDir, MoveFileToDir
-from .downloadBatchCommands import DownloadFileAndCheckChecksum, DownloadManager
+from .downloadBatchCommands import DownloadFileAndCheckChecksum, DownloadManager, ParallelDownload
 from .fileSystemBatchCommands import AppendFileToFile, Cd, ChFlags, Chmod, Chown, MakeDir, MakeRandomDirs, \
-    MakeRandomDataFile, touch, Touch, Unlock, Ls, FileSizes, SplitFile, FixAllPermissions, Glober
+    MakeRandomDataFile, touch, Touch, Unlock, Ls, FileSizes, SplitFile, JoinFile, FixAllPermissions, Glober
 from .info_mapBatchCommands import CheckDownloadFolderChecksum, SetExecPermissionsInSyncFolder, CreateSyncFolders, \
     InfoMapFullWriter, InfoMapSplitWriter, SetBaseRevision, IndexYamlReader, CopySpecificRepoRev, CreateRepoRevFile, \
     ShortIndexYamlCreator
@@ -6,6 +6,7 @@ import re
 import logging
 import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from .baseClasses import PythonBatchCommandBase
 from .reportingBatchCommands import Stage, PythonBatchRuntime, PatchPyBatchWithTimings
@@ -14,6 +15,7 @@ from .subprocessBatchCommands import ShellCommand
 from pybatch import *
 
 from configVar import config_vars
+from configVar.configVarParser import var_parse_fast
 import utils
 
 
@@ -27,12 +29,59 @@ def camel_to_snake_case(identifier):
     return identifier2
 
 
+# characters that can follow $( in a reference that replace_unresolved_with_native_var_pattern will replace
+unresolved_ref_tail_re = re.compile(r"""[\w\s()\[\]]*""")
+
+
+def resolve_in_blocks(text_pieces, which_os, block_size):
+    """ resolve the text of text_pieces with config_vars.resolve_str and replace_unresolved_with_native_var_pattern,
+        yield the resolved text in blocks of about block_size characters.
+        The result is the same as resolving "".join(text_pieces) at once, because
+        text is split only where it is not inside a variable reference:
+        - before resolving, only where the config var parser is not in the middle of a $(...) reference
+        - before replacing with native var pattern, only before a $( that might start a reference
+    """
+    def split_for_resolve():
+        block = list()
+        block_len = 0
+        next_split_len = block_size
+        for piece in text_pieces:
+            block.append(piece)
+            block_len += len(piece)
+            if block_len >= next_split_len:
+                block_str = "".join(block)
+                *_, last_section = var_parse_fast(block_str, config_vars.resolve_indicator)
+                if last_section.variable_str is None:  # parser is not inside a variable reference
+                    yield block_str
+                    block.clear()
+                    block_len = 0
+                    next_split_len = block_size
+                else:
+                    block = [block_str]
+                    next_split_len = block_len + block_size
+        yield "".join(block)
+
+    unresolved_ref_start = config_vars.resolve_indicator + "("
+    carry = ""
+    for block_str in split_for_resolve():
+        resolved_str = carry + config_vars.resolve_str(block_str)
+        split_pos = resolved_str.rfind(unresolved_ref_start)
+        if split_pos == -1 or not unresolved_ref_tail_re.fullmatch(resolved_str, split_pos + len(unresolved_ref_start)):
+            split_pos = len(resolved_str)
+        carry = resolved_str[split_pos:]
+        if split_pos:
+            yield config_vars.replace_unresolved_with_native_var_pattern(resolved_str[:split_pos], which_os)
+    if carry:
+        yield config_vars.replace_unresolved_with_native_var_pattern(carry, which_os)
+
+
 class PythonBatchCommandAccum(PythonBatchCommandBase):
 
     section_order = ("prepare", "assign", "begin", "links", "upload", "pre", "pre-sync", "sync", "post-sync",
                      "copy", "post-copy", "remove", "admin", "pre_doit", "doit", "post_doit", "end",
                      "post", "epilog")
     special_sections = ("assign", "epilog")
+    repr_block_size = 64 * 1024  # the main part of the batch file is resolved in blocks of about this size
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -113,60 +162,13 @@ class PythonBatchCommandAccum(PythonBatchCommandBase):
         return cc
 
     def __repr__(self):
-        single_indent = "    "
-        running_progress_count = self.initial_progress
-        PythonBatchCommandBase.config_vars_for_repr = config_vars  # so __repr__ of object derived from PythonBatchCommandBase will resolve config_vars values
-
-        def _create_unique_obj_name(obj, prog_count):
-            try:
-                _create_unique_obj_name.instance_counter += 1
-            except AttributeError:
-                _create_unique_obj_name.instance_counter = 1
-            obj_name = camel_to_snake_case(f"{obj.__class__.__name__}_{_create_unique_obj_name.instance_counter:03}_{prog_count}")
-            return obj_name
-
-        def _remark_helper(*the_remarks):
-            retVal = ", ".join(str(remark) for remark in filter(None, the_remarks))
-            if retVal:
-                retVal = f"""  # {retVal}"""
-            return retVal
-
-        def _repr_helper(batch_items, io_str, indent):
-            nonlocal running_progress_count
-            indent_str = single_indent*indent
-            if isinstance(batch_items, list):
-                for item in batch_items:
-                    _repr_helper(item, io_str, indent)
-            else:
-                running_progress_count += batch_items.own_progress_count
-                batch_items.prog_num = running_progress_count
-                match batch_items.call__call__, batch_items.is_context_manager:
-                    case False, False:
-                        text_to_write = f"""{indent_str}{repr(batch_items)}\n"""
-                        io_str.write(text_to_write)
-                        _repr_helper(batch_items.child_batch_commands, io_str, indent)
-                    case False, True:
-                        text_to_write = f"""{indent_str}with {repr(batch_items)}:\n"""
-                        io_str.write(text_to_write)
-                        if batch_items.child_batch_commands:
-                            _repr_helper(batch_items.child_batch_commands, io_str, indent+1)
-                        else:
-                            text_to_write = f"""{indent_str}{single_indent}pass\n"""
-                            io_str.write(text_to_write)
-                    case True, False:
-                        text_to_write = f"""{indent_str}{repr(batch_items)}()\n"""
-                        io_str.write(text_to_write)
-                        _repr_helper(batch_items.child_batch_commands, io_str, indent)
-                    case True, True:
-                        obj_name = _create_unique_obj_name(batch_items, running_progress_count)
-                        text_to_write = f"""{indent_str}with {repr(batch_items)} as {obj_name}:\n"""
-                        io_str.write(text_to_write)
-
-                        text_to_write = f"""{indent_str}{single_indent}{obj_name}("""
-                        text_to_write += ")\n"
-                        io_str.write(text_to_write)
-                        _repr_helper(batch_items.child_batch_commands, io_str, indent+1)
+        the_whole_repr = "".join(self.iter_repr())
+        return the_whole_repr
 
+    def _prepare_for_repr(self):
+        """ add the epilog commands and calculate PythonBatchCommandBase.total_progress,
+            must be called before the batch file is written or run
+        """
         self.set_current_section('epilog')
         self += PatchPyBatchWithTimings(config_vars['__MAIN_OUT_FILE__'])
 
@@ -176,36 +178,150 @@ class PythonBatchCommandAccum(PythonBatchCommandBase):
             PythonBatchCommandBase.total_progress += progress_count_for_section
         PythonBatchCommandBase.total_progress += 1  # count the PythonBatchRuntime, todo: a better way to add PythonBatchRuntime's progress count to the total
 
-        prolog_str = io.StringIO()
-        prolog_str.write(self._python_opening_code())
-        if 'assign' in self.sections:
-            _repr_helper(self.sections['assign'], prolog_str, 0)
+        self.repr_progress_count = self.initial_progress
+        self.repr_obj_name_counter = 0
 
-        main_str = io.StringIO()
+    def _main_runtimer(self):
+        """ PythonBatchRuntime containing all non special sections """
         the_command = config_vars.get("__MAIN_COMMAND__", "woolly mammoth")
         runtimer = PythonBatchRuntime(the_command)
         for section_name in PythonBatchCommandAccum.section_order:
             if section_name in self.sections:
                 if section_name not in PythonBatchCommandAccum.special_sections:
                     runtimer += self.sections[section_name]
-        main_str.write("\n")
-        _repr_helper(runtimer, main_str, 0)
-
-        epilog_str = io.StringIO()
-        if 'epilog' in self.sections:
-            main_str.write("\n")
-            _repr_helper(self.sections['epilog'], epilog_str, 0)
-
-        epilog_str.write(self._python_closing_code())
-
-        main_str_resolved = config_vars.resolve_str(main_str.getvalue())
-        main_str_resolved = config_vars.replace_unresolved_with_native_var_pattern(main_str_resolved, list(config_vars["__CURRENT_OS_NAMES__"])[0])
-
-        the_whole_repr = prolog_str.getvalue()+main_str_resolved+epilog_str.getvalue()
+        return runtimer
+
+    def _create_unique_obj_name(self, obj, prog_count):
+        self.repr_obj_name_counter += 1
+        obj_name = camel_to_snake_case(f"{obj.__class__.__name__}_{self.repr_obj_name_counter:03}_{prog_count}")
+        return obj_name
+
+    def _repr_helper(self, batch_items, indent, which_os=None, item_reprs=None):
+        """ yield the text of batch_items and their children and set their prog_num.
+            If which_os is given the text of each command is resolved, the same way resolve_in_blocks does.
+            If item_reprs is given the text of each command is added to item_reprs[id(command)], see _run_helper.
+        """
+        single_indent = "    "
+        indent_str = single_indent*indent
+        if isinstance(batch_items, list):
+            for item in batch_items:
+                yield from self._repr_helper(item, indent, which_os, item_reprs)
+        else:
+            self.repr_progress_count += batch_items.own_progress_count
+            batch_items.prog_num = self.repr_progress_count
+            PythonBatchCommandBase.config_vars_for_repr = config_vars  # so __repr__ of object derived from PythonBatchCommandBase will resolve config_vars values
+            try:
+                item_repr = repr(batch_items)
+            finally:
+                PythonBatchCommandBase.config_vars_for_repr = None
+            if which_os is not None:
+                item_repr = config_vars.replace_unresolved_with_native_var_pattern(config_vars.resolve_str(item_repr), which_os)
+            if item_reprs is not None:
+                item_reprs.setdefault(id(batch_items), list()).append(item_repr)
+            match batch_items.call__call__, batch_items.is_context_manager:
+                case False, False:
+                    yield f"""{indent_str}{item_repr}\n"""
+                    yield from self._repr_helper(batch_items.child_batch_commands, indent, which_os, item_reprs)
+                case False, True:
+                    yield f"""{indent_str}with {item_repr}:\n"""
+                    if batch_items.child_batch_commands:
+                        yield from self._repr_helper(batch_items.child_batch_commands, indent+1, which_os, item_reprs)
+                    else:
+                        yield f"""{indent_str}{single_indent}pass\n"""
+                case True, False:
+                    yield f"""{indent_str}{item_repr}()\n"""
+                    yield from self._repr_helper(batch_items.child_batch_commands, indent, which_os, item_reprs)
+                case True, True:
+                    obj_name = self._create_unique_obj_name(batch_items, self.repr_progress_count)
+                    yield f"""{indent_str}with {item_repr} as {obj_name}:\n"""
+                    yield f"""{indent_str}{single_indent}{obj_name}()\n"""
+                    yield from self._repr_helper(batch_items.child_batch_commands, indent+1, which_os, item_reprs)
+
+    def _run_helper(self, batch_items, item_reprs, run_namespace):
+        """ recreate batch_items and their children from their text in item_reprs and run them in run_namespace,
+            the same way the batch file runs them: __enter__/__call__/__exit__ are called by the same with statements
+            so progress and exceptions are handled the same.
+        """
+        if isinstance(batch_items, list):
+            for item in batch_items:
+                self._run_helper(item, item_reprs, run_namespace)
+        else:
+            item_repr = item_reprs[id(batch_items)].pop(0)
+            match batch_items.call__call__, batch_items.is_context_manager:
+                case False, False:
+                    exec(item_repr, run_namespace)
+                    self._run_helper(batch_items.child_batch_commands, item_reprs, run_namespace)
+                case False, True:
+                    with eval(item_repr, run_namespace):
+                        self._run_helper(batch_items.child_batch_commands, item_reprs, run_namespace)
+                case True, False:
+                    eval(item_repr, run_namespace)()
+                    self._run_helper(batch_items.child_batch_commands, item_reprs, run_namespace)
+                case True, True:
+                    with eval(item_repr, run_namespace) as batch_obj:
+                        batch_obj()
+                        self._run_helper(batch_items.child_batch_commands, item_reprs, run_namespace)
+
+    def iter_repr(self):
+        """ yield the text of the batch file piece by piece, so it can be written to file
+            without holding the whole text in memory. "".join(self.iter_repr()) is the same as repr(self).
+            The main part is resolved in blocks of about repr_block_size characters, see resolve_in_blocks.
+        """
+        def _main_repr():
+            yield "\n"
+            yield from self._repr_helper(runtimer, 0)
+            if 'epilog' in self.sections:
+                yield "\n"
+
+        self._prepare_for_repr()
+        yield self._python_opening_code()
+        if 'assign' in self.sections:
+            yield from self._repr_helper(self.sections['assign'], 0)
 
-        PythonBatchCommandBase.config_vars_for_repr = None
+        runtimer = self._main_runtimer()
+        yield from resolve_in_blocks(_main_repr(), list(config_vars["__CURRENT_OS_NAMES__"])[0], self.repr_block_size)
 
-        return the_whole_repr
+        if 'epilog' in self.sections:
+            yield from self._repr_helper(self.sections['epilog'], 0)
+        yield self._python_closing_code()
+
+    def run_in_process(self, out_file):
+        """ run the batch commands in this process, instead of writing the batch file, reading it back,
+            compiling and exec'ing it. Each command is recreated from it's resolved text, which is the same text
+            written to the batch file, and run with the same progress numbers and exception handling as the batch file.
+            All texts are resolved before the first command runs, as they would be when writing the batch file,
+            so commands changing config vars or kwargs defaults while running do not change the texts of later commands.
+            The batch file is written to out_file for audit, in another thread while the commands run.
+            The epilog runs after out_file was written, since PatchPyBatchWithTimings reads it.
+        """
+        item_reprs = dict()
+        self._prepare_for_repr()
+        batch_text = [self._python_opening_code()]
+        if 'assign' in self.sections:
+            batch_text.extend(self._repr_helper(self.sections['assign'], 0, item_reprs=item_reprs))
+        runtimer = self._main_runtimer()
+        batch_text.append("\n")
+        batch_text.extend(self._repr_helper(runtimer, 0, which_os=list(config_vars["__CURRENT_OS_NAMES__"])[0], item_reprs=item_reprs))
+        if 'epilog' in self.sections:
+            batch_text.append("\n")
+            batch_text.extend(self._repr_helper(self.sections['epilog'], 0, item_reprs=item_reprs))
+        batch_text.append(self._python_closing_code())
+
+        def write_batch_text():
+            with utils.utf8_open_for_write(out_file, "w") as wfd:
+                wfd.writelines(batch_text)
+
+        run_namespace = {"__name__": __name__}
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batch_text_written = executor.submit(write_batch_text)
+            exec(batch_text[0], run_namespace)  # opening code
+            if 'assign' in self.sections:
+                self._run_helper(self.sections['assign'], item_reprs, run_namespace)
+            self._run_helper(runtimer, item_reprs, run_namespace)
+            batch_text_written.result()
+        if 'epilog' in self.sections:
+            self._run_helper(self.sections['epilog'], item_reprs, run_namespace)
+        exec(batch_text[-1], run_namespace)  # closing code
 
     def progress_msg_self(self):
         """ """
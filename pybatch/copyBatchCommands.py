@@ -3,6 +3,8 @@ import shutil
 from collections import defaultdict
 from packaging.version import Version
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from .fileSystemBatchCommands import *
 from .removeBatchCommands import RmFileOrDir
 from pathlib import Path
@@ -39,6 +41,7 @@ ignore_patterns: files and folders matching these patterns will not be copied.
 hard_links: if True will attempt to create hard links to original files instead of making a copy; default: True
 no_hard_link_patterns: files and folders matching this patterns will not be hard-linked even if hard_links=True
 no_flags_patterns: if a file matching one of these patterns exists in the destination, it's flags (hidden, system, read-only) will be removed
+copy_workers: number of threads copying or hard-linking files when copying a folder, folders are created in order before files are copied; default: RsyncClone's global copy workers, 1 if not set
 """
 
 
@@ -46,6 +49,8 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
     __global_no_hard_link_patterns = list()  # files and folders matching these patterns will not be hard-linked. Applicable for all instances of RsyncClone
     __global_avoid_copy_markers = list()     # if a file with one of these names exists in the folders and is identical to destination, copy will be avoided
     __global_no_flags_patterns = list()     # if a file with one of these names exists in the destination, it's flags (hidden, system, read-only) will be removed
+    __global_copy_workers = 1               # number of threads copying files in copy_tree, applicable for instances of RsyncClone that do not specify copy_workers
+    copy_chunk_size = 64                    # number of files each copy_tree_parallel thread copies in one go
 
     @classmethod
     def add_global_ignore_patterns(cls, more_copy_ignore_patterns: List):
@@ -63,6 +68,10 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
     def add_global_no_flags_patterns(cls, more_no_flags_patterns: List):
         cls.__global_no_flags_patterns.extend(more_no_flags_patterns)
 
+    @classmethod
+    def set_global_copy_workers(cls, num_copy_workers: int):
+        cls.__global_copy_workers = max(1, int(num_copy_workers))
+
     def __init__(self,
                  src,
                  dst,
@@ -78,6 +87,7 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
                  verbose=0,
                  dry_run=False,
                  copy_stat=False,
+                 copy_workers=None,
                  **kwargs):
         super().__init__(**kwargs)
         self.src = src
@@ -96,11 +106,15 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
         self.verbose = verbose
         self.dry_run = dry_run
         self.copy_stat = copy_stat
+        self.copy_workers = copy_workers
         self.top_source_does_not_exist = False  # will be set to true if source does not exist - saving doing work is ignore_if_not_exist is True
         self.top_destination_does_not_exist = False  # will be set to true if destination does not exist - saving many checks
 
         self._get_ignored_files_func = None
         self.statistics = defaultdict(int)
+        self.threads_lock = threading.Lock()  # guards statistics, hard_links_failed and _error_dict when copying with several copy_workers
+        self.pending_file_copies = None  # when copying with several copy_workers, copy_tree collects files to copy here
+        self.non_representative__dict__keys.extend(('threads_lock', 'pending_file_copies'))
         self.last_step = None
         self.last_src = self.src
         self.last_dst = self.dst
@@ -134,6 +148,7 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
         params.append(self.optional_named__init__param("verbose", self.verbose, 0))
         params.append(self.optional_named__init__param("dry_run", self.dry_run, False))
         params.append(self.optional_named__init__param("copy_stat", self.copy_stat, False))
+        params.append(self.optional_named__init__param("copy_workers", self.copy_workers, None))
         all_args.extend(filter(None, params))
 
     def progress_msg_self(self) -> str:
@@ -233,9 +248,23 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
             else:
                 self.copy_file_to_file(src_path, dst_path)
 
-    def should_copy_file(self, src: Path, dst: Path):
+    def increment_statistics(self, stat_name):
+        # copy_one_file might run on several threads
+        with self.threads_lock:
+            self.statistics[stat_name] += 1
+
+    def num_copy_workers(self) -> int:
+        retVal = self.copy_workers if self.copy_workers is not None else self.__global_copy_workers
+        return max(1, int(retVal))
+
+    def should_copy_file(self, src: Path, dst: Path, top_destination_does_not_exist=None):
+        """ top_destination_does_not_exist: when called from copy_tree_parallel's threads self.top_destination_does_not_exist
+            is no longer relevant, so it's value at the time the file was collected is passed instead
+        """
         retVal = True
-        if not self.top_destination_does_not_exist:
+        if top_destination_does_not_exist is None:
+            top_destination_does_not_exist = self.top_destination_does_not_exist
+        if not top_destination_does_not_exist:
             try:
                 dst_stats = dst.stat()
                 src_stats = src.stat()
@@ -252,7 +281,8 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
                         dst.chmod(dst_stats_mods)  # On Windows, files might have read-only bit set
                         dst.unlink(missing_ok=True)
                     except Exception as ex:
-                        self.who_locks_file_error_dict(None, dst, ex)
+                        with self.threads_lock:
+                            self.who_locks_file_error_dict(None, dst, ex)
             except Exception as ex:  # most likely dst.stat() failed because dst does not exist
                 retVal = True
         return retVal
@@ -272,18 +302,23 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
                 retVal = True
         return retVal
 
-    def copy_file_to_file(self, src: Path, dst: Path, follow_symlinks=True):
+    def copy_file_to_file(self, src: Path, dst: Path, follow_symlinks=True, top_destination_does_not_exist=None):
         """ copy the file src to the file dst. dst should either be an existing file
             or not exists at all - i.e. dst cannot be a folder. The parent folder of dst
             is assumed to exist
         """
         self.last_src, self.last_dst = src, dst
         self.doing = f"""copy file '{self.last_src}' to '{self.last_dst}'"""
+        return self.copy_one_file(src, dst, follow_symlinks, top_destination_does_not_exist)
 
-        if self.should_copy_file(src, dst):
+    def copy_one_file(self, src: Path, dst: Path, follow_symlinks=True, top_destination_does_not_exist=None):
+        """ the work of copy_file_to_file, called directly by copy_tree_parallel's threads.
+            Does not set last_src, last_dst or doing, other state shared by the threads is set under threads_lock.
+        """
+        if self.should_copy_file(src, dst, top_destination_does_not_exist):
             try:
                 if not self.should_hard_link_file(src):
-                    log.debug(f"copy file '{self.last_src}' to '{self.last_dst}'")
+                    log.debug(f"copy file '{src}' to '{dst}'")
                     if not self.dry_run:
                         _fast_copy_file(src, dst)
                         if self.copy_stat:
@@ -291,11 +326,12 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
                 else:  # try to create hard link
                     try:
                         self.dry_run or os.link(src, dst)
-                        log.debug(f"hard link file '{self.last_src}' to '{self.last_dst}'")
-                        self.statistics['hard_links'] += 1
+                        log.debug(f"hard link file '{src}' to '{dst}'")
+                        self.increment_statistics('hard_links')
                     except OSError as ose:
-                        self.hard_links_failed = True
-                        log.debug(f"copy file '{self.last_src}' to '{self.last_dst}'")
+                        with self.threads_lock:
+                            self.hard_links_failed = True
+                        log.debug(f"copy file '{src}' to '{dst}'")
 
                         if not self.dry_run:
                             _fast_copy_file(src, dst)
@@ -305,10 +341,11 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
                     src_st = src.stat()
                     os.chown(dst, src_st[stat.ST_UID], src_st[stat.ST_GID])
             except Exception as ex:
-                self.who_locks_file_error_dict(_fast_copy_file, dst)
+                with self.threads_lock:
+                    self.who_locks_file_error_dict(_fast_copy_file, dst)
                 raise
         else:
-            self.statistics['skipped_files'] += 1
+            self.increment_statistics('skipped_files')
         return dst
 
     def copy_file_to_dir(self, src: Path, dst: Path, follow_symlinks=True):
@@ -325,6 +362,9 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
     def copy_tree(self, src: Path, dst: Path):
         """ based on shutil.copytree
         """
+        if self.pending_file_copies is None and self.num_copy_workers() > 1:
+            return self.copy_tree_parallel(src, dst)
+
         self.last_src, self.last_dst = src, dst
         save_top_destination_does_not_exist = self.top_destination_does_not_exist
         self.top_destination_does_not_exist = self.top_destination_does_not_exist or not dst.exists()  # !
@@ -363,8 +403,11 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
                     self.copy_tree(src_item_path, dst_path)
                 else:
                     self.statistics['files'] += 1
-                    # Will raise a SpecialFileError for unsupported file types
-                    self.copy_file_to_file(src_item_path, dst_path)
+                    if self.pending_file_copies is not None:
+                        self.pending_file_copies.append((src_item_path, dst_path, self.top_destination_does_not_exist))
+                    else:
+                        # Will raise a SpecialFileError for unsupported file types
+                        self.copy_file_to_file(src_item_path, dst_path)
             # catch the Error from the recursive copytree so that we can
             # continue with other files
             except shutil.Error as err:
@@ -378,6 +421,62 @@ no_flags_patterns: if a file matching one of these patterns exists in the destin
         self.top_destination_does_not_exist = save_top_destination_does_not_exist
         return dst
 
+    def copy_tree_parallel(self, src: Path, dst: Path):
+        """ copy a folder with several threads:
+            first copy_tree goes over the source creating the destination folders in order (as well as symlinks,
+            ignored files and removing extraneous files) and collects the files to copy,
+            then files are copied or hard-linked by a pool of num_copy_workers() threads.
+            Errors from both stages are aggregated to one shutil.Error, just like copy_tree does.
+            The threads do not set last_src and last_dst, they are set to a failed file after the pool joins.
+        """
+        errors = []
+        self.pending_file_copies = list()
+        try:
+            try:
+                self.copy_tree(src, dst)
+            except shutil.Error as err:
+                errors.extend(err.args[0])
+            pending_file_copies = self.pending_file_copies
+        finally:
+            self.pending_file_copies = None
+
+        def copy_some_files(first_index, last_index):
+            """ copy a chunk of files, submitting files in chunks saves the overhead of a future per file """
+            retVal = list()
+            for src_path, dst_path, top_destination_does_not_exist in pending_file_copies[first_index:last_index]:
+                try:
+                    self.copy_one_file(src_path, dst_path, top_destination_does_not_exist=top_destination_does_not_exist)
+                    retVal.append(None)
+                except Exception as ex:
+                    retVal.append(ex)
+            return retVal
+
+        self.doing = f"""copy {len(pending_file_copies)} files from '{src}' to '{dst}'"""
+        num_workers = self.num_copy_workers()
+        chunk_size = max(1, min(self.copy_chunk_size, len(pending_file_copies) // num_workers))
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            chunk_futures = [executor.submit(copy_some_files, first_index, first_index + chunk_size)
+                             for first_index in range(0, len(pending_file_copies), chunk_size)]
+            copy_results = [ex for chunk_future in chunk_futures for ex in chunk_future.result()]
+
+        unexpected_exception = None
+        for (src_path, dst_path, _), ex in zip(pending_file_copies, copy_results):
+            if ex is None:
+                continue
+            self.last_src, self.last_dst = src_path, dst_path
+            if isinstance(ex, shutil.Error):
+                errors.extend(ex.args[0])
+            elif isinstance(ex, OSError):
+                errors.append((os.fspath(src_path), os.fspath(dst_path), str(ex)))
+            elif unexpected_exception is None:
+                unexpected_exception = ex
+
+        if unexpected_exception is not None:
+            raise unexpected_exception
+        if errors:
+            raise shutil.Error(errors)
+        return dst
+
     def error_dict_self(self, exc_type, exc_val, exc_tb) -> None:
         super().error_dict_self(exc_type, exc_val, exc_tb)
 
@@ -575,7 +674,7 @@ class CopyBundle(RsyncClone):
         return f"""CopyBundle {os.fspath(self.source)} to '{os.fspath(self.destination)}'"""
 
     def __call__(self, *args, **kwargs) -> None:
-        with CopyDirToDir(self.source, self.destination, hard_links=self.hard_links, ignore_patterns=self.ignore_patterns) as cdtd:
+        with CopyDirToDir(self.source, self.destination, hard_links=self.hard_links, ignore_patterns=self.local_ignore_patterns, copy_workers=self.copy_workers) as cdtd:
             cdtd()
 
 
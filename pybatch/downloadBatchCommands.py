@@ -1,5 +1,12 @@
 from typing import List
 from pathlib import Path
+import os
+import csv
+import hashlib
+import asyncio
+import queue
+from concurrent import futures
+import logging
 
 import requests
 from http.cookies import SimpleCookie
@@ -8,9 +15,10 @@ from requests.cookies import cookiejar_from_dict
 
 from configVar import config_vars
 from .baseClasses import PythonBatchCommandBase
-from .fileSystemBatchCommands import MakeDir
 import utils
 
+log = logging.getLogger(__name__)
+
 
 # this class can be used internally, it will create the session ar the init phase and will only need
 # the cookie, the rest of the params will be passed to the call method, this way it will allow this class
@@ -26,33 +34,67 @@ class DownloadManager(PythonBatchCommandBase):
         if self.cookie:
             all_args.append(self.named__init__param("cookie", self.cookie))
 
+    def exit_self(self, exit_return) -> None:
+        self.close()
+
+    def close(self):
+        """ close the session's pooled connections, DownloadManager objects that are not used
+            as context manager should call close when done downloading
+        """
+        self.session.close()
+
     def __call__(self, *args, **kwargs):
-        with self.session as dl_session:
-            url = self.url = kwargs["url"]
-            path = Path(kwargs["path"])
-            checksum = kwargs["checksum"]
-            if path.is_dir():
-                filename = Path(url.split("/").pop())
-                path = path.joinpath(filename)
-            with MakeDir(path.parent, report_own_progress=False) as dir_maker:
-                dir_maker()
-            with open(path, "wb") as fo:
+        url = self.url = kwargs["url"]
+        path = Path(kwargs["path"])
+        checksum = kwargs["checksum"]
+        if path.is_dir():
+            filename = Path(url.split("/").pop())
+            path = path.joinpath(filename)
+        self.make_folder(path.parent)
+        # download to a temp file and rename only if checksum is correct, so a partial
+        # or corrupt download never replaces the file and is never mistaken for a good file
+        temp_path = path.with_name(f"{path.name}.downloading")
+        try:
+            with open(temp_path, "wb") as fo:
                 self.doing = f"downloading file {path}"
                 timeout_seconds = int(config_vars.get("CURL_MAX_TIME", 480))
-                read_data = dl_session.get(url, timeout=timeout_seconds)
-                read_data.raise_for_status()  # must raise in case of an error. Server might return json/xml with error details, we do not want that
-                fo.write(read_data.content)
+                # stream the response to the file and checksum while writing, so the file
+                # is never held in memory as a whole and does not need to be read again
+                sha1ner = hashlib.sha1()
+                with self.session.get(url, timeout=timeout_seconds, stream=True) as read_data:
+                    read_data.raise_for_status()  # must raise in case of an error. Server might return json/xml with error details, we do not want that
+                    for chunk in read_data.iter_content(chunk_size=utils.misc_utils.checksum_read_buffer_size):
+                        fo.write(chunk)
+                        sha1ner.update(chunk)
 
-            checksum_ok = utils.check_file_checksum(path, checksum)
+            checksum_ok = bool(checksum) and utils.compare_checksums(sha1ner.hexdigest(), checksum)
             if not checksum_ok:
                 raise ValueError(f"bad checksum for {str(path)} after reqs download")
+            os.replace(temp_path, path)
+        finally:
+            utils.safe_remove_file(temp_path)
+
+    @staticmethod
+    def make_folder(folder: Path) -> None:
+        """ create folder and it's missing parents and change the owner of the created folders to the acting user.
+            DownloadManager is called from worker threads, so MakeDir is not used, because batch command objects
+            change PythonBatchCommandBase class level state.
+        """
+        folders_to_create = list()
+        missing_folder = folder
+        while not missing_folder.is_dir() and missing_folder != missing_folder.parent:
+            folders_to_create.append(missing_folder)
+            missing_folder = missing_folder.parent
+        os.makedirs(folder, mode=int(config_vars.get("MKDIR_SYMBOLIC_MODE", 0o755)), exist_ok=True)
+        for created_folder in reversed(folders_to_create):
+            utils.chown_on_path(created_folder)
 
     def progress_msg_self(self) -> str:
         return f'downloading file {self.url}'
 
     @staticmethod
     def get_cookie_dict_from_str(cookie_input):
-        cookie_str = cookie_input or config_vars["COOKIE_JAR"].str()
+        cookie_str = cookie_input or config_vars.get("COOKIE_JAR", "").str()
         cookie = SimpleCookie()
         cookie.load(cookie_str)
         cookies = {}
@@ -88,3 +130,134 @@ class DownloadFileAndCheckChecksum(DownloadManager):
     def __call__(self, *args, **kwargs):
         with DownloadManager(cookie=self.cookie, report_own_progress=False) as downloader:
             downloader(url=self.url, path=self.path, checksum=self.checksum)
+
+
+class AdaptiveConcurrencyLimit(object):
+    """ limit the number of concurrent downloads, the limit is adapted to the network:
+        it grows slowly while downloads succeed and is halved when a download fails (additive increase/multiplicative decrease).
+        Must be used from inside a running asyncio loop.
+    """
+    def __init__(self, initial_limit: int, max_limit: int) -> None:
+        self.max_limit = max(1, max_limit)
+        self.limit = float(max(1, min(initial_limit, self.max_limit)))
+        self.active = 0
+        self.condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.active < int(self.limit))
+            self.active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        async with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    def success(self) -> None:
+        self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def failure(self) -> None:
+        self.limit = max(1.0, self.limit / 2.0)
+
+
+class ParallelDownload(PythonBatchCommandBase, kwargs_defaults={'cookie': None, 'max_parallel_downloads': 50}):
+    """ download files listed in download_list_file, in process, with asyncio.
+        Each line in download_list_file is: url, path, checksum, size - as written by ParallelDownload.write_download_list.
+        Downloads are done by DownloadManager objects, one per concurrent download, so connections are kept alive and reused
+        for many files. Number of concurrent downloads is adapted by AdaptiveConcurrencyLimit up to max_parallel_downloads.
+        Each file is checksummed while being written and download is retried CURL_RETRIES times, with growing delay, on failure.
+        Files that could not be downloaded are reported but do not raise, CheckDownloadFolderChecksum which follows
+        the download will re-download or fail on such files.
+    """
+    def __init__(self, download_list_file, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.download_list_file = download_list_file
+        self.num_failed_downloads = 0
+
+    def repr_own_args(self, all_args: List[str]) -> None:
+        all_args.append(self.unnamed__init__param(self.download_list_file))
+
+    def progress_msg_self(self) -> str:
+        return f"""Downloading files from '{self.download_list_file}'"""
+
+    def increment_and_output_progress(self, increment_by=None, prog_counter_msg=None, prog_msg=None):
+        """ progress is incremented for each downloaded file, not when starting """
+        super().increment_and_output_progress(increment_by=increment_by or 0, prog_counter_msg=prog_counter_msg, prog_msg=prog_msg)
+
+    @staticmethod
+    def write_download_list(download_list_file, download_items) -> None:
+        """ download_items: iterable of (url, path, checksum, size) """
+        with utils.utf8_open_for_write(download_list_file, "w", newline='') as wfd:
+            csv.writer(wfd).writerows(download_items)
+
+    @staticmethod
+    def read_download_list(download_list_file):
+        with utils.utf8_open_for_read(download_list_file, "r", newline='') as rfd:
+            retVal = [(url, path, checksum, int(size or 0)) for url, path, checksum, size in csv.reader(rfd)]
+        return retVal
+
+    def __call__(self, *args, **kwargs) -> None:
+        PythonBatchCommandBase.__call__(self, *args, **kwargs)
+        resolved_download_list_file = utils.ExpandAndResolvePath(self.download_list_file)
+        download_items = self.read_download_list(resolved_download_list_file)
+        self.doing = f"""downloading {len(download_items)} files from '{resolved_download_list_file}'"""
+        self.num_failed_downloads = asyncio.run(self.download_all(download_items))
+        if self.num_failed_downloads:
+            log.error(f"failed to download {self.num_failed_downloads} of {len(download_items)} files")
+
+    async def download_all(self, download_items) -> int:
+        """ download all items, return the number of items that failed all retries """
+        max_parallel = max(1, int(self.max_parallel_downloads))
+        num_attempts = max(1, int(config_vars.get("CURL_RETRIES", 2)) + 1)
+        retry_delay = float(config_vars.get("NATIVE_DOWNLOAD_RETRY_DELAY", 1))
+        max_retry_delay = float(config_vars.get("CURL_RETRY_DELAY", 12))
+        initial_parallel = int(config_vars.get("NATIVE_DOWNLOAD_INITIAL_PARALLEL", 8))
+        limit = AdaptiveConcurrencyLimit(initial_parallel, max_parallel)
+        loop = asyncio.get_running_loop()
+
+        # DownloadManagers are created here and not in the worker threads, because creating batch command objects
+        # changes PythonBatchCommandBase class level state
+        download_managers = [DownloadManager(cookie=self.cookie, report_own_progress=False) for _ in range(min(max_parallel, len(download_items)))]
+        idle_download_managers = queue.SimpleQueue()
+        for dler in download_managers:
+            idle_download_managers.put(dler)
+
+        def download_one(url, path, checksum):
+            """ called on a worker thread, each download uses an idle DownloadManager and so reuses it's connection pool """
+            dler = idle_download_managers.get()
+            try:
+                dler(url=url, path=path, checksum=checksum)
+            finally:
+                idle_download_managers.put(dler)
+
+        items_iter = iter(download_items)
+        num_failed = 0
+
+        async def download_worker(executor):
+            nonlocal num_failed
+            for url, path, checksum, size in items_iter:
+                for attempt in range(num_attempts):
+                    try:
+                        async with limit:
+                            await loop.run_in_executor(executor, download_one, url, path, checksum)
+                        limit.success()
+                        self.increment_and_output_progress(increment_by=1, prog_msg=f"downloaded {path}")
+                        break
+                    except Exception as ex:
+                        limit.failure()
+                        if attempt + 1 < num_attempts:
+                            log.info(f"retrying download of {url} after: {ex}")
+                            await asyncio.sleep(min(retry_delay * 2 ** attempt, max_retry_delay))
+                        else:
+                            num_failed += 1
+                            log.error(f"failed to download {url} to {path}: {ex}")
+                            self.increment_and_output_progress(increment_by=1, prog_msg=f"failed to download {path}")
+
+        try:
+            with futures.ThreadPoolExecutor(max_workers=max_parallel) as executor:
+                await asyncio.gather(*(download_worker(executor) for _ in range(min(max_parallel, len(download_items)))))
+        finally:
+            for dler in download_managers:
+                dler.close()
+        return num_failed
@@ -1,4 +1,5 @@
 import glob
+import hashlib
 import itertools
 import math
 import os
@@ -26,6 +27,18 @@ def touch(file_path):
         os.utime(file_path, None)
 
 
+def change_permissions_in_process(path, ignore_errors=False, **kwargs):
+    """ change mode/owner/flags of path (and everything under it if recursive) with utils.RecursivePermissions
+        instead of calling chmod/chown/chflags -R. Unless ignore_errors, the first error encountered is raised
+        after all other items were changed.
+    """
+    retVal = utils.RecursivePermissions(**kwargs)
+    retVal(path)
+    if retVal.errors and not ignore_errors:
+        raise retVal.errors[0][1]
+    return retVal
+
+
 # regex to find some characters that should be escaped in dos, but are not
 dos_escape_regex = re.compile(r"""(?<!\^)([<|&>])""", re.MULTILINE)
 
@@ -279,6 +292,10 @@ class ChFlags(RunProcessBase):
         'darwin': {'hidden': 'hidden', 'nohidden': 'nohidden', 'locked': 'uchg', 'unlocked': 'nouchg', 'system': None,
                    'nosystem': None},
         'win32': {'hidden': '+H', 'nohidden': '-H', 'locked': '+R', 'unlocked': '-R', 'system': '+S', 'nosystem': '-S'}}
+    # (flags to set, flags to clear) for changing flags in-process with os.chflags
+    darwin_flag_bits = {'hidden': (stat.UF_HIDDEN, 0), 'nohidden': (0, stat.UF_HIDDEN),
+                        'locked': (stat.UF_IMMUTABLE, 0), 'unlocked': (0, stat.UF_IMMUTABLE),
+                        'system': (0, 0), 'nosystem': (0, 0)}
 
     def __init__(self, path, *flags, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -358,9 +375,24 @@ class ChFlags(RunProcessBase):
                     RunProcessBase.__call__(self, *args, **kwargs)
                 else:
                     RunProcessBase.__call__(self, *args, **kwargs)
+            elif self.recursive and hasattr(os, "chflags"):
+                PythonBatchCommandBase.__call__(self, *args, **kwargs)
+                flags_to_set, flags_to_clear = self.flags_to_set_and_clear()
+                resolved_path = utils.ExpandAndResolvePath(self.path)
+                self.doing = f"""changing flags (recursive) '{",".join(self.flags)}' of '{resolved_path}'"""
+                change_permissions_in_process(resolved_path, flags_to_set=flags_to_set, flags_to_clear=flags_to_clear,
+                                              ignore_errors=self.ignore_all_errors)
             else:
                 RunProcessBase.__call__(self, *args, **kwargs)
 
+    def flags_to_set_and_clear(self):
+        flags_to_set, flags_to_clear = 0, 0
+        for flag in self.flags:
+            flag_set, flag_clear = self.darwin_flag_bits[flag]
+            flags_to_set |= flag_set
+            flags_to_clear |= flag_clear
+        return flags_to_set, flags_to_clear
+
 
 class Unlock(ChFlags, kwargs_defaults={"ignore_all_errors": True}):
     """ Remove the system's read-only flag (not permissions).
@@ -442,10 +474,11 @@ class Chown(RunProcessBase, call__call__=True):
             return
         PythonBatchCommandBase.__call__(self, *args, **kwargs)
         if (self.user_id, self.group_id) != (-1, -1):
-            # os.chown is not recursive so call the system's chown
             if self.recursive:
                 self.doing = f"""change owner (recursive) of '{self.path}' to '{self.user_id}:{self.group_id}'"""
-                return super().__call__(args, kwargs)
+                # like chown -f -R failures to change the owner of specific items are ignored
+                change_permissions_in_process(utils.ExpandAndResolvePath(self.path), user_id=self.user_id,
+                                              group_id=self.group_id, ignore_errors=True)
             else:
                 resolved_path = utils.ExpandAndResolvePath(self.path)
                 self.doing = f"""change owner of '{resolved_path}' to '{self.user_id}:{self.group_id}'"""
@@ -472,9 +505,7 @@ class Chown(RunProcessBase, call__call__=True):
 class Chmod(RunProcessBase):
     """ change mode read.write/execute permissions for a file or folder"""
 
-    if sys.platform == 'darwin':
-        symbolic_mode_re = re.compile(r"""^(?P<who>[augo]+)(?P<operation>[+\-=])(?P<perm>[rwxX]+)$""")
-    elif sys.platform == 'win32':
+    if sys.platform == 'win32':
         symbolic_mode_re = re.compile(r"""^(?P<who>[augo]+)(?P<operation>\+)(?P<perm>[rwxX]+)$""")
 
     all_read = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
@@ -511,39 +542,6 @@ class Chmod(RunProcessBase):
     def progress_msg_self(self):
         return f"""{self.__class__.__name__} {self.mode} '{self.path}'"""
 
-    def parse_symbolic_mode_mac(self, symbolic_mode_str, current_stats):
-        """ parse chmod symbolic mode string e.g. uo+xw
-            return the mode as a number (e.g 766) and the operation (e.g. =|+|-)
-            in case of 'X' the required mode depends on existing mode
-        """
-        current_mode, current_mode_oct = stat.S_IMODE(current_stats[stat.ST_MODE]), oct(
-            stat.S_IMODE(current_stats[stat.ST_MODE]))
-        perms_and_operation = list()
-        for match in self.symbolic_mode_re.finditer(symbolic_mode_str):
-            symbolic_who = match.group('who')
-            if 'a' in symbolic_who:
-                symbolic_who = 'ugo'
-
-            symbolic_perm = match.group('perm')
-            if stat.S_ISDIR(stat.S_IFMT(current_stats[stat.ST_MODE])):
-                symbolic_perm = symbolic_perm.lower()  # for a dir we want X to mean x
-                any_exec_permission = False
-            else:
-                any_exec_permission = current_mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
-            actual_perms = 0
-            for w in symbolic_who:
-                for p in symbolic_perm:
-                    if p == 'X':
-                        if any_exec_permission:
-                            # for non-dir 'X' means to extend the exec permission if such permission exist
-                            actual_perms |= Chmod.who_2_perm[w]['x']
-                    else:
-                        actual_perms |= Chmod.who_2_perm[w][p]
-            perms_and_operation.append((actual_perms, match.group('operation')))
-        if not perms_and_operation:
-            ValueError(f"no valid symbolic mode was found in {symbolic_mode_str}")
-        return perms_and_operation
-
     def parse_symbolic_mode_win(self, symbolic_mode_str):
         """ parse chmod symbolic mode string e.g. uo+xw
 
@@ -605,26 +603,13 @@ class Chmod(RunProcessBase):
         if self.ignore_if_not_exist and not resolved_path.exists():
             self.doing = f"""skip change mode of '{resolved_path}' - does not exist'"""
             return
-        if sys.platform == 'darwin':
-            # os.chmod is not recursive so call the system's chmod
+        if sys.platform != 'win32':
             if self.recursive:
-                self.doing = f"""change mode (recursive) of '{self.path}' to '{self.mode}'"""
-                return super().__call__(args, kwargs)
+                self.doing = f"""change mode (recursive) of '{resolved_path}' to '{self.mode}'"""
             else:
-                path_stats = resolved_path.stat()
-                current_mode, current_mode_oct = stat.S_IMODE(path_stats[stat.ST_MODE]), oct(
-                    stat.S_IMODE(path_stats[stat.ST_MODE]))
-                for flags, op in self.parse_symbolic_mode_mac(self.mode, path_stats):
-                    mode_to_set = flags
-                    if op == '+':
-                        mode_to_set |= current_mode
-                    elif op == '-':
-                        mode_to_set = current_mode & ~flags
-                    if mode_to_set != current_mode:
-                        self.doing = f"""change mode of '{resolved_path}' to '{self.mode}'"""
-                        os.chmod(resolved_path, mode_to_set)
-                    else:
-                        self.doing = f"""skip change mode of '{resolved_path}' mode is already '{mode_to_set}'"""
+                self.doing = f"""change mode of '{resolved_path}' to '{self.mode}'"""
+            change_permissions_in_process(resolved_path, mode=self.mode, recursive=self.recursive,
+                                          ignore_errors=self.ignore_all_errors)
 
         elif sys.platform == 'win32':
             if self.recursive:
@@ -704,6 +689,14 @@ class ChmodAndChown(PythonBatchCommandBase):
         PythonBatchCommandBase.__call__(self, *args, **kwargs)
         resolved_path = utils.ExpandAndResolvePath(self.path)
         self.doing = f"""Chmod and Chown {self.mode} '{resolved_path}' {self.user_id}:{self.group_id}"""
+        if sys.platform != 'win32':
+            # change owner and mode in one walk of the tree
+            change_permissions_in_process(resolved_path,
+                                          mode=None if self.skip_chmod else self.mode,
+                                          user_id=-1 if self.skip_chown else self.user_id,
+                                          group_id=-1 if self.skip_chown else self.group_id,
+                                          recursive=self.recursive, ignore_errors=self.ignore_all_errors)
+            return
         with Chown(path=resolved_path, user_id=self.user_id, group_id=self.group_id, recursive=self.recursive,
                    skip_chmod=self.skip_chmod, own_progress_count=0) as owner_chaner:
             owner_chaner()
@@ -822,19 +815,24 @@ class SplitFile(PythonBatchCommandBase):
         The parts are named with the same name the original with extensions, .aa. .ab, ...
         if remove_original is true the original file is removed
         if max_size is 0, the file is just renamed with extension .aa
+        if calc_checksums is true, self.part_checksums will map each part's path to it's sha1 checksum,
+        calculated while the part is written, so parts do not need to be read again for checksum.
     """
 
-    def __init__(self, file_to_split, max_size=0, remove_original=True, **kwargs) -> None:
+    def __init__(self, file_to_split, max_size=0, remove_original=True, calc_checksums=False, **kwargs) -> None:
         super().__init__(**kwargs)
         self.file_to_split = Path(file_to_split)
         self.max_size = max_size
         self.remove_original = remove_original
+        self.calc_checksums = calc_checksums
         self.num_parts = 0
+        self.part_checksums = dict()
 
     def repr_own_args(self, all_args: List[str]) -> None:
         all_args.append(self.named__init__param("file_to_split", self.file_to_split))
         all_args.append(self.named__init__param("max_size", self.max_size))
         all_args.append(self.named__init__param("remove_original", self.remove_original))
+        all_args.append(self.optional_named__init__param("calc_checksums", self.calc_checksums, False))
 
     def progress_msg_self(self):
         the_progress_msg = f"split file {self.file_to_split} to {self.num_parts} parts"
@@ -875,14 +873,27 @@ class SplitFile(PythonBatchCommandBase):
     def __call__(self, *args, **kwargs):
         original_size = self.file_to_split.stat().st_size
         splits = self.calc_splits(original_size)
-        print(
-            f"original: {original_size}, max_size: {self.max_size}, self.num_parts: {len(splits)}, part_size: {splits[0][0]} naive total {len(splits) * splits[0][0]}")
-        print("\n   ".join(str(s[1]) for s in splits))
-        with open(self.file_to_split, "rb") as fts:
+        log.debug(f"split {self.file_to_split} size: {original_size}, max_size: {self.max_size}, to {len(splits)} parts: {', '.join(s[1].name for s in splits)}")
+        self.part_checksums = dict()
+        if len(splits) == 1 and self.remove_original:
+            # one part: no need to copy the data
+            self.doing = f"""rename '{self.file_to_split}' to '{splits[0][1]}'"""
+            os.replace(self.file_to_split, splits[0][1])
+            with open(splits[0][1], "ab") as pfd:
+                utils.chown_chmod_on_fd(pfd)
+            if self.calc_checksums:
+                self.part_checksums[splits[0][1]] = utils.get_file_checksum(splits[0][1])
+            return
+
+        with open(self.file_to_split, "rb", buffering=0) as fts:
             for part_size, part_path in splits:
-                with open(part_path, "wb") as pfd:
+                self.doing = f"""split '{self.file_to_split}' to '{part_path}'"""
+                with open(part_path, "wb", buffering=0) as pfd:
                     utils.chown_chmod_on_fd(pfd)
-                    pfd.write(fts.read(part_size))
+                    checksum_obj = hashlib.sha1() if self.calc_checksums else None
+                    utils.copy_file_data(fts, pfd, part_size, checksum_obj)
+                    if checksum_obj is not None:
+                        self.part_checksums[part_path] = checksum_obj.hexdigest()
         if self.remove_original:
             with RmFile(self.file_to_split, report_own_progress=False) as rf:
                 rf()
@@ -907,11 +918,12 @@ class JoinFile(PythonBatchCommandBase):
             raise ValueError(f"name of file to join must end with .aa not: {self.file_to_join.name}")
         files_to_join = utils.find_split_files(self.file_to_join)
         joined_file_path = self.file_to_join.parent.joinpath(self.file_to_join.stem)
-        with open(joined_file_path, "wb") as wfd:
+        self.doing = f"""join {len(files_to_join)} parts to '{joined_file_path}'"""
+        with open(joined_file_path, "wb", buffering=0) as wfd:
             utils.chown_chmod_on_fd(wfd)
             for part_file in files_to_join:
-                with open(part_file, "rb") as rfd:
-                    wfd.write(rfd.read())
+                with open(part_file, "rb", buffering=0) as rfd:
+                    utils.copy_file_data(rfd, wfd)
         if self.remove_parts:
             for part_file in files_to_join:
                 with RmFile(part_file, report_own_progress=False) as part_remover:
@@ -938,17 +950,19 @@ class FixAllPermissions(PythonBatchCommandBase):
 
         self.doing = f"""allowing all permissions for'{self.path}'"""
 
-        # chflags first since (at least on Mac) it has higher priority (e.g. you cannot chmod a-w on files with flags uchg set,
-        # but you can chflags nouchg on files with a-w set)
-        with ChFlags(self.path, 'nohidden', 'unlocked', 'nosystem', report_own_progress=False,
-                     recursive=self.recursive) as chflager:
-            chflager()
         match sys.platform:
             case 'darwin' | 'linux':
+                # flags and mode are changed in one walk of the tree. Flags first since (at least on Mac)
+                # they have higher priority (e.g. you cannot chmod a-w on files with flags uchg set,
+                # but you can chflags nouchg on files with a-w set)
                 the_mode = config_vars.get("FIX_ALL_PERMISSIONS_SYMBOLIC_MODE", "u+rwx,go+rx").str()
-                with Chmod(path=self.path, mode=the_mode, report_own_progress=False, recursive=self.recursive) as chmoder:
-                    chmoder()
+                change_permissions_in_process(utils.ExpandAndResolvePath(self.path), mode=the_mode,
+                                              flags_to_clear=stat.UF_HIDDEN | stat.UF_IMMUTABLE,
+                                              recursive=self.recursive)
             case 'win32':
+                with ChFlags(self.path, 'nohidden', 'unlocked', 'nosystem', report_own_progress=False,
+                             recursive=self.recursive) as chflager:
+                    chflager()
                 with FullACLForEveryone(path=self.path, report_own_progress=False, recursive=self.recursive) as acler:
                     acler()
 
@@ -11,6 +11,8 @@ import logging
 import requests
 import time
 import datetime
+import queue
+from concurrent import futures
 
 log = logging.getLogger(__name__)
 
@@ -78,30 +80,39 @@ class CheckDownloadFolderChecksum(DBManager, PythonBatchCommandBase):
             config_vars['LOCAL_SYNC_DIR'].Path(resolve=True).joinpath("BREAK_BEFORE_CHECKSUM"),
             self.break_file_callback)
 
-        for file_item in dl_file_items:
-            self.doing = f"""check checksum for '{file_item.download_path}'"""
-            super().increment_and_output_progress(increment_by=1, prog_msg=self.doing)
-
-            if os.path.isfile(file_item.download_path):
-                file_checksum = utils.get_file_checksum(file_item.download_path)
-                if not utils.compare_checksums(file_checksum, file_item.checksum):
-                    self.num_bad_files += 1
-                    super().increment_and_output_progress(increment_by=0,
-                                                          prog_msg=f"bad checksum for '{file_item.download_path}'\nexpected: {file_item.checksum}, found: {file_checksum}")
-                    self.lists_of_files["bad_checksum"].append(" ".join(("Bad checksum:", file_item.download_path,
-                                                                         "expected", file_item.checksum, "found",
-                                                                         file_checksum)))
-                    self.lists_of_files["to redownload"].append(file_item)
-            else:
-                self.num_bad_files += 1
-                super().increment_and_output_progress(increment_by=0,
-                                                      prog_msg=f"missing file '{file_item.download_path}'")
-                self.lists_of_files["missing_files"].append(" ".join((file_item.download_path, "was not found")))
-                self.lists_of_files["to redownload"].append(file_item)
-            if self.max_bad_files_to_redownload is not None and self.num_bad_files > self.max_bad_files_to_redownload:
-                super().increment_and_output_progress(increment_by=0,
-                                                      prog_msg=f"stopping checksum check too many bad or missing files found")
-                break
+        # files that did not change since they were last checksummed will not be read again
+        # hashlib releases the GIL so files are checksummed in parallel on a thread pool,
+        # results are reported in the same order as dl_file_items
+        num_workers = max(1, int(config_vars.get("CHECKSUM_WORKERS", os.cpu_count() or 1)))
+        with utils.checksum_cache_for_config_vars(config_vars) as checksum_cache:
+            executor = futures.ThreadPoolExecutor(max_workers=num_workers)
+            try:
+                file_checksums = executor.map(lambda a_file_item: self.checksum_file_item(checksum_cache, a_file_item), dl_file_items)
+                for file_item, file_checksum in zip(dl_file_items, file_checksums):
+                    self.doing = f"""check checksum for '{file_item.download_path}'"""
+                    super().increment_and_output_progress(increment_by=1, prog_msg=self.doing)
+
+                    if file_checksum is not None:
+                        if not utils.compare_checksums(file_checksum, file_item.checksum):
+                            self.num_bad_files += 1
+                            super().increment_and_output_progress(increment_by=0,
+                                                                  prog_msg=f"bad checksum for '{file_item.download_path}'\nexpected: {file_item.checksum}, found: {file_checksum}")
+                            self.lists_of_files["bad_checksum"].append(" ".join(("Bad checksum:", file_item.download_path,
+                                                                                 "expected", file_item.checksum, "found",
+                                                                                 file_checksum)))
+                            self.lists_of_files["to redownload"].append(file_item)
+                    else:
+                        self.num_bad_files += 1
+                        super().increment_and_output_progress(increment_by=0,
+                                                              prog_msg=f"missing file '{file_item.download_path}'")
+                        self.lists_of_files["missing_files"].append(" ".join((file_item.download_path, "was not found")))
+                        self.lists_of_files["to redownload"].append(file_item)
+                    if self.max_bad_files_to_redownload is not None and self.num_bad_files > self.max_bad_files_to_redownload:
+                        super().increment_and_output_progress(increment_by=0,
+                                                              prog_msg=f"stopping checksum check too many bad or missing files found")
+                        break
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
 
         if not self.is_checksum_ok():
             if self.max_bad_files_to_redownload is not None and self.num_bad_files <= self.max_bad_files_to_redownload:
@@ -117,23 +128,66 @@ class CheckDownloadFolderChecksum(DBManager, PythonBatchCommandBase):
                      f'Missing {len(self.lists_of_files["missing_files"])} files'))
             raise ValueError(exception_message)
 
+    @staticmethod
+    def checksum_file_item(checksum_cache, file_item):
+        """ called on a worker thread, return the checksum of file_item's downloaded file or None if the file is missing """
+        retVal = None
+        if os.path.isfile(file_item.download_path):
+            retVal = checksum_cache.get_file_checksum(file_item.download_path)
+        return retVal
+
     def re_download_bad_files(self):
+        """ download again files that were found missing or with bad checksum.
+            Files are downloaded concurrently by REDOWNLOAD_WORKERS threads, each download uses one of REDOWNLOAD_WORKERS
+            DownloadManagers so connections are reused. Each file is attempted up to REDOWNLOAD_RETRIES times.
+            DownloadManagers are created here and not in the worker threads, because creating batch command objects
+            changes PythonBatchCommandBase class level state.
+        """
+        num_workers = max(1, int(config_vars.get("REDOWNLOAD_WORKERS", 8)))
+        num_attempts = max(1, int(config_vars.get("REDOWNLOAD_RETRIES", 3)))
+        cookie = config_vars["COOKIE_JAR"].str()  # should get the cookie from the config vars
+        # urls are resolved here because the db cannot be accessed from the worker threads
+        items_and_urls = [(file_item, self.info_map_table.get_sync_url_for_file_item(file_item))
+                          for file_item in self.lists_of_files["to redownload"]]
+
+        download_managers = [DownloadManager(cookie=cookie, report_own_progress=False) for _ in range(min(num_workers, len(items_and_urls)))]
+        idle_download_managers = queue.SimpleQueue()
+        for dler in download_managers:
+            idle_download_managers.put(dler)
+
+        def redownload_file(item_and_url):
+            """ called on a worker thread, return None on success or the last exception if all attempts failed """
+            dler = idle_download_managers.get()
+            try:
+                file_item, download_url = item_and_url
+                retVal = None
+                for attempt in range(num_attempts):
+                    try:
+                        dler(path=file_item.download_path, url=download_url, checksum=file_item.checksum)
+                        retVal = None
+                        break
+                    except Exception as ex:
+                        retVal = ex
+                        if attempt + 1 < num_attempts:
+                            time.sleep(2 ** attempt)
+            finally:
+                idle_download_managers.put(dler)
+            return retVal
+
         try:
-            download_path = None
-
-            with DownloadManager(cookie=config_vars["COOKIE_JAR"].str(),
-                                 report_own_progress=False) as dler:  # should get the cookie from the config vars
-                for file_item in self.lists_of_files["to redownload"]:
-                    download_url = self.info_map_table.get_sync_url_for_file_item(file_item)
-                    download_path = file_item.download_path
-                    dler(path=download_path, url=download_url, checksum=file_item.checksum)
-                    super().increment_and_output_progress(increment_by=0,
-                                                          prog_msg=f"redownloaded {file_item.download_path}")
-                    self.num_bad_files -= 1
-        except Exception as ex:
-            log.error(f"""Exception while redownloading {download_path}, {ex}""")
-            super().increment_and_output_progress(increment_by=0,
-                                                  prog_msg=f"""Exception while redownloading {download_path}, {ex}""")
+            with futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+                for (file_item, _), ex in zip(items_and_urls, executor.map(redownload_file, items_and_urls)):
+                    if ex is None:
+                        super().increment_and_output_progress(increment_by=0,
+                                                              prog_msg=f"redownloaded {file_item.download_path}")
+                        self.num_bad_files -= 1
+                    else:
+                        log.error(f"""Exception while redownloading {file_item.download_path}, {ex}""")
+                        super().increment_and_output_progress(increment_by=0,
+                                                              prog_msg=f"""Exception while redownloading {file_item.download_path}, {ex}""")
+        finally:
+            for dler in download_managers:
+                dler.close()
 
     def is_checksum_ok(self) -> bool:
         retVal = self.num_bad_files == 0
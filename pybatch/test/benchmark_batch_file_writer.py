@@ -0,0 +1,89 @@
+#!/usr/bin/env python3.12
+
+"""
+    benchmark writing a batch file of a large PythonBatchCommandAccum, creating the whole text
+    in memory (the way batch files used to be written) against streaming it with PythonBatchCommandAccum.iter_repr.
+    Each way runs in it's own process so peak RSS can be compared. Run from the repository root:
+        python -m pybatch.test.benchmark_batch_file_writer [num_commands]
+"""
+
+import os
+import sys
+import time
+import filecmp
+import tempfile
+import subprocess
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import utils
+from pybatch import *
+from pybatch import PythonBatchCommandAccum
+from configVar import config_vars
+
+
+def peak_rss_mb():
+    retVal = float('nan')
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        retVal = max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024  # bytes on Mac, KB on Linux
+    return retVal
+
+
+def create_batch_accum(num_commands):
+    """ commands referring to config vars, about 1/3 of them are not resolved while creating the repr """
+    config_vars["__CURRENT_OS_NAMES__"] = utils.get_current_os_names()
+    config_vars["__MAIN_COMMAND__"] = "benchmark_batch_file_writer"
+    config_vars["LOCAL_REPO_SYNC_DIR"] = "/Users/Shared/Library/Caches/instl/V15/sync"
+    config_vars["COPY_TOOL"] = "rsync"
+    batch_accum = PythonBatchCommandAccum()
+    batch_accum.set_current_section("copy")
+    num_folders = max(1, num_commands // 4)
+    for folder_num in range(num_folders):
+        with batch_accum.sub_accum(Cd(f"$(LOCAL_REPO_SYNC_DIR)/Mac/folder_{folder_num}")) as folder_accum:
+            folder_accum += Echo(f"copying with $(COPY_TOOL) to $(SOME_UNKNOWN_VAR)/folder_{folder_num}")
+            folder_accum += MakeDir(f"/Applications/Waves/folder_{folder_num}")
+            folder_accum += CopyFileToFile(f"$(LOCAL_REPO_SYNC_DIR)/Mac/folder_{folder_num}/file.txt", f"/Applications/Waves/folder_{folder_num}/file.txt")
+    return batch_accum
+
+
+def write_batch_file(num_commands, out_file, streaming):
+    config_vars["__MAIN_OUT_FILE__"] = out_file
+    batch_accum = create_batch_accum(num_commands)
+    rss_before = peak_rss_mb()
+    time1 = time.perf_counter()
+    with open(out_file, "w", encoding='utf-8') as wfd:
+        if streaming:
+            for repr_text in batch_accum.iter_repr():
+                wfd.write(repr_text)
+        else:
+            batch_accum.repr_block_size = sys.maxsize  # resolve the main part as a single string
+            wfd.write(repr(batch_accum))
+    time2 = time.perf_counter()
+    print(f"{time2 - time1:.2f} {rss_before:.1f} {peak_rss_mb():.1f}")
+
+
+def main(num_commands):
+    with tempfile.TemporaryDirectory() as temp_folder:
+        out_file = os.path.join(temp_folder, "batch.py")  # same path for both, since the path is written to the batch file
+        out_files = dict()
+        for streaming in (False, True):
+            output = subprocess.run([sys.executable, "-m", "pybatch.test.benchmark_batch_file_writer", str(num_commands), out_file, str(streaming)],
+                                    check=True, capture_output=True, text=True).stdout
+            out_files[streaming] = os.path.join(temp_folder, f"batch_{streaming}.py")
+            os.rename(out_file, out_files[streaming])
+            seconds, rss_before, rss_after = output.split()
+            way = "streaming" if streaming else "in memory"
+            print(f"{way}: {seconds} sec, peak RSS {rss_after}MB ({float(rss_after) - float(rss_before):.1f}MB while writing), {Path(out_files[streaming]).stat().st_size / (1024 * 1024):.1f}MB batch file")
+        print("same batch file" if filecmp.cmp(out_files[False], out_files[True], shallow=False) else "batch files are different !!!")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4:  # sub process for one way of writing
+        write_batch_file(int(sys.argv[1]), sys.argv[2], sys.argv[3] == "True")
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3.12
+
+"""
+    benchmark RsyncClone.copy_tree with one copy worker against several copy workers,
+    on a synthetic tree of small files, copying and hard-linking. Run from the repository root:
+        python -m pybatch.test.benchmark_copy_tree [num_files] [copy_workers]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import filecmp
+from pathlib import Path
+
+from pybatch import RsyncClone
+from .test_PythonBatchBase import is_identical_dircmp
+
+
+def create_synthetic_tree(top_folder, num_files):
+    """ bundle like tree: 100 files per folder, 10 folders per parent folder, file sizes up to 64K """
+    random.seed(17)
+    random_bytes = os.urandom(1 << 16)
+    num_folders = max(1, num_files // 100)
+    folders = [Path(top_folder)]
+    for folder_num in range(1, num_folders):
+        folders.append(folders[(folder_num - 1) // 10].joinpath(f"folder{folder_num}"))
+    for folder in folders:
+        folder.mkdir(parents=True, exist_ok=True)
+    for file_num in range(num_files):
+        file_size = random.choice((0, 100, 1000, 4096, 20000, 1 << 16))
+        folders[file_num % num_folders].joinpath(f"file{file_num}.bin").write_bytes(random_bytes[:file_size])
+
+
+def time_copy(src, dst, hard_links, copy_workers):
+    with RsyncClone(src, dst, hard_links=hard_links, copy_workers=copy_workers, report_own_progress=False) as rc:
+        time1 = time.perf_counter()
+        rc()
+        time2 = time.perf_counter()
+    return time2 - time1, dict(rc.statistics)
+
+
+def main(num_files, copy_workers):
+    with tempfile.TemporaryDirectory() as temp_folder:
+        src = Path(temp_folder, "source")
+        create_synthetic_tree(src, num_files)
+        for hard_links in (False, True):
+            copied_folders = list()
+            for num_workers in (1, copy_workers):
+                dst = Path(temp_folder, f"target-{hard_links}-{num_workers}")
+                seconds, statistics = time_copy(src, dst, hard_links, num_workers)
+                print(f"hard_links={hard_links}, copy_workers={num_workers}: {statistics['files']} files, {statistics['dirs']} folders in {seconds:.3f} seconds")
+                copied_folders.append(dst)
+            print("identical trees" if is_identical_dircmp(filecmp.dircmp(*copied_folders)) else "trees are different!")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 8)
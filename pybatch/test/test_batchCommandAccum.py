@@ -0,0 +1,118 @@
+#!/usr/bin/env python3.12
+
+
+import sys
+import os
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+import utils
+from pybatch import *
+from pybatch import PythonBatchCommandAccum
+from pybatch.batchCommandAccum import resolve_in_blocks
+from configVar import config_vars
+
+current_os_names = utils.get_current_os_names()
+config_vars["__CURRENT_OS_NAMES__"] = current_os_names
+
+
+class TestBatchCommandAccum(unittest.TestCase):
+    def setUp(self):
+        config_vars["__MAIN_OUT_FILE__"] = "batch_accum_test.py"
+        config_vars["__MAIN_COMMAND__"] = "test_batchCommandAccum"
+        config_vars["KNOWN"] = "known"
+        config_vars["PARAM"] = "p$(__PARAM_1__)"
+        config_vars["ARR"] = "zero", "one"
+
+    def tearDown(self):
+        for var_name in ("__MAIN_OUT_FILE__", "__MAIN_COMMAND__", "KNOWN", "PARAM", "ARR"):
+            del config_vars[var_name]
+
+    def test_resolve_in_blocks(self):
+        # references split between pieces must be resolved as if the text was resolved as a whole
+        text_pieces = ["a $(KNOWN) b\n", "$(UNKNOWN) c\n", "x $(PARAM<", "1>) y\n", "$(K", "NOWN)\n",
+                       "tail $(un known\n", "still)\n", "$(ARR[", "1]) z $(UNKNOWN[1]", ")\n", "$", "(KNOWN)", "\n",
+                       "$(UNKNOWN_", "AT_END"]
+        for which_os in ("Mac", "Win", "Linux"):
+            expected = config_vars.replace_unresolved_with_native_var_pattern(config_vars.resolve_str("".join(text_pieces)), which_os)
+            for block_size in (1, 5, 20, 1024):
+                resolved_blocks = list(resolve_in_blocks(iter(text_pieces), which_os, block_size))
+                self.assertEqual("".join(resolved_blocks), expected, f"{which_os} {block_size}")
+                if block_size == 1:
+                    self.assertGreater(len(resolved_blocks), 3)
+
+    def test_iter_repr(self):
+        reprs = list()
+        for block_size in (10, 1024 * 1024):
+            batch_accum = PythonBatchCommandAccum()
+            batch_accum.repr_block_size = block_size
+            batch_accum.set_current_section("doit")
+            for i in range(50):
+                batch_accum += Echo(f"$(KNOWN) {i} $(UNKNOWN) $(PARAM<{i}>)")
+                with batch_accum.sub_accum(Cd(f"folder_{i}")) as sub_accum:
+                    sub_accum += MakeDir(f"sub_{i}")
+            reprs.append(repr(batch_accum))
+        self.assertEqual(reprs[0], reprs[1])
+        self.assertIn("known 3", reprs[0])
+        self.assertIn("p7", reprs[0])
+
+    def create_batch_accum_to_run(self, work_folder, raise_in_doit):
+        PythonBatchCommandBase.running_progress = 0
+        batch_accum = PythonBatchCommandAccum()
+        batch_accum.set_current_section("assign")
+        batch_accum += ConfigVarAssign("ASSIGNED", "$(KNOWN)")
+        batch_accum.set_current_section("copy")
+        batch_accum += Remark("$(KNOWN) remark")
+        with batch_accum.sub_accum(Cd(work_folder)) as sub_accum:
+            sub_accum += MakeDir("$(KNOWN)_folder")
+            sub_accum += Progress("$(PARAM<7>)")
+            sub_accum += Stage("empty")
+        batch_accum.set_current_section("doit")
+        with batch_accum.sub_accum(Stage("doit stage", "$(KNOWN)")) as sub_accum:
+            if raise_in_doit:
+                sub_accum += RaiseException(ValueError, "$(KNOWN) error")
+            sub_accum += MakeDir(os.path.join(work_folder, "$(ARR[1])"))
+            sub_accum += Progress("$(UNKNOWN)")
+        return batch_accum
+
+    def test_run_in_process(self):
+        """ running the batch commands in process should report the same progress and write the same batch file as exec'ing the batch file """
+        for raise_in_doit in (False, True):
+            with tempfile.TemporaryDirectory() as temp_folder:
+                # same paths for both, since the paths are written to the batch file and progress messages
+                out_file = os.path.join(temp_folder, "batch.py")
+                work_folder = os.path.join(temp_folder, "work")
+                config_vars["__MAIN_OUT_FILE__"] = out_file
+                batch_texts, progress_logs, exceptions = list(), list(), list()
+                for in_process in (False, True):
+                    os.mkdir(work_folder)
+                    batch_accum = self.create_batch_accum_to_run(work_folder, raise_in_doit)
+                    with self.assertLogs(level="INFO") as logs:
+                        try:
+                            if in_process:
+                                batch_accum.run_in_process(out_file)
+                            else:
+                                with open(out_file, "w") as wfd:
+                                    wfd.writelines(batch_accum.iter_repr())
+                                exec(compile(Path(out_file).read_text(), out_file, mode='exec'), {"__name__": "batch_file"})
+                        except ValueError as ex:
+                            exceptions.append(str(ex))
+                    batch_texts.append(Path(out_file).read_text())
+                    progress_logs.append([record.getMessage() for record in logs.records if record.getMessage().startswith("Progress")])
+                    self.assertTrue(os.path.isdir(os.path.join(work_folder, "known_folder")))
+                    self.assertEqual(os.path.isdir(os.path.join(work_folder, "one")), not raise_in_doit)
+                    self.assertEqual(Path(out_file).with_suffix(".timings.py").is_file(), not raise_in_doit)
+                    os.replace(out_file, os.path.join(temp_folder, f"batch_{in_process}.py"))
+                    os.replace(work_folder, os.path.join(temp_folder, f"work_{in_process}"))
+                self.assertEqual(batch_texts[0], batch_texts[1])
+                self.assertEqual(progress_logs[0], progress_logs[1])
+                self.assertIn("p7", "".join(progress_logs[1]))
+                self.assertEqual(exceptions, ["known error"] * 2 if raise_in_doit else [])
+                self.assertEqual(config_vars["ASSIGNED"].str(), "known")
+                del config_vars["ASSIGNED"]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -47,6 +47,7 @@ class TestPythonBatchCopy(unittest.TestCase):
                  delete_extraneous_files=True,
                  verbose=17,
                  dry_run=True))
+        list_of_objs.append(RsyncClone(dir_from, dir_to, copy_workers=4))
         self.pbt.reprs_test_runner(*list_of_objs)
 
     def test_RsyncClone(self):
@@ -93,6 +94,45 @@ class TestPythonBatchCopy(unittest.TestCase):
         dir_comp_with_ignore = filecmp.dircmp(dir_to_copy_from, dir_to_copy_to_with_ignore)
         is_identical_dircomp_with_ignore(dir_comp_with_ignore, file_names_to_ignore)
 
+    def test_RsyncClone_parallel(self):
+        """ copy the same tree with one and with several copy workers, destination folders and statistics should be the same.
+            Copying again to existing destination should skip all files. A fifo cannot be copied, the error
+            should be aggregated and raised after all other files were copied.
+        """
+        dir_to_copy_from = self.pbt.path_inside_test_folder("copy-source")
+        dir_to_copy_to_one_worker = self.pbt.path_inside_test_folder("copy-target-one-worker")
+        dir_to_copy_to_parallel = self.pbt.path_inside_test_folder("copy-target-parallel")
+
+        self.pbt.batch_accum.clear(section_name="doit")
+        self.pbt.batch_accum += MakeDir(dir_to_copy_from)
+        with self.pbt.batch_accum.sub_accum(Cd(dir_to_copy_from)) as sub_bc:
+            sub_bc += Touch("hootenanny")
+            sub_bc += MakeRandomDirs(num_levels=3, num_dirs_per_level=3, num_files_per_dir=7, file_size=413)
+        self.pbt.exec_and_capture_output()
+
+        def copy_and_get_statistics(dst, copy_workers):
+            with RsyncClone(dir_to_copy_from, dst, hard_links=False, ignore_patterns=["hootenanny"], copy_stat=True, copy_workers=copy_workers) as rc:
+                rc()
+            return dict(rc.statistics)
+
+        one_worker_statistics = copy_and_get_statistics(dir_to_copy_to_one_worker, 1)
+        parallel_statistics = copy_and_get_statistics(dir_to_copy_to_parallel, 4)
+        self.assertEqual(one_worker_statistics, parallel_statistics)
+        self.assertTrue(is_identical_dircmp(filecmp.dircmp(dir_to_copy_to_one_worker, dir_to_copy_to_parallel)))
+        self.assertFalse(dir_to_copy_to_parallel.joinpath("hootenanny").exists())
+
+        parallel_statistics = copy_and_get_statistics(dir_to_copy_to_parallel, 4)
+        self.assertEqual(parallel_statistics['skipped_files'], parallel_statistics['files'])
+
+        if hasattr(os, "mkfifo"):
+            fifo_path = dir_to_copy_from.joinpath("a_fifo")
+            os.mkfifo(fifo_path)
+            dir_to_copy_to_with_error = self.pbt.path_inside_test_folder("copy-target-with-error")
+            with self.assertRaises(shutil.Error) as error_context:
+                copy_and_get_statistics(dir_to_copy_to_with_error, 4)
+            self.assertEqual([error[0] for error in error_context.exception.args[0]], [os.fspath(fifo_path)])
+            self.assertTrue(is_identical_dircmp(filecmp.dircmp(dir_to_copy_to_one_worker, dir_to_copy_to_with_error, ignore=["a_fifo"])))
+
     def test_CopyDirToDir_repr(self):
         dir_from = r"\p\o\i"
         dir_to = "/q/w/r"
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3.12
+
+
+import unittest
+import asyncio
+import threading
+import functools
+from collections import Counter
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import logging
+log = logging.getLogger(__name__)
+
+import utils
+from pybatch import *
+from pybatch.downloadBatchCommands import AdaptiveConcurrencyLimit
+from configVar import config_vars
+
+
+from .test_PythonBatchBase import *
+
+
+class FlakyHTTPRequestHandler(SimpleHTTPRequestHandler):
+    """ serve files from a folder, but fail the first request for files whose name starts with 'flaky' """
+    requests_counter = Counter()
+
+    def do_GET(self):
+        FlakyHTTPRequestHandler.requests_counter[self.path] += 1
+        if self.path.startswith("/flaky") and FlakyHTTPRequestHandler.requests_counter[self.path] == 1:
+            self.send_error(503, "try again")
+        else:
+            super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestPythonBatchDownload(unittest.TestCase):
+    def __init__(self, which_test):
+        super().__init__(which_test)
+        self.pbt = TestPythonBatch(self, which_test)
+
+    def setUp(self):
+        self.pbt.setUp()
+        config_vars["NATIVE_DOWNLOAD_RETRY_DELAY"] = 0
+        config_vars["CURL_RETRIES"] = 2
+        self.server_folder = self.pbt.path_inside_test_folder("server")
+        self.server_folder.mkdir()
+        FlakyHTTPRequestHandler.requests_counter.clear()
+        handler = functools.partial(FlakyHTTPRequestHandler, directory=os.fspath(self.server_folder))
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.pbt.tearDown()
+
+    def serve_file(self, file_name, contents):
+        file_path = self.server_folder.joinpath(file_name)
+        file_path.write_bytes(contents)
+        return f"{self.base_url}/{file_name}", utils.get_buffer_checksum(contents)
+
+    def test_DownloadManager_creates_folders(self):
+        """ DownloadManager is called from worker threads, it should create the download folder without
+            creating batch command objects
+        """
+        url, checksum = self.serve_file("deep.bin", b"deep contents")
+        download_path = self.pbt.path_inside_test_folder("a").joinpath("b", "c", "deep.bin")
+        dler = DownloadManager(report_own_progress=False)
+        try:
+            instance_counter_before = PythonBatchCommandBase.instance_counter
+            dler(url=url, path=download_path, checksum=checksum)
+            self.assertEqual(PythonBatchCommandBase.instance_counter, instance_counter_before)
+        finally:
+            dler.close()
+        self.assertEqual(download_path.read_bytes(), b"deep contents")
+
+    def test_ParallelDownload_repr(self):
+        self.pbt.reprs_test_runner(ParallelDownload("dl-native-all.csv"),
+                                   ParallelDownload("dl-native-all.csv", cookie="a=b", max_parallel_downloads=4))
+
+    def test_ParallelDownload(self):
+        download_folder = self.pbt.path_inside_test_folder("downloads")
+        download_items = list()
+        expected_contents = dict()
+        for i in range(32):
+            contents = os.urandom(i * 1021)
+            url, checksum = self.serve_file(f"file{i}.bin", contents)
+            download_path = download_folder.joinpath("sub", f"file{i}.bin")
+            download_items.append((url, download_path, checksum, len(contents)))
+            expected_contents[download_path] = contents
+        url, checksum = self.serve_file("flaky.bin", b"flaky contents")
+        download_items.append((url, download_folder.joinpath("flaky.bin"), checksum, 14))
+        expected_contents[download_folder.joinpath("flaky.bin")] = b"flaky contents"
+        url, checksum = self.serve_file("bad_checksum.bin", b"bad checksum")
+        download_items.append((url, download_folder.joinpath("bad_checksum.bin"), "0"*40, 12))
+        download_items.append((f"{self.base_url}/missing.bin", download_folder.joinpath("missing.bin"), "0"*40, 12))
+
+        download_list_file = self.pbt.path_inside_test_folder("dl-native-all.csv")
+        ParallelDownload.write_download_list(download_list_file, download_items)
+        with ParallelDownload(download_list_file, max_parallel_downloads=4, own_progress_count=len(download_items)) as downloader:
+            instance_counter_before = PythonBatchCommandBase.instance_counter
+            downloader()
+            # only the 4 DownloadManagers, created before the downloads start
+            self.assertEqual(PythonBatchCommandBase.instance_counter, instance_counter_before + 4)
+
+        self.assertEqual(downloader.num_failed_downloads, 2)
+        for download_path, contents in expected_contents.items():
+            self.assertEqual(download_path.read_bytes(), contents)
+        self.assertFalse(download_folder.joinpath("bad_checksum.bin").exists())
+        self.assertFalse(download_folder.joinpath("missing.bin").exists())
+        self.assertEqual(FlakyHTTPRequestHandler.requests_counter["/flaky.bin"], 2)
+        self.assertEqual(FlakyHTTPRequestHandler.requests_counter["/bad_checksum.bin"], 3)  # CURL_RETRIES+1 attempts
+        self.assertEqual(list(download_folder.rglob("*.downloading")), [])
+
+    def test_ParallelDownload_in_batch(self):
+        url, checksum = self.serve_file("batch.bin", b"downloaded by batch file")
+        download_path = self.pbt.path_inside_test_folder("batch.bin")
+        download_list_file = self.pbt.path_inside_test_folder("dl-native-all.csv")
+        ParallelDownload.write_download_list(download_list_file, [(url, download_path, checksum, 24)])
+        self.pbt.batch_accum.clear(section_name="doit")
+        self.pbt.batch_accum += ParallelDownload(download_list_file)
+        self.pbt.exec_and_capture_output()
+        self.assertEqual(download_path.read_bytes(), b"downloaded by batch file")
+
+
+class TestAdaptiveConcurrencyLimit(unittest.TestCase):
+    def test_limit_adapts(self):
+        async def adapt():
+            limit = AdaptiveConcurrencyLimit(initial_limit=4, max_limit=6)
+            for _ in range(100):
+                limit.success()
+            self.assertEqual(limit.limit, 6)
+            limit.failure()
+            self.assertEqual(limit.limit, 3)
+            for _ in range(10):
+                limit.failure()
+            self.assertEqual(limit.limit, 1)
+            async with limit:
+                self.assertEqual(limit.active, 1)
+            self.assertEqual(limit.active, 0)
+
+        asyncio.run(adapt())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -392,7 +392,7 @@ class TestPythonBatchFileSystem(unittest.TestCase):
 
         # change to rwxrwxrwx
         new_mode = stat.S_IMODE(stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH | stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
-        if sys.platform == 'darwin':  # Adding executable bit for mac
+        if sys.platform != 'win32':  # Adding executable bit for mac and linux
             new_mode = stat.S_IMODE(new_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
 
         new_mode_symbolic = 'a=rwx'
@@ -425,7 +425,7 @@ class TestPythonBatchFileSystem(unittest.TestCase):
         mod_after = stat.S_IMODE(os.stat(file_to_chmod).st_mode)
         self.assertEqual(new_mode, mod_after, f"{self.pbt.which_test}: failed to chmod to {utils.unix_permissions_to_str(new_mode)} got {utils.unix_permissions_to_str(mod_after)}")
 
-        if sys.platform == 'darwin':  # Windows doesn't have an executable bit, test is skipped
+        if sys.platform != 'win32':  # Windows doesn't have an executable bit, test is skipped
             # change to rwxrwxrw-
             new_mode = stat.S_IMODE(stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH | stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH | stat.S_IXUSR | stat.S_IXGRP)
             new_mode_symbolic = 'ug+x'
@@ -502,7 +502,7 @@ class TestPythonBatchFileSystem(unittest.TestCase):
         self.pbt.batch_accum.clear(section_name="doit")
         self.pbt.batch_accum += Chmod(folder_to_chmod, new_mode_symbolic, recursive=True)
 
-        self.pbt.exec_and_capture_output("chmod invalid", expected_exception=subprocess.CalledProcessError)
+        self.pbt.exec_and_capture_output("chmod invalid", expected_exception=ValueError)
 
         # change to r-xr-xr-x
         new_mode_symbolic = 'a-w'
@@ -623,6 +623,32 @@ class TestPythonBatchFileSystem(unittest.TestCase):
         are_files_the_same = filecmp.cmp(file_to_split_before, file_to_split, shallow=False)
         self.assertTrue(are_files_the_same, f"{self.pbt.which_test}: before split and after join fies are not the same")
 
+    def test_SplitJoinFile_checksums(self):
+        """ split a file bigger than the copy buffer, calculating the parts' checksums while splitting """
+        file_to_split: Path = self.pbt.path_inside_test_folder("file_to_split")
+        original_data = os.urandom(3 * 1024 * 1024 + 17)
+        file_to_split.write_bytes(original_data)
+
+        with SplitFile(file_to_split, 1024 * 1024, calc_checksums=True, report_own_progress=False) as splitter:
+            splitter()
+        self.assertFalse(file_to_split.exists())
+        self.assertEqual(len(splitter.part_checksums), 4)
+        for part_path, part_checksum in splitter.part_checksums.items():
+            self.assertEqual(part_checksum, utils.get_file_checksum(part_path))
+
+        with JoinFile(file_to_split.with_name("file_to_split.aa"), report_own_progress=False) as joiner:
+            joiner()
+        self.assertEqual(file_to_split.read_bytes(), original_data)
+        self.assertEqual(list(file_to_split.parent.glob("file_to_split.a?")), [])
+
+        # max_size 0 with remove_original just renames the file
+        original_inode = file_to_split.stat().st_ino
+        with SplitFile(file_to_split, 0, calc_checksums=True, report_own_progress=False) as splitter:
+            splitter()
+        first_part = file_to_split.with_name("file_to_split.aa")
+        self.assertEqual(first_part.stat().st_ino, original_inode)
+        self.assertEqual(splitter.part_checksums, {first_part: utils.get_buffer_checksum(original_data)})
+
     def test_Glober_repr(self):
         self.pbt.reprs_test_runner(Glober('rumba/*', Print, "shoshana"),
                                    Glober('rumba/*', Print, "shoshana", "banana"),
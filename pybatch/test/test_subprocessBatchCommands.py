@@ -21,7 +21,8 @@ from pybatch import *
 from pybatch import PythonBatchCommandAccum
 from pybatch.copyBatchCommands import RsyncClone
 from configVar import config_vars
-from utils.parallel_run import run_process, ProcessTerminatedExternally
+from utils.parallel_run import run_process, run_processes_in_parallel, ProcessTerminatedExternally
+import utils.parallel_run
 
 current_os_names = utils.get_current_os_names()
 os_family_name = current_os_names[0]
@@ -306,6 +307,54 @@ class TestPythonBatchSubprocess(unittest.TestCase):
             with assert_timeout(3):
                 run_process(cmd, shell=(sys.platform == 'win32'), abort_file=abort_file)
 
+    def test_run_processes_in_parallel(self):
+        """ output of all processes is logged line by line, "wait" separates groups of commands, and
+            the exit code is the status of the failed command
+        """
+        utils.parallel_run.aborted = False  # might have been set by test_run_process_abort
+        order_file = os.path.join(self.pbt.test_folder, 'order.txt')
+        script = 'import sys; print("line one"); print("line two", file=sys.stderr); sys.stdout.write("no newline")'
+        append_script = f'open(r"{order_file}", "a").write(sys.argv[1])'
+        commands = [[sys.executable, '-c', script],
+                    [sys.executable, '-c', f'import sys, time; time.sleep(0.5); {append_script}', 'A'],
+                    ['wait'],
+                    [sys.executable, '-c', f'import sys; {append_script}', 'B']]
+        with self.assertLogs(level='INFO') as logs:
+            with self.assertRaises(SystemExit) as context:
+                with assert_timeout(10):
+                    run_processes_in_parallel(commands)
+        self.assertEqual(context.exception.code, 0)
+        for line in ("line one", "line two", "no newline"):
+            self.assertIn(line, [record.getMessage() for record in logs.records])
+        with open(order_file) as rfd:
+            self.assertEqual(rfd.read(), "AB")
+
+        with self.assertRaises(SystemExit) as context:
+            run_processes_in_parallel([[sys.executable, '-c', 'import sys; sys.exit(7)'],
+                                       [sys.executable, '-c', 'import time; time.sleep(0.2)']])
+        self.assertEqual(context.exception.code, 7)
+
+        with self.assertRaises(RuntimeError):
+            run_process([sys.executable, '-c', 'import sys; sys.exit(3)'], shell=False)
+        self.assertEqual(utils.parallel_run.exit_val, 3)
+
+    def test_output_logger_background_child(self):
+        """ OutputLogger stops waiting for pipes held open by a background child after the process exited,
+            both with the selector (Unix) and with reader threads (Windows)
+        """
+        grandchild = 'import time; time.sleep(8)'
+        script = f'import subprocess, sys; subprocess.Popen([sys.executable, "-c", "{grandchild}"]); print("started")'
+        for log_method in ("log_with_selector", "log_with_threads"):
+            if log_method == "log_with_selector" and sys.platform == 'win32':
+                continue
+            with self.subTest(log_method=log_method):
+                a_process = subprocess.Popen([sys.executable, '-c', script], stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+                with self.assertLogs(level='INFO') as logs:
+                    with assert_timeout(5):
+                        getattr(utils.parallel_run.OutputLogger([a_process]), log_method)()
+                a_process.wait()
+                self.assertIn("started", [record.getMessage() for record in logs.records])
+
     def test_KillProcess_repr(self):
         """ validate KillProcess object recreation with ParallelRun.__repr__() """
         self.pbt.reprs_test_runner(KillProcess("itsik"),
@@ -2,8 +2,11 @@
 
 
 import unittest
+import tarfile
+from pathlib import PurePath
 
 from pybatch import *
+import utils.misc_utils
 
 current_os_names = utils.get_current_os_names()
 os_family_name = current_os_names[0]
@@ -73,6 +76,167 @@ class TestPythonBatchWtar(unittest.TestCase):
         dir_wtar_unwtar_diff = filecmp.dircmp(folder_to_wtar, unwtared_folder, ignore=['.DS_Store'])
         self.assertTrue(is_identical_dircmp(dir_wtar_unwtar_diff), f"{self.pbt.which_test} : before wtar and after unwtar dirs are not the same")
 
+    def test_Wtar_parallel_compress(self):
+        """ Wtar with several compress workers creates multi-stream bz2 which should be identical
+            regardless of the number of workers, and unwtar to the original folder
+        """
+        folder_to_wtar = self.pbt.path_inside_test_folder("folder-to-wtar")
+        with MakeDir(folder_to_wtar, report_own_progress=False) as md:
+            md()
+        for i in range(12):
+            folder_to_wtar.joinpath(f"file{i}.txt").write_text(''.join(random.choice(string.ascii_lowercase) for j in range(64 * 1024)))
+
+        wtar_files = list()
+        for compress_workers in (2, 5):
+            config_vars["WTAR_COMPRESS_WORKERS"] = compress_workers
+            where_to_put_wtar = self.pbt.path_inside_test_folder(f"wtar-{compress_workers}")
+            where_to_put_wtar.mkdir()
+            with utils.ChangeDirIfExists(folder_to_wtar.parent):
+                utils.ParallelBZ2Writer.default_chunk_size = 64 * 1024  # so the test will create several bz2 streams
+                try:
+                    with Wtar(folder_to_wtar, where_to_put_wtar, report_own_progress=False) as wtarrer:
+                        wtarrer()
+                finally:
+                    utils.ParallelBZ2Writer.default_chunk_size = 4 * 1024 * 1024
+            wtar_files.append(where_to_put_wtar.joinpath("folder-to-wtar.wtar.aa"))
+        config_vars["WTAR_COMPRESS_WORKERS"] = 1
+        self.assertTrue(filecmp.cmp(*wtar_files, shallow=False))
+        self.assertGreater(wtar_files[0].read_bytes().count(b"BZh1"), 1)
+
+        unwtar_here = self.pbt.path_inside_test_folder("unwtar-here")
+        with Unwtar(wtar_files[0], unwtar_here, report_own_progress=False) as unwtarrer:
+            unwtarrer()
+        self.assertTrue(is_identical_dircmp(filecmp.dircmp(folder_to_wtar, unwtar_here.joinpath("folder-to-wtar"))))
+
+    def test_Wtar_checksums(self):
+        """ Wtar should read each file once to checksum it, and reuse the checksum for the file's pax header.
+            Symlinks are archived as symlinks but their pax header checksum is the checksum of the file they point to.
+        """
+        folder_to_wtar = self.pbt.path_inside_test_folder("folder-to-wtar")
+        folder_to_wtar.joinpath("sub").mkdir(parents=True)
+        for i in range(5):
+            folder_to_wtar.joinpath("sub", f"file{i}.txt").write_text(''.join(random.choice(string.ascii_lowercase) for j in range(1024)))
+        os.symlink("file0.txt", folder_to_wtar.joinpath("sub", "link0.txt"))
+
+        checksummed_paths = list()
+        original_get_file_checksum = utils.get_file_checksum
+
+        def counting_get_file_checksum(file_path, *args, **kwargs):
+            checksummed_paths.append(PurePath(file_path).as_posix())
+            return original_get_file_checksum(file_path, *args, **kwargs)
+
+        utils.get_file_checksum = utils.misc_utils.get_file_checksum = counting_get_file_checksum
+        try:
+            with Wtar(folder_to_wtar, report_own_progress=False) as wtarrer:
+                wtarrer()
+        finally:
+            utils.get_file_checksum = utils.misc_utils.get_file_checksum = original_get_file_checksum
+        self.assertEqual(sorted(checksummed_paths), sorted([f"folder-to-wtar/sub/file{i}.txt" for i in range(5)] + ["folder-to-wtar/sub/link0.txt"] * 2))
+
+        with tarfile.open(folder_to_wtar.with_name("folder-to-wtar.wtar.aa")) as tar:
+            for tarinfo in tar.getmembers():
+                if tarinfo.isfile() or tarinfo.issym():
+                    self.assertEqual(tarinfo.pax_headers["checksum"], utils.get_file_checksum(folder_to_wtar.parent.joinpath(tarinfo.name)), tarinfo.name)
+
+    def test_Unwtar_manifest(self):
+        """ after unwtar a manifest is written, checking if the same wtar needs to be unwtarred again
+            should read only files that changed since.
+        """
+        folder_to_wtar = self.pbt.path_inside_test_folder("folder-to-wtar")
+        folder_to_wtar.joinpath("sub").mkdir(parents=True)
+        for i in range(5):
+            folder_to_wtar.joinpath("sub", f"file{i}.txt").write_text(''.join(random.choice(string.ascii_lowercase) for j in range(1024)))
+        os.symlink("file0.txt", folder_to_wtar.joinpath("sub", "link0.txt"))
+        with Wtar(folder_to_wtar, report_own_progress=False) as wtarrer:
+            wtarrer()
+        wtar_file = folder_to_wtar.with_name("folder-to-wtar.wtar.aa")
+        unwtar_here = self.pbt.path_inside_test_folder("unwtar-here")
+        unwtarred_folder = unwtar_here.joinpath("folder-to-wtar")
+
+        checksummed_paths = list()
+        original_get_file_checksum = utils.misc_utils.get_file_checksum
+
+        def counting_get_file_checksum(file_path, *args, **kwargs):
+            checksummed_paths.append(PurePath(os.path.relpath(file_path, unwtar_here)).as_posix())
+            return original_get_file_checksum(file_path, *args, **kwargs)
+
+        def unwtar_and_count_checksummed_files():
+            checksummed_paths.clear()
+            utils.misc_utils.get_file_checksum = counting_get_file_checksum
+            try:
+                with Unwtar(wtar_file, unwtar_here, report_own_progress=False) as unwtarrer:
+                    unwtarrer()
+            finally:
+                utils.misc_utils.get_file_checksum = original_get_file_checksum
+            return sorted(checksummed_paths)
+
+        manifests_folder = self.pbt.path_inside_test_folder("manifests")
+        config_vars["UNWTAR_MANIFESTS_FOLDER"] = manifests_folder
+        try:
+            self.assertEqual(unwtar_and_count_checksummed_files(), [])  # first unwtar, destination does not exist
+            self.assertEqual(len(list(manifests_folder.iterdir())), 1)
+
+            self.assertEqual(unwtar_and_count_checksummed_files(), [])  # nothing changed, so nothing is read
+
+            changed_file = unwtarred_folder.joinpath("sub", "file3.txt")
+            changed_file.write_text("changed")
+            self.assertEqual(unwtar_and_count_checksummed_files(), ["folder-to-wtar/sub/file3.txt"])  # only changed file is read
+            self.assertTrue(filecmp.cmp(changed_file, folder_to_wtar.joinpath("sub", "file3.txt"), shallow=False))  # and it was unwtarred again
+            self.assertTrue(unwtarred_folder.joinpath("sub", "link0.txt").is_symlink())
+
+            self.assertEqual(unwtar_and_count_checksummed_files(), [])
+
+            # a different file with the same size and mtime is found by it's ctime and inode
+            replaced_file = unwtarred_folder.joinpath("sub", "file1.txt")
+            original_stat = replaced_file.stat()
+            replacement_file = replaced_file.with_name("replacement.tmp")
+            replacement_file.write_text("x" * original_stat.st_size)
+            os.utime(replacement_file, ns=(original_stat.st_atime_ns, original_stat.st_mtime_ns))
+            os.replace(replacement_file, replaced_file)
+            self.assertEqual(unwtar_and_count_checksummed_files(), ["folder-to-wtar/sub/file1.txt"])
+            self.assertTrue(filecmp.cmp(replaced_file, folder_to_wtar.joinpath("sub", "file1.txt"), shallow=False))
+        finally:
+            del config_vars["UNWTAR_MANIFESTS_FOLDER"]
+
+    def test_Unwtar_folder_parallel(self):
+        """ Unwtar a folder with several wtar files with a pool of threads.
+            A corrupted wtar file should not stop the other files from being unwtarred, and it's error should be raised
+        """
+        config_vars["UNWTAR_MAX_THREADS"] = 2
+        folder_with_wtars = self.pbt.path_inside_test_folder("folder-with-wtars")
+        folders_to_wtar = [folder_with_wtars.joinpath(f"sub{i % 2}", f"folder-to-wtar-{i}") for i in range(4)]
+        for folder_to_wtar in folders_to_wtar:
+            with MakeDir(folder_to_wtar, report_own_progress=False) as md:
+                md()
+            for j in range(5):
+                folder_to_wtar.joinpath(f"file{j}.txt").write_text(''.join(random.choice(string.ascii_lowercase) for i in range(1024)))
+            with Wtar(folder_to_wtar, report_own_progress=False) as wtarrer:
+                wtarrer()
+        wtarred_contents = {folder_to_wtar: sorted(p.name for p in folder_to_wtar.iterdir()) for folder_to_wtar in folders_to_wtar}
+        for folder_to_wtar in folders_to_wtar:
+            shutil.rmtree(folder_to_wtar)
+
+        with Unwtar(folder_with_wtars, no_artifacts=True, report_own_progress=False) as unwtarrer:
+            unwtarrer()
+        for folder_to_wtar in folders_to_wtar:
+            self.assertEqual(sorted(p.name for p in folder_to_wtar.iterdir()), wtarred_contents[folder_to_wtar])
+        self.assertEqual(list(folder_with_wtars.rglob("*.wtar*")), [])
+
+        for folder_to_wtar in folders_to_wtar[:2]:
+            with Wtar(folder_to_wtar, report_own_progress=False) as wtarrer:
+                wtarrer()
+            shutil.rmtree(folder_to_wtar)
+        corrupted_wtar = folders_to_wtar[0].with_name(folders_to_wtar[0].name + ".wtar")
+        corrupted_wtar.write_bytes(b"not a wtar file")
+        with self.assertLogs(level=logging.WARNING) as captured_logs:
+            with self.assertRaises(Exception):
+                with Unwtar(folder_with_wtars, report_own_progress=False) as unwtarrer:
+                    unwtarrer()
+        self.assertEqual(unwtarrer.wtar_file_paths, [corrupted_wtar])
+        # the warning logged by the worker thread reached the log
+        self.assertTrue(any("tarfile error while unwtarring" in message for message in captured_logs.output), captured_logs.output)
+        self.assertEqual(sorted(p.name for p in folders_to_wtar[1].iterdir()), wtarred_contents[folders_to_wtar[1]])
+
     def test_Wzip_repr(self):
         list_of_objs = list()
         list_of_objs.append(Wzip("/the/memphis/belle"))
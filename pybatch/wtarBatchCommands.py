@@ -1,10 +1,15 @@
 import filecmp
 import logging
 import os
+import shutil
 import stat
+import sys
 import tarfile
 import zipfile
+import json
+import hashlib
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List
 
@@ -13,8 +18,8 @@ import zlib
 import utils
 from configVar import config_vars
 from .baseClasses import PythonBatchCommandBase
-from .fileSystemBatchCommands import SplitFile, FixAllPermissions, MakeDir
-from .removeBatchCommands import RmDir, RmFile
+from .fileSystemBatchCommands import SplitFile, FixAllPermissions, MakeDir, change_permissions_in_process
+from .removeBatchCommands import RmFile
 
 log = logging.getLogger(__name__)
 
@@ -96,7 +101,9 @@ class Wtar(PythonBatchCommandBase):
                 If total_checksums are no identical the old wtar files wil be removed and a new war created. Removing the old wtars
                 ensures that if the number of new wtar split files is smaller than the number of old split files, not extra files wil remain. E.g. if before [a.wtar.aa, a.wtar.ab, a.wtar.ac] and after  [a.wtar.aa, a.wtar.ab] a.wtar.ac will be removed.
             Format of the tar is PAX_FORMAT.
-            Compression is bzip2.
+            Compression is bzip2. If WTAR_COMPRESS_WORKERS is > 1 (0 means number of CPUs) the tar is compressed
+                by utils.ParallelBZ2Writer as multi-stream bzip2, which is unwtarred the same way as single stream,
+                but is not byte identical to single stream. Default is 1, single stream.
 
         """
 
@@ -132,7 +139,9 @@ class Wtar(PythonBatchCommandBase):
         with FixAllPermissions(resolved_what_to_wtar, report_own_progress=False, recursive=resolved_what_to_wtar.is_dir()) as perm_fixer:
             perm_fixer()
         with utils.ChangeDirIfExists(resolved_what_to_wtar.parent):
-            pax_headers = {"total_checksum": utils.get_recursive_checksums(resolved_what_to_wtar.name, ignore=ignore_files)["total_checksum"]}
+            # checksums of individual files are kept so check_tarinfo will not need to read the files again
+            file_checksums = utils.get_recursive_checksums(resolved_what_to_wtar.name, ignore=ignore_files)
+            pax_headers = {"total_checksum": file_checksums["total_checksum"]}
 
             def check_tarinfo(tarinfo):
                 for ig in ignore_files:
@@ -149,7 +158,10 @@ class Wtar(PythonBatchCommandBase):
                     # ourselves AND passing an OrderedDict as the pax_headers
                     # hopefully the final tar will be the same for different runs.
                     file_pax_headers = OrderedDict()
-                    file_pax_headers["checksum"] = utils.get_file_checksum(tarinfo.path)
+                    # get_recursive_checksums does not follow symlinks, while here the checksum
+                    # of a symlink is the checksum of the file it points to
+                    the_checksum = None if tarinfo.issym() else file_checksums.get(tarinfo.name)
+                    file_pax_headers["checksum"] = the_checksum or utils.get_file_checksum(tarinfo.path)
                     mode_time = str(float(os.lstat(tarinfo.path)[stat.ST_MTIME]))
                     file_pax_headers["mtime"] = mode_time
                     tarinfo.pax_headers = file_pax_headers
@@ -159,8 +171,15 @@ class Wtar(PythonBatchCommandBase):
                 if utils.is_first_wtar_file(target_wtar_file):
                     existing_wtar_parts = utils.find_split_files_from_base_file(target_wtar_file)
                     [utils.safe_remove_file(f) for f in existing_wtar_parts]
-                with tarfile.open(target_wtar_file, "w:bz2", format=tarfile.PAX_FORMAT, pax_headers=pax_headers, compresslevel=compresslevel) as tar:
-                    tar.add(resolved_what_to_wtar.name, filter=check_tarinfo)
+                compress_workers = int(config_vars.get("WTAR_COMPRESS_WORKERS", 1)) or os.cpu_count() or 1
+                if compress_workers > 1:
+                    # multi-stream bz2, compressed in chunks by several threads
+                    with utils.ParallelBZ2Writer(target_wtar_file, compresslevel=compresslevel, max_workers=compress_workers) as bz2_writer:
+                        with tarfile.open(fileobj=bz2_writer, mode="w", format=tarfile.PAX_FORMAT, pax_headers=pax_headers) as tar:
+                            tar.add(resolved_what_to_wtar.name, filter=check_tarinfo)
+                else:
+                    with tarfile.open(target_wtar_file, "w:bz2", format=tarfile.PAX_FORMAT, pax_headers=pax_headers, compresslevel=compresslevel) as tar:
+                        tar.add(resolved_what_to_wtar.name, filter=check_tarinfo)
 
                 with SplitFile(target_wtar_file, max_size=self.split_threshold, own_progress_count=0) as sf:
                     sf()
@@ -168,6 +187,61 @@ class Wtar(PythonBatchCommandBase):
                 log.debug(f"{resolved_what_to_wtar.name} skipped since {resolved_what_to_wtar.name}.wtar already exists and has the same contents")
 
 
+def unwtar_manifest_path(manifests_folder: Path, destination_path: Path) -> Path:
+    """ unwtar manifests are kept outside the destination, so they will not change the contents of installed bundles """
+    return Path(manifests_folder, hashlib.sha1(destination_path.as_posix().encode()).hexdigest() + ".json")
+
+
+def read_unwtar_manifest(manifest_path: Path):
+    """ return the files part of an unwtar manifest: {path: [size, mtime_ns, ctime_ns, inode, checksum]}, or None if manifest could not be read """
+    retVal = None
+    try:
+        with open(manifest_path, "r") as rfd:
+            retVal = json.load(rfd)["files"]
+    except Exception:
+        pass
+    return retVal
+
+
+def write_unwtar_manifest(manifest_path: Path, total_checksum, files_manifest) -> None:
+    """ write to a temp file and replace, so a partially written manifest will never be read """
+    try:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_manifest_path = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_manifest_path, "w") as wfd:
+            json.dump({"total_checksum": total_checksum, "files": files_manifest}, wfd)
+        os.replace(temp_manifest_path, manifest_path)
+    except Exception as ex:
+        log.debug(f"failed to write unwtar manifest {manifest_path}: {ex}")
+
+
+def remove_file_or_folder(path_to_remove: Path) -> None:
+    """ remove a file or a folder like RmDir does - it's OK if path_to_remove does not exist and
+        if removing failed on permissions, permissions are fixed and removing is attempted again.
+        Does not create batch command objects, so it can be called from Unwtar's threads.
+    """
+    for attempt in range(2):
+        try:
+            if path_to_remove.is_symlink() or not path_to_remove.is_dir():
+                path_to_remove.unlink()
+            elif sys.platform == 'win32':
+                # on Windows read-only files cannot be removed, so clear the read-only bit and try again
+                shutil.rmtree(path_to_remove, onerror=lambda func, path, exc_info: (os.chmod(path, stat.S_IWRITE), func(path)))
+            else:
+                shutil.rmtree(path_to_remove)
+            break
+        except FileNotFoundError:
+            break
+        except PermissionError:
+            if attempt == 0 and sys.platform != 'win32':
+                log.info(f"Fixing permission for removing {path_to_remove}")
+                the_mode = config_vars.get("FIX_ALL_PERMISSIONS_SYMBOLIC_MODE", "u+rwx,go+rx").str()
+                change_permissions_in_process(path_to_remove, mode=the_mode, flags_to_clear=stat.UF_HIDDEN | stat.UF_IMMUTABLE,
+                                              recursive=True, ignore_errors=True)
+            else:
+                raise
+
+
 class Unwtar(PythonBatchCommandBase):
     """ uncompress a wtar archive
     """
@@ -192,7 +266,11 @@ class Unwtar(PythonBatchCommandBase):
         # replace plain paths with detailed info such as size, permissions, mod date, user, group
         self.wtar_file_paths = [utils.single_disk_item_listing(wtar_file_path, "PuUgGRTfC") for wtar_file_path in self.wtar_file_paths]
 
-    def unwtar_a_file(self, wtar_file_path: Path, destination_folder: Path, no_artifacts=False, ignore=None, copy_owner=False):
+    def unwtar_a_file(self, wtar_file_path: Path, destination_folder: Path, no_artifacts=False, ignore=None, copy_owner=False, manifests_folder=None):
+        """ if manifests_folder is given, a manifest with size, mtime, ctime, inode and checksum of each unwtarred file is kept there.
+            Next time the same destination is checked against total_checksum, only files whose size, mtime, ctime or inode
+            changed since the manifest was written need to be read.
+        """
         if ignore is None:
             ignore = ()
         try:
@@ -205,6 +283,8 @@ class Unwtar(PythonBatchCommandBase):
             self.doing = f"""unwtar file '{wtar_file_path}' to '{destination_folder} ({"already exists" if destination_path.exists() else "not exists"})'"""
 
             do_the_unwtarring = True
+            manifest_path = unwtar_manifest_path(manifests_folder, destination_path) if manifests_folder else None
+            files_manifest = None
             with utils.MultiFileReader("br", self.wtar_file_paths) as fd:
                 with tarfile.open(fileobj=fd) as tar:
                     tar_total_checksum = tar.pax_headers.get("total_checksum")
@@ -212,8 +292,10 @@ class Unwtar(PythonBatchCommandBase):
                     if tar_total_checksum:
                         try:
                             if destination_path.exists():
-                                with utils.ChangeDirIfExists(destination_folder):
-                                    disk_total_checksum = utils.get_recursive_checksums(destination_leaf_name, ignore=ignore).get("total_checksum", "disk_total_checksum_was_not_found")
+                                if manifest_path:
+                                    files_manifest = read_unwtar_manifest(manifest_path) or dict()
+                                disk_total_checksum = utils.get_recursive_checksums(destination_leaf_name, ignore=ignore, manifest=files_manifest,
+                                                                                    root_folder=destination_folder).get("total_checksum", "disk_total_checksum_was_not_found")
                                     # log.debug(f"total checksum for destination {destination_folder} {disk_total_checksum}")
 
                                 if disk_total_checksum == tar_total_checksum:
@@ -223,22 +305,29 @@ class Unwtar(PythonBatchCommandBase):
                             # if checking checksum failed for any reason -> do the unwtarring
                             pass
                     if do_the_unwtarring:
-                        with RmDir(destination_path, report_own_progress=False, recursive=True) as dir_remover:
-                            # RmDir will also remove a file and will not raise if destination_path does not exist
-                            dir_remover()
+                        if manifest_path:
+                            utils.safe_remove_file(manifest_path)
+                        # will also remove a file and will not raise if destination_path does not exist
+                        remove_file_or_folder(destination_path)
                         tar.extractall(destination_folder)
 
-                        if copy_owner:
-                            from pybatch import Chown
+                        if copy_owner and not self.skip_chown:
                             first_wtar_file_st = self.wtar_file_paths[0].stat()
-                            # log.debug(f"copy_owner: {destination_folder} {first_wtar_file_st[stat.ST_UID]}:{first_wtar_file_st[stat.ST_GID]}")
-                            Chown(destination_folder, first_wtar_file_st[stat.ST_UID], first_wtar_file_st[stat.ST_GID], recursive=True)()
+                            # like Chown, 0 (root) means do not change
+                            user_id, group_id = first_wtar_file_st[stat.ST_UID] or -1, first_wtar_file_st[stat.ST_GID] or -1
+                            if (user_id, group_id) != (-1, -1):
+                                # like chown -f -R failures to change the owner of specific items are ignored
+                                change_permissions_in_process(destination_folder, user_id=user_id, group_id=group_id, ignore_errors=True)
+                        # after changing owner, which changes ctime
+                        if manifest_path and tar_total_checksum:
+                            write_unwtar_manifest(manifest_path, tar_total_checksum, self.manifest_from_tar_members(tar, destination_folder))
                     else:
                         log.info(f"skip uwtar of {destination_path} because it exists and matches wtar file checksum")
+                        if manifest_path:
+                            write_unwtar_manifest(manifest_path, tar_total_checksum, files_manifest)
             if no_artifacts:
                 for wtar_file in self.wtar_file_paths:
-                    with RmFile(wtar_file, report_own_progress=False) as wtar_remover:
-                        wtar_remover()
+                    remove_file_or_folder(wtar_file)
 
         except OSError as e:
             log.warning(f"Invalid stream on split file with {self.wtar_file_paths[0]}")
@@ -248,10 +337,74 @@ class Unwtar(PythonBatchCommandBase):
             log.warning(f"tarfile error while unwtarring file {self.wtar_file_paths[0]}")
             raise
 
+    @staticmethod
+    def manifest_from_tar_members(tar, destination_folder: Path):
+        """ after extraction checksums are taken from the pax headers Wtar writes for each file, so unwtarred files are not read again.
+            Symlinks' pax header checksum is for the file they point to, while the manifest keeps the checksum of the link itself.
+        """
+        retVal = dict()
+        for tarinfo in tar.getmembers():
+            if tarinfo.issym():
+                the_checksum = utils.get_buffer_checksum(tarinfo.linkname.encode())
+            elif tarinfo.isreg() or tarinfo.islnk():
+                the_checksum = tarinfo.pax_headers.get("checksum")
+            else:
+                continue
+            if the_checksum:
+                try:
+                    the_stat = os.lstat(destination_folder.joinpath(tarinfo.name))
+                    retVal[tarinfo.name] = utils.manifest_entry(the_stat, the_checksum)
+                except OSError:
+                    pass
+        return retVal
+
+    def unwtar_many_files(self, wtar_files_to_unwtar, ignore_files, manifests_folder):
+        """ unwtar a list of (first wtar file, destination folder) in a pool of threads, bz2 decompression
+            and file writing release the GIL. Progress is reported for each archive as it finishes.
+            All archives are attempted even if some fail, failures are logged and the first one to fail is raised.
+            Each archive is unwtarred by it's own Unwtar object, created here so the threads do not share state.
+            Pool size is UNWTAR_MAX_THREADS or the number of CPUs. If only one thread is
+            needed - archives are unwtarred in this thread one after the other.
+        """
+        max_threads = int(config_vars.get("UNWTAR_MAX_THREADS", os.cpu_count() or 1))
+        num_threads = max(1, min(max_threads, len(wtar_files_to_unwtar)))
+        if num_threads == 1:
+            for wtar_file_path, where_to_unwtar_the_file in wtar_files_to_unwtar:
+                self.unwtar_a_file(wtar_file_path, where_to_unwtar_the_file, no_artifacts=self.no_artifacts, ignore=ignore_files, copy_owner=self.copy_owner, manifests_folder=manifests_folder)
+            return
+
+        self.doing = f"""unwtar {len(wtar_files_to_unwtar)} files from '{self.what_to_unwtar}' with {num_threads} threads"""
+        first_exception = None
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            unwtar_futures = dict()
+            for wtar_file_path, where_to_unwtar_the_file in wtar_files_to_unwtar:
+                unwtarrer = Unwtar(wtar_file_path, where_to_unwtar_the_file, no_artifacts=self.no_artifacts, copy_owner=self.copy_owner,
+                                   skip_chown=self.skip_chown, report_own_progress=False)
+                unwtar_future = executor.submit(unwtarrer.unwtar_a_file, wtar_file_path, where_to_unwtar_the_file, no_artifacts=self.no_artifacts,
+                                                ignore=ignore_files, copy_owner=self.copy_owner, manifests_folder=manifests_folder)
+                unwtar_futures[unwtar_future] = (wtar_file_path, where_to_unwtar_the_file)
+            for unwtar_future in as_completed(unwtar_futures):
+                wtar_file_path, where_to_unwtar_the_file = unwtar_futures[unwtar_future]
+                try:
+                    unwtar_future.result()
+                    self.increment_and_output_progress(increment_by=0, prog_msg=f"expanded {wtar_file_path}")
+                except Exception as ex:
+                    log.warning(f"failed to unwtar {wtar_file_path} to {where_to_unwtar_the_file}: {ex}")
+                    if first_exception is None:
+                        first_exception = ex
+                        self.wtar_file_paths = utils.find_split_files(wtar_file_path)
+        if first_exception is not None:
+            raise first_exception
+
     def __call__(self, *args, **kwargs) -> None:
 
         PythonBatchCommandBase.__call__(self, *args, **kwargs)
         ignore_files = list(config_vars.get("WTAR_IGNORE_FILES", []))
+        manifests_folder = None
+        if "UNWTAR_MANIFESTS_FOLDER" in config_vars:
+            manifests_folder_str = config_vars["UNWTAR_MANIFESTS_FOLDER"].str()
+            if manifests_folder_str and config_vars.is_str_resolved(manifests_folder_str):
+                manifests_folder = utils.ExpandAndResolvePath(manifests_folder_str)
 
         self.what_to_unwtar = utils.ExpandAndResolvePath(self.what_to_unwtar)
 
@@ -262,7 +415,7 @@ class Unwtar(PythonBatchCommandBase):
                 else:
                     destination_folder = self.what_to_unwtar.parent
 
-                self.unwtar_a_file(self.what_to_unwtar, destination_folder, no_artifacts=self.no_artifacts, ignore=ignore_files, copy_owner=self.copy_owner)
+                self.unwtar_a_file(self.what_to_unwtar, destination_folder, no_artifacts=self.no_artifacts, ignore=ignore_files, copy_owner=self.copy_owner, manifests_folder=manifests_folder)
 
         elif self.what_to_unwtar.is_dir():
             if self.where_to_unwtar:
@@ -271,6 +424,7 @@ class Unwtar(PythonBatchCommandBase):
                 destination_folder = self.what_to_unwtar
             self.doing = f"""unwtar folder '{self.what_to_unwtar}' to '{destination_folder}''"""
             if not can_skip_unwtar(self.what_to_unwtar, destination_folder):
+                wtar_files_to_unwtar = list()
                 for root, dirs, files in os.walk(self.what_to_unwtar, followlinks=False):
                     # a hack to prevent unwtarring of the sync folder. Copy command might copy something
                     # to the top level of the sync folder.
@@ -284,8 +438,8 @@ class Unwtar(PythonBatchCommandBase):
                     for a_file in files:
                         a_file_path = root_Path.joinpath(a_file)
                         if utils.is_first_wtar_file(a_file_path):
-                            where_to_unwtar_the_file = destination_folder.joinpath(tail_folder)
-                            self.unwtar_a_file(a_file_path, where_to_unwtar_the_file, no_artifacts=self.no_artifacts, ignore=ignore_files, copy_owner=self.copy_owner)
+                            wtar_files_to_unwtar.append((a_file_path, destination_folder.joinpath(tail_folder)))
+                self.unwtar_many_files(wtar_files_to_unwtar, ignore_files, manifests_folder)
             else:
                 log.debug(f"unwtar {self.what_to_unwtar} to {self.where_to_unwtar} skipping unwtarring because both folders have the same Info.xml file")
 
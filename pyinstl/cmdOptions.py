@@ -57,6 +57,7 @@ class CommandLineOptions(object):
     __MAIN_COMMAND__ = OptionToConfigVar()
     __MAIN_INPUT_FILE__ = OptionToConfigVar()
     __MAIN_OUT_FILE__ = OptionToConfigVar()
+    __NO_CHECKSUM_CACHE__ = OptionToConfigVar()
     __NO_NUMBERS_PROGRESS__ = OptionToConfigVar()
     __NO_WTAR_ARTIFACTS__ = OptionToConfigVar()
     __OUTPUT_FORMAT__ = OptionToConfigVar()
@@ -108,8 +109,8 @@ def prepare_args_parser(in_command):
         'read-yaml':        {'mode': 'client', 'options': ('in', 'out'), 'help': "reads a yaml file to verify it's contents"},
         'remove':           {'mode': 'client', 'options': ('in', 'out', 'run', 'write-config-vars'), 'help': 'remove items installed by copy'},
         'report-versions':  {'mode': 'client', 'options': ('in', 'out', 'output_format', 'only_installed'), 'help': 'report what is installed and what needs update'},
-        'sync':             {'mode': 'client', 'options': ('in', 'out', 'run', 'cred', 'write-config-vars'), 'help': 'sync files to be installed from server to local disk'},
-        'synccopy':         {'mode': 'client', 'options': ('in', 'out', 'run', 'cred', 'write-config-vars'), 'help': 'sync files to be installed from server to  local disk and copy files to target paths'},
+        'sync':             {'mode': 'client', 'options': ('in', 'out', 'run', 'cred', 'write-config-vars', 'checksum-cache'), 'help': 'sync files to be installed from server to local disk'},
+        'synccopy':         {'mode': 'client', 'options': ('in', 'out', 'run', 'cred', 'write-config-vars', 'checksum-cache'), 'help': 'sync files to be installed from server to  local disk and copy files to target paths'},
         'uninstall':        {'mode': 'client', 'options': ('in', 'out', 'run', 'write-config-vars'), 'help': 'uninstall previously copied files, considering dependencies'},
     })
 
@@ -297,6 +298,15 @@ def prepare_args_parser(in_command):
                                     dest='__NO_NUMBERS_PROGRESS__',
                                     help="display progress but without specific numbers")
 
+    if 'checksum-cache' in command_details['options']:
+        checksum_cache_options = command_parser.add_argument_group(description='checksum cache')
+        checksum_cache_options.add_argument('--no-checksum-cache', '--no_checksum_cache',
+                                    required=False,
+                                    default=False,
+                                    action='store_true',
+                                    dest='__NO_CHECKSUM_CACHE__',
+                                    help="do not use cached checksums, always read and checksum the files (repair mode)")
+
     if 'limit' in command_details['options']:
         limit_options = command_parser.add_argument_group(description='limit command to specific folder')
         limit_options.add_argument('--limit',
@@ -121,15 +121,19 @@ parallel-max = {max_parallel_downloads}
     def use_internal_parallel(self):
         return config_vars["PARALLEL_DOWNLOAD_METHOD"].str() == "internal" and self.is_internal_parallel_supported()
 
-    def add_download_url(self, url, path, verbatim=False, size=0, download_last=False):
+    def use_native_download(self):
+        """ native means downloading in process with ParallelDownload, instead of running curl """
+        return config_vars.get("PARALLEL_DOWNLOAD_METHOD", "").str() == "native"
+
+    def add_download_url(self, url, path, verbatim=False, size=0, download_last=False, checksum=None):
         if verbatim:
             translated_url = url
         else:
             translated_url = connectionBase.connection_factory(config_vars).translate_url(url)
         if download_last:
-            self.urls_to_download_last.append((translated_url, path, size))
+            self.urls_to_download_last.append((translated_url, path, size, checksum))
         else:
-            self.urls_to_download.append((translated_url, path, size))
+            self.urls_to_download.append((translated_url, path, size, checksum))
 
     def get_num_urls_to_download(self):
         return len(self.urls_to_download)+len(self.urls_to_download_last)
@@ -221,7 +225,7 @@ parallel-max = {max_parallel_downloads}
         # No sorting for curl's parallel as the progress looks better when there are mixed sizes
         sorted_by_size = self.urls_to_download if self.use_internal_parallel() else sorted(self.urls_to_download, key=functools.cmp_to_key(url_sorter))
 
-        for url, path, size in sorted_by_size:
+        for url, path, size, checksum in sorted_by_size:
             fixed_path = self.fix_path(path)
             file_details = next(cfig_file_cycler)
             file_details.wfd.write(f'''url = "{url}"\noutput = "{fixed_path}"\n\n''')
@@ -234,7 +238,7 @@ parallel-max = {max_parallel_downloads}
 
         if last_file:
             # write urls for files that should be downloaded last
-            for url, path, size in self.urls_to_download_last:
+            for url, path, size, checksum in self.urls_to_download_last:
                 fixed_path = self.fix_path(path)
                 last_file.wfd.write(f'''url = "{url}"\noutput = "{fixed_path}"\n\n''')
                 last_file.num_urls += 1
@@ -264,6 +268,9 @@ parallel-max = {max_parallel_downloads}
         curl_config_folder = main_outfile.parent.joinpath(main_outfile.name+"_curl")
         MakeDir(curl_config_folder, chowner=True, own_progress_count=0, report_own_progress=False)()
 
+        if self.use_native_download():
+            return self.create_native_download_instructions(dl_commands, curl_config_folder)
+
         num_config_files = int(config_vars["PARALLEL_SYNC"])
         # TODO: Move class someplace else
         config_file_list = self.create_config_files(curl_config_folder, num_config_files)
@@ -316,6 +323,33 @@ parallel-max = {max_parallel_downloads}
 
             return dl_commands
 
+    def create_native_download_instructions(self, dl_commands, download_lists_folder):
+        """ Download in process with ParallelDownload. Instead of curl config files, lists of urls, paths and checksums
+            are written, one for all files and one for the files that should be downloaded last.
+        """
+        if self.get_num_urls_to_download() <= 0:
+            return dl_commands
+
+        max_parallel_downloads = int(config_vars.get("PARALLEL_SYNC", "50"))
+        cookie = config_vars.get("COOKIE_FOR_SYNC_URLS", "").str()
+        total_files_to_download = int(config_vars["__NUM_FILES_TO_DOWNLOAD__"])
+        dl_commands += Progress(f"Downloading with up to {max_parallel_downloads} connections in parallel")
+        # smaller files are downloaded first so the progress gets moving early
+        sorted_by_size = sorted(self.urls_to_download, key=lambda url_details: url_details[2])
+        for list_name, urls_to_download in (("all", sorted_by_size), ("last", self.urls_to_download_last)):
+            if urls_to_download:
+                download_list_file = download_lists_folder.joinpath(config_vars.resolve_str(f"$(CURL_CONFIG_FILE_NAME)-native-{list_name}.csv"))
+                ParallelDownload.write_download_list(download_list_file, ((url, path, checksum, size) for url, path, size, checksum in urls_to_download))
+                dl_commands += ParallelDownload(download_list_file, cookie=cookie if cookie else None,
+                                                max_parallel_downloads=max_parallel_downloads,
+                                                own_progress_count=len(urls_to_download))
+
+        if total_files_to_download > 1:
+            dl_commands += Progress(f"Downloading {total_files_to_download} files done")
+        else:
+            dl_commands += Progress("Downloading 1 file done")
+        return dl_commands
+
     def create_parallel_run_config_file(self, parallel_run_config_file_path, config_files):
         with utils.utf8_open_for_write(parallel_run_config_file_path, "w") as wfd:
             for config_file in config_files:
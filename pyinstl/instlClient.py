@@ -82,15 +82,16 @@ class InstlClient(InstlInstanceBase):
         active_oses: List[str] = list(config_vars["TARGET_OS_NAMES"])
         self.items_table.activate_specific_oses(*active_oses)
 
-        self.items_table.resolve_inheritance()
-
         # is not longer active, will probably skip this phase
         if self.should_check_for_binary_versions():
+            self.items_table.resolve_inheritance()
             self.progress("check versions of installed binaries")
             self.get_version_of_installed_binaries()
             self.items_table.add_require_version_from_binaries()
             self.items_table.add_require_guid_from_binaries()
-        self.items_table.create_default_items(iids_to_ignore=self.auxiliary_iids)
+            self.items_table.create_default_items(iids_to_ignore=self.auxiliary_iids)
+        else:
+            self.items_table.resolve_index_items(with_default_items=True, iids_to_ignore=self.auxiliary_iids)
         #resolve abs path for two external tools which central holds and do not exits in the system (for instance curl for win)
         self.resolve_defined_paths()
         self.batch_accum.set_current_section('pre') #section, all commads will be inserted to section 'pre', used for switching commands order
@@ -27,7 +27,7 @@ class InstlDoIt(InstlInstanceBase):
         self.resolve_defined_paths()
         self.batch_accum.set_current_section('begin')
         # after reading variable COPY_TOOL from yaml, we might need to re-init the copy tool.
-        self.items_table.resolve_inheritance()
+        self.items_table.resolve_index_items()
         self.calculate_full_doit_order()
         #self.platform_helper.num_items_for_progress_report = int(config_vars["LAST_PROGRESS"])
 
@@ -3,6 +3,7 @@
 import os
 import sys
 import re
+import io
 import abc
 from pathlib import Path
 import appdirs
@@ -74,6 +75,97 @@ class IndexYamlReaderBase(DBManager, ConfigVarYamlReader):
         del args
         self.items_table.read_require_node(a_node, **kwargs)
 
+    # start of a yaml document, '---' at the beginning of a line always starts a new document
+    yaml_doc_start_re = re.compile(r"""^---(?=\s|$)[ \t]*(?P<tag>![^\s#]+)?""", re.MULTILINE)
+
+    def index_doc_tags(self):
+        retVal = {"!index"}
+        if "TARGET_OS" in config_vars:
+            retVal.add(config_vars.resolve_str("!index_$(TARGET_OS)"))
+        return retVal
+
+    # keys that make reading a yaml file depend on state outside the file
+    conditional_or_include_re = re.compile(r"""__if\w*__\s*\(|__include(_if_exist)?__""")
+    index_db_cache_max_files = 8  # most recently used cache files are kept in INDEX_DB_CACHE_DIR
+
+    def index_db_cache_key(self, index_text, index_doc_tags):
+        """ index db cache is valid for the same index documents text, index document tags, active oses and instl version.
+            Templates and config vars used by depends are checked separately, see IndexItemsTable.load_index_db_cache
+        """
+        text_checksum = utils.get_buffer_checksum(index_text.encode('utf-8'))
+        doc_tags = ",".join(sorted(index_doc_tags))
+        active_oses = ",".join(os_name for os_name, os_is_active in self.items_table.get_active_oses() if os_is_active)
+        instl_version = ".".join(config_vars["__INSTL_VERSION__"].list())
+        retVal = f"{text_checksum}-{doc_tags}-{active_oses}-{instl_version}"
+        return retVal
+
+    def get_index_db_cache_dir(self):
+        """ return path to index db cache folder or None if the cache should not be used """
+        retVal = None
+        if "INDEX_DB_CACHE_DIR" in config_vars and not bool(config_vars.get("DEBUG_INDEX_DB", False)):
+            index_db_cache_dir = config_vars["INDEX_DB_CACHE_DIR"].str()
+            if config_vars.is_str_resolved(index_db_cache_dir):
+                retVal = utils.ExpandAndResolvePath(index_db_cache_dir)
+        return retVal
+
+    def remove_old_index_db_cache_files(self, index_db_cache_dir):
+        cache_files = sorted(index_db_cache_dir.glob("*.sqlite"), key=lambda f: f.stat().st_mtime, reverse=True)
+        for old_cache_file in cache_files[self.index_db_cache_max_files:]:
+            utils.safe_remove_file(old_cache_file)
+
+    def read_yaml_text(self, yaml_text, *args, **kwargs):
+        if yaml_text.strip():
+            the_stream = io.StringIO(yaml_text)
+            the_stream.name = kwargs['path-to-file']
+            ConfigVarYamlReader.read_yaml_from_stream(self, the_stream, *args, **kwargs)
+
+    def read_yaml_from_stream(self, the_stream, *args, **kwargs):
+        """ index documents are the bulk of reading index.yaml, if the same text was read before
+            index rows are copied from the index db cache and only the other documents are parsed.
+            Files with conditionals are resolved according to current config_vars so they are not cached,
+            neither are files with !require documents, which change index rows, files that include other files,
+            or files whose index documents are not one after the other.
+            Documents before the index documents are read first, since they might define templates used by the index documents.
+        """
+        index_db_cache_dir = self.get_index_db_cache_dir()
+        if index_db_cache_dir is None:
+            ConfigVarYamlReader.read_yaml_from_stream(self, the_stream, *args, **kwargs)
+            return
+
+        yaml_text = the_stream.getvalue()
+        doc_starts = list(self.yaml_doc_start_re.finditer(yaml_text))
+        doc_tags = [doc_start['tag'] for doc_start in doc_starts]
+        index_doc_tags = self.index_doc_tags()
+        is_index_doc = [doc_tag in index_doc_tags for doc_tag in doc_tags]
+        if not any(is_index_doc) or "!require" in doc_tags or self.conditional_or_include_re.search(yaml_text):
+            ConfigVarYamlReader.read_yaml_from_stream(self, the_stream, *args, **kwargs)
+            return
+        first_index_doc = is_index_doc.index(True)
+        last_index_doc = len(is_index_doc) - 1 - is_index_doc[::-1].index(True)
+        if not all(is_index_doc[first_index_doc:last_index_doc+1]):
+            ConfigVarYamlReader.read_yaml_from_stream(self, the_stream, *args, **kwargs)
+            return
+
+        index_start = doc_starts[first_index_doc].start()
+        index_end = doc_starts[last_index_doc+1].start() if last_index_doc+1 < len(doc_starts) else len(yaml_text)
+
+        self.read_yaml_text(yaml_text[:index_start], *args, **kwargs)
+        cache_key = self.index_db_cache_key(yaml_text[index_start:index_end], index_doc_tags)
+        index_db_cache_path = index_db_cache_dir.joinpath(f"{utils.get_buffer_checksum(cache_key.encode('utf-8'))}.sqlite")
+        if self.items_table.load_index_db_cache(index_db_cache_path, cache_key, progress_callback=kwargs.get('progress_callback', None)):
+            self.progress(f"read index from cache {index_db_cache_path}")
+        else:
+            from_ids = self.items_table.get_max_ids()
+            iids_with_defines_before = set(self.items_table.defines_for_iids)
+            self.items_table.config_var_dependencies.clear()
+            self.read_yaml_text(yaml_text[index_start:index_end], *args, **kwargs)
+            new_defines_for_iids = {iid: define_node for iid, define_node in self.items_table.defines_for_iids.items()
+                                    if iid not in iids_with_defines_before}
+            self.items_table.save_index_db_cache(index_db_cache_path, cache_key, from_ids, new_defines_for_iids,
+                                                 self.items_table.config_var_dependencies)
+            self.remove_old_index_db_cache_files(index_db_cache_dir)
+        self.read_yaml_text(yaml_text[index_end:], *args, **kwargs)
+
 
 # noinspection PyPep8Naming
 class InstlInstanceBase(IndexYamlReaderBase, metaclass=abc.ABCMeta):
@@ -112,6 +204,7 @@ class InstlInstanceBase(IndexYamlReaderBase, metaclass=abc.ABCMeta):
         self.dl_tool = CUrlHelper()
 
         self.out_file_realpath = None
+        self.batch_accum_to_run = None  # set by write_batch_file when run_batch_file should run the batch commands in process
         self.internal_progress = 0  # progress of preparing installer NOT of the installation
         self.num_digits_repo_rev_hierarchy=None
         self.num_digits_per_folder_repo_rev_hierarchy=None
@@ -334,6 +427,8 @@ class InstlInstanceBase(IndexYamlReaderBase, metaclass=abc.ABCMeta):
         in_batch_accum += PythonDoSomething('''RsyncClone.add_global_ignore_patterns(config_vars.get("COPY_IGNORE_PATTERNS", []).list())''')
         in_batch_accum += PythonDoSomething('''RsyncClone.add_global_no_hard_link_patterns(config_vars.get("NO_HARD_LINK_PATTERNS", []).list())''')
         in_batch_accum += PythonDoSomething('''RsyncClone.add_global_no_flags_patterns(config_vars.get("NO_FLAGS_PATTERNS", []).list())''')
+        in_batch_accum += PythonDoSomething('''RsyncClone.set_global_copy_workers(config_vars.get("COPY_TREE_WORKERS", 1).int())''')
+        in_batch_accum += PythonDoSomething('''utils.RecursivePermissions.set_default_max_workers(config_vars.get("CHANGE_PERMISSIONS_WORKERS", 1).int())''')
 
         if not self.update_mode:
             in_batch_accum += PythonDoSomething('''RsyncClone.add_global_avoid_copy_markers(config_vars.get("AVOID_COPY_MARKERS", []).list())''')
@@ -414,8 +509,6 @@ class InstlInstanceBase(IndexYamlReaderBase, metaclass=abc.ABCMeta):
 
         exit_on_errors = self.the_command != 'uninstall'  # in case of uninstall, go on with batch file even if some operations failed
 
-        final_repr = repr(in_batch_accum)
-
         out_file: Path = config_vars.get("__MAIN_OUT_FILE__", None).Path()
         if out_file:
             out_file = out_file.parent.joinpath(out_file.name+file_name_post_fix)
@@ -425,16 +518,25 @@ class InstlInstanceBase(IndexYamlReaderBase, metaclass=abc.ABCMeta):
         else:
             self.out_file_realpath = "stdout"
 
-        with utils.write_to_file_or_stdout(out_file) as fd:
-            fd.write(final_repr)
-            fd.write('\n')
+        self.batch_accum_to_run = None
+        if bool(config_vars.get("__RUN_BATCH__", False)) and bool(config_vars.get("RUN_BATCH_IN_PROCESS", False)) and self.out_file_realpath.endswith(".py"):
+            self.batch_accum_to_run = in_batch_accum  # run_batch_file will write the batch file while running the batch commands
+        else:
+            # batch file text is written as it is created, instead of creating the whole text in memory
+            with utils.write_to_file_or_stdout(out_file) as fd:
+                for repr_text in in_batch_accum.iter_repr():
+                    fd.write(repr_text)
+                fd.write('\n')
 
         msg = " ".join(
             (self.out_file_realpath, str(in_batch_accum.total_progress_count()), "progress items"))
         log.info(msg)
 
     def run_batch_file(self):
-        if self.out_file_realpath.endswith(".py"):
+        if self.batch_accum_to_run is not None:
+            batch_accum_to_run, self.batch_accum_to_run = self.batch_accum_to_run, None
+            batch_accum_to_run.run_in_process(self.out_file_realpath)
+        elif self.out_file_realpath.endswith(".py"):
             with utils.utf8_open_for_read(self.out_file_realpath, 'r') as rfd:
                 py_text = rfd.read()
                 py_compiled = compile(py_text, os.fspath(self.out_file_realpath), mode='exec', flags=0, dont_inherit=False, optimize=2)
@@ -18,6 +18,7 @@ class InstlInstanceSync(object, metaclass=abc.ABCMeta):
         self.instlObj = instlObj  # instance of the instl application
         self.local_sync_dir = None  # will be resolved from $(LOCAL_REPO_SYNC_DIR)
         self.files_to_download = 0
+        self.sync_folder_snapshot = None
 
     def init_sync_vars(self):
         """ Prepares variables for sync. Will raise ValueError if a mandatory variable
@@ -26,6 +27,15 @@ class InstlInstanceSync(object, metaclass=abc.ABCMeta):
         prerequisite_vars = list(config_vars["__SYNC_PREREQUISITE_VARIABLES__"])
         self.instlObj.check_prerequisite_var_existence(prerequisite_vars)
 
+    def get_sync_folder_snapshot(self):
+        """ scan $(LOCAL_REPO_SYNC_DIR) once, the snapshot is shared by all code that checks the sync folder
+            while sync instructions are created - before anything is downloaded or removed
+        """
+        if self.sync_folder_snapshot is None and "LOCAL_REPO_SYNC_DIR" in config_vars:
+            self.sync_folder_snapshot = utils.FolderSnapshot(config_vars["LOCAL_REPO_SYNC_DIR"].Path()).scan()
+            self.instlObj.progress(f"scanned sync folder, {len(self.sync_folder_snapshot)} files and folders")
+        return self.sync_folder_snapshot
+
     # Overridden by InstlInstanceSync_url, or parallel sync classes
     def create_sync_instructions(self):
         return 0
@@ -66,7 +76,18 @@ class InstlInstanceSync(object, metaclass=abc.ABCMeta):
                                                 expected_checksum=info_map_file_expected_checksum)
 
                 self.instlObj.progress(f"read info_map {info_map_file_url}")
-                self.instlObj.info_map_table.read_from_file(local_copy_of_info_map_out, progress_callback=self.instlObj.progress)
+                if "INFO_MAP_SNAPSHOT_PATH" in config_vars:
+                    # unchanged info_map is loaded from snapshot of previous run instead of being parsed again
+                    if info_map_file_expected_checksum is None:
+                        info_map_file_expected_checksum = utils.get_file_checksum(local_copy_of_info_map_out)
+                    instl_version = ".".join(config_vars["__INSTL_VERSION__"].list())
+                    snapshot_key = f"{info_map_file_expected_checksum.lower()}-{instl_version}"
+                    self.instlObj.info_map_table.read_from_file_with_snapshot(local_copy_of_info_map_out,
+                                                                            snapshot_file=config_vars["INFO_MAP_SNAPSHOT_PATH"].Path(),
+                                                                            snapshot_key=snapshot_key,
+                                                                            progress_callback=self.instlObj.progress)
+                else:
+                    self.instlObj.info_map_table.read_from_file(local_copy_of_info_map_out, progress_callback=self.instlObj.progress)
 
                 additional_info_maps = self.instlObj.items_table.get_details_for_active_iids("info_map", unique_values=True)
                 for additional_info_map in additional_info_maps:
@@ -120,7 +141,9 @@ class InstlInstanceSync(object, metaclass=abc.ABCMeta):
         self.instlObj.progress("create list of files to download")
         self.instlObj.set_sync_locations_for_active_items()
         self.instlObj.progress("check checksum of existing required files ...")
-        self.instlObj.info_map_table.mark_need_download(progress_callback=self.instlObj.progress)
+        with utils.checksum_cache_for_config_vars(config_vars) as checksum_cache:
+            checksum_cache.folder_snapshot = self.get_sync_folder_snapshot()
+            self.instlObj.info_map_table.mark_need_download(checksum_cache=checksum_cache, progress_callback=self.instlObj.progress)
         need_download_file_path = os.fspath(config_vars["TO_SYNC_INFO_MAP_PATH"])
         need_download_items_list = self.instlObj.info_map_table.get_download_items()
         self.instlObj.info_map_table.write_to_file(in_file=need_download_file_path, items_list=need_download_items_list, progress_callback=self.instlObj.progress)
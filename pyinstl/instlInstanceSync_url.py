@@ -3,7 +3,7 @@
 from collections import defaultdict
 import urllib
 import sys
-from pathlib import PurePath
+import stat
 if sys.platform == 'win32':
     import win32api
 
@@ -61,7 +61,7 @@ class InstlInstanceSync_url(InstlInstanceSync):
         self.get_cookie_for_sync_urls(self.sync_base_url)
         for file_item in in_file_list:
             source_url = self.instlObj.info_map_table.get_sync_url_for_file_item(file_item)
-            self.instlObj.dl_tool.add_download_url(source_url, file_item.download_path, verbatim=source_url==['url'], size=file_item.size, download_last=source_url.endswith('Info.xml'))
+            self.instlObj.dl_tool.add_download_url(source_url, file_item.download_path, verbatim=source_url==['url'], size=file_item.size, download_last=source_url.endswith('Info.xml'), checksum=file_item.checksum)
         self.instlObj.progress(f"created download urls for {len(in_file_list)} files")
 
     def create_curl_download_instructions(self):
@@ -88,35 +88,31 @@ class InstlInstanceSync_url(InstlInstanceSync):
 
     def create_instructions_to_remove_redundant_files_in_sync_folder(self):
         """ Remove files in the sync folder that are not in info_map
-            sync folder is scanned and list of files is created - the list has both the full path to file and partial path
-            as it appears in the info_map db. The list is processed against the db which returns the indexes of the redundant
-            files. The full path versions of the indexed files is used to create remove instructions
+            list of files in the sync folder is taken from the sync folder snapshot - the list has the partial paths
+            as they appear in the info_map db. The list is processed against the db which returns the redundant
+            files. RemoveEmptyFolders is then created only for the folders that the snapshot shows will become empty.
         """
-        pure_local_sync_dir = PurePath(self.local_sync_dir)
+        sync_folder_snapshot = self.get_sync_folder_snapshot()
+        self.instlObj.progress(f"check for redundant files in sync folder {self.local_sync_dir}")
         files_to_check = list()
-        for scan_folder_top_item in os.scandir(path=self.local_sync_dir):
-            if scan_folder_top_item.name in ("bookkeeping", ".DS_Store"):
+        for partial_path, item_stat in sync_folder_snapshot.entries.items():
+            if stat.S_ISDIR(item_stat.st_mode):
                 continue
-            if scan_folder_top_item.is_dir():
-                self.instlObj.progress(f"check for redundant files in sync folder {scan_folder_top_item.path}")
-                for root, dirs, files in os.walk(scan_folder_top_item.path, followlinks=False):
-                    try: dirs.remove("bookkeeping")
-                    except Exception: pass # todo: use FOLDER_EXCLUDE_REGEX
-                    try: files.remove(".DS_Store")
-                    except Exception: pass  # todo: use FILE_EXCLUDE_REGEX
-                    for disk_item in files:
-                        item_full_path = PurePath(root, disk_item)
-                        item_partial_path = item_full_path.relative_to(pure_local_sync_dir).as_posix()
-                        files_to_check.append(item_partial_path)
+            path_parts = partial_path.split("/")
+            if len(path_parts) == 1:  # only files inside the top folders are checked
+                continue
+            if "bookkeeping" in path_parts[:-1] or path_parts[-1] == ".DS_Store":
+                continue  # todo: use FOLDER_EXCLUDE_REGEX, FILE_EXCLUDE_REGEX
+            files_to_check.append(partial_path)
         files_to_check.sort()
         redundant_files = self.instlObj.info_map_table.get_files_that_should_be_removed_from_sync_folder(files_to_check, progress_callback=self.instlObj.progress)
         rm_commands = AnonymousAccum()
         for f in redundant_files:
-            item_full_path = pure_local_sync_dir.joinpath(f)
-            #log.info(f"remove redundant {item_full_path}")
             rm_commands += RmFile(f)
         if redundant_files:
-            rm_commands += RemoveEmptyFolders(self.local_sync_dir)
+            files_to_ignore = config_vars.get("REMOVE_EMPTY_FOLDERS_IGNORE_FILES", []).list()
+            for emptied_folder in sync_folder_snapshot.top_folders_emptied_by_removing(redundant_files, files_to_ignore):
+                rm_commands += RemoveEmptyFolders(emptied_folder or self.local_sync_dir)
         return rm_commands
 
     def create_download_instructions(self):
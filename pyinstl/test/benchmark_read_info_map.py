@@ -0,0 +1,72 @@
+#!/usr/bin/env python3.12
+
+"""
+    benchmark SVNTable.read_from_text against the line by line SVNTable.read_from_text_by_row
+    on a synthetic info_map. Run from the repository root:
+        python -m pyinstl.test.benchmark_read_info_map [num_lines]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+from pathlib import Path
+
+from db.dbMaster import DBMaster
+from svnTree.svnTable import SVNTable
+
+defaults_folder = Path(__file__).resolve().parent.parent.parent.joinpath("defaults")
+
+
+def write_synthetic_info_map(file_path, num_lines):
+    """ write an info_map with a mix of folders, files, wtar parts, symlinks and dl_path lines """
+    random.seed(17)
+    with open(file_path, "w") as wfd:
+        num_written = 0
+        folder_num = 0
+        while num_written < num_lines:
+            folder = f"Mac/Plugins/Plugin{folder_num}.bundle/Contents"
+            for sub_folder in ("", "/Frameworks", "/Resources"):
+                wfd.write(f"{folder}{sub_folder}, dv, {random.randint(1, 500)}\n")
+            num_written += 3
+            for file_num in range(min(100, max(0, num_lines - num_written))):
+                checksum = f"{random.getrandbits(160):040x}"
+                kind = file_num % 10
+                if kind == 0:
+                    wfd.write(f"{folder}/Resources{file_num}.wtar.aa, fv, 12, {checksum}, {random.randint(1, 1 << 20)}\n")
+                elif kind == 1:
+                    wfd.write(f"{folder}/Frameworks/Current{file_num}.symlink, fs, 12, {checksum}, 12\n")
+                elif kind == 2:
+                    wfd.write(f"{folder}/file{file_num}.dll, f, 12, {checksum}, 100, dl_path:'Win/file{file_num}.dll'\n")
+                else:
+                    wfd.write(f"{folder}/Resources/file{file_num}.txt, f, 12, {checksum}, {random.randint(1, 1 << 16)}\n")
+                num_written += 1
+            folder_num += 1
+
+
+def time_read(read_func_name, info_map_path):
+    db = DBMaster(":memory:", defaults_folder)
+    db.open()
+    info_map_table = SVNTable(db)
+    info_map_table.drop_indexes()
+    with open(info_map_path, "r") as rfd:
+        time1 = time.perf_counter()
+        getattr(info_map_table, read_func_name)(rfd)
+        time2 = time.perf_counter()
+    num_rows = db.curs.execute("SELECT COUNT(*) FROM svn_item_t").fetchone()[0]
+    db.close()
+    return time2 - time1, num_rows
+
+
+def main(num_lines):
+    with tempfile.TemporaryDirectory() as temp_folder:
+        info_map_path = os.path.join(temp_folder, "info_map.txt")
+        write_synthetic_info_map(info_map_path, num_lines)
+        for read_func_name in ("read_from_text_by_row", "read_from_text"):
+            seconds, num_rows = time_read(read_func_name, info_map_path)
+            print(f"{read_func_name}: {num_rows} rows in {seconds:.3f} seconds")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
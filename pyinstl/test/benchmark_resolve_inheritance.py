@@ -0,0 +1,78 @@
+#!/usr/bin/env python3.12
+
+"""
+    benchmark IndexItemsTable.resolve_inheritance (in memory resolving with one executemany)
+    against running get_resolve_item_query_for_iid for each iid, on a synthetic index.
+    Also verifies that both ways create exactly the same rows.
+    Run from the repository root:
+        python -m pyinstl.test.benchmark_resolve_inheritance [num_iids]
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+from db.dbMaster import DBMaster
+from db.indexItemTable import IndexItemsTable
+
+defaults_folder = Path(__file__).resolve().parent.parent.parent.joinpath("defaults")
+
+
+def create_synthetic_index(items_table, num_iids):
+    """ each iid has a few details on common and os specific, and most iids inherit from one iid that comes before it.
+        inheriting from a single iid makes inheritance a tree, diamond inheritance would create duplicate rows.
+    """
+    random.seed(17)
+    iids = [f"IID_{i:06}" for i in range(num_iids)]
+    items = list()
+    details = list()
+    for i, iid in enumerate(iids):
+        items.append((iid, 1))
+        details.append((iid, iid, 0, "name", f"name of {iid}", 0, None))
+        details.append((iid, iid, 0, "version", f"1.{i}", 0, None))
+        details.append((iid, iid, random.choice((0, 1, 4)), "install_sources", f"Mac/Plugins/{iid}.bundle", 0, "!dir"))
+        details.append((iid, iid, 0, "depends", random.choice(iids), 0, None))
+        if i > 10 and random.random() < 0.7:
+            details.append((iid, iid, 0, "inherit", iids[random.randrange(0, i)], 0, None))
+    with items_table.db.transaction() as curs:
+        curs.executemany("""INSERT INTO index_item_t(iid, from_index) VALUES(?, ?)""", items)
+        curs.executemany("""INSERT INTO index_item_detail_t(original_iid, owner_iid, os_id, detail_name, detail_value, generation, tag)
+                            VALUES(?,?,?,?,?,?,?)""", details)
+
+
+def resolve_with_sql_script(items_table):
+    """ the way resolve_inheritance used to work: one INSERT ... SELECT per iid """
+    inherit_order, inherit_dict = items_table.prepare_inherit_order()
+    resolve_items_script = "".join(items_table.get_resolve_item_query_for_iid(iid, inherit_dict[iid]) for iid in inherit_order)
+    with items_table.db.transaction() as curs:
+        curs.executescript(resolve_items_script)
+        curs.execute("""CREATE INDEX IF NOT EXISTS ix_svn_index_item_detail_t_owner_iid ON index_item_detail_t(owner_iid)""")
+
+
+def time_resolve(resolve_func, num_iids):
+    db = DBMaster(":memory:", defaults_folder)
+    db.open()
+    items_table = IndexItemsTable(db)
+    items_table.activate_specific_oses("Mac")
+    create_synthetic_index(items_table, num_iids)
+    time1 = time.perf_counter()
+    resolve_func(items_table)
+    time2 = time.perf_counter()
+    rows = db.curs.execute("""SELECT original_iid, owner_iid, os_id, detail_name, detail_value, generation, tag, os_is_active
+                              FROM index_item_detail_t
+                              WHERE generation > 0""").fetchall()
+    db.close()
+    return time2 - time1, sorted(tuple(row) for row in rows)
+
+
+def main(num_iids):
+    sql_seconds, sql_rows = time_resolve(resolve_with_sql_script, num_iids)
+    print(f"SQL script: {len(sql_rows)} inherited rows in {sql_seconds:.3f} seconds")
+    mem_seconds, mem_rows = time_resolve(IndexItemsTable.resolve_inheritance, num_iids)
+    print(f"in memory:  {len(mem_rows)} inherited rows in {mem_seconds:.3f} seconds")
+    print("identical rows" if sql_rows == mem_rows else "rows are different!")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
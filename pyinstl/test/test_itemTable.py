@@ -3,14 +3,22 @@
 
 import sys
 import os
+import io
+import sqlite3
 import unittest
 import time
+import tempfile
+import yaml
 from pathlib import Path
+from unittest import mock
 from pybatch.info_mapBatchCommands import IndexYamlReader
 
 sys.path.append(os.path.realpath(os.path.join(__file__, os.pardir, os.pardir)))
 sys.path.append(os.path.realpath(os.path.join(__file__, os.pardir, os.pardir, os.pardir)))
 from db.indexItemTable import IndexItemsTable
+from db.dbMaster import DBMaster
+from aYaml.yamlReader import YamlNodeStack
+from pyinstl import IndexYamlReaderBase
 import aYaml
 import utils
 from configVar import config_vars
@@ -54,6 +62,325 @@ class TestConditionalsInIndex(unittest.TestCase):
         self.assertEqual(num_iids, num_oks, f"{num_iids=} != {num_oks=}")
 
 
+class TestIndexDBCache(unittest.TestCase):
+    index_text = """--- !index
+A:
+    name: AAA
+    inherit: B
+    install_sources: source_A
+    define:
+        A_VAR: a
+B:
+    name: BBB
+    Mac:
+        install_sources: source_B
+"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "index_db_cache.sqlite")
+        self.defaults_folder = Path(__file__).resolve().parent.parent.parent.joinpath("defaults")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def new_items_table(self):
+        db = DBMaster(":memory:", self.defaults_folder)
+        db.open()
+        items_table = IndexItemsTable(db)
+        items_table.activate_specific_oses("Mac")
+        return items_table
+
+    def index_rows(self, items_table):
+        items = [tuple(row) for row in items_table.db.curs.execute("SELECT iid, from_index FROM index_item_t ORDER BY _id")]
+        details = [tuple(row) for row in items_table.db.curs.execute("""SELECT original_iid, owner_iid, os_id, detail_name, detail_value, tag, os_is_active
+                                                                        FROM index_item_detail_t ORDER BY _id""")]
+        return items, details
+
+    def test_save_and_load(self):
+        read_table = self.new_items_table()
+        index_node = yaml.compose(io.StringIO(self.index_text))
+        read_table.read_index_node(index_node, **{'node-stack': YamlNodeStack()})
+        read_table.save_index_db_cache(self.cache_path, "key-1", defines_for_iids=read_table.defines_for_iids)
+
+        wrong_key_table = self.new_items_table()
+        self.assertFalse(wrong_key_table.load_index_db_cache(self.cache_path, "key-2"))
+        self.assertEqual(self.index_rows(wrong_key_table), ([], []))
+
+        cached_table = self.new_items_table()
+        self.assertTrue(cached_table.load_index_db_cache(self.cache_path, "key-1"))
+        self.assertEqual(self.index_rows(read_table), self.index_rows(cached_table))
+        self.assertEqual(list(cached_table.defines_for_iids), ["A"])
+        self.assertEqual(cached_table.defines_for_iids["A"].tag, "!define")
+        self.assertEqual(yaml.serialize(cached_table.defines_for_iids["A"]), yaml.serialize(read_table.defines_for_iids["A"]))
+
+        read_table.resolve_inheritance()
+        cached_table.resolve_inheritance()
+        self.assertEqual(self.index_rows(read_table), self.index_rows(cached_table))
+
+
+    def test_stale_config_vars(self):
+        config_vars["ITEM_TEMPLATE"] = "$(name)_IID:\n    name: $(name)\n"
+        config_vars["DEPENDS_ON"] = "X_IID", "Y_IID"
+        try:
+            read_table = self.new_items_table()
+            index_node = yaml.compose(io.StringIO("--- !index\nA_IID:\n    depends: $(DEPENDS_ON)\nITEM_TEMPLATE<name>:\n    - [B]\n"))
+            read_table.read_index_node(index_node, **{'node-stack': YamlNodeStack()})
+            self.assertEqual(read_table.config_var_dependencies, {('template', 'ITEM_TEMPLATE'): "$(name)_IID:\n    name: $(name)\n",
+                                                                  ('depends', '$(DEPENDS_ON)'): '["X_IID", "Y_IID"]'})
+            read_table.save_index_db_cache(self.cache_path, "key-1", config_var_dependencies=read_table.config_var_dependencies)
+            self.assertTrue(self.new_items_table().load_index_db_cache(self.cache_path, "key-1"))
+
+            config_vars["DEPENDS_ON"] = "X_IID"
+            self.assertFalse(self.new_items_table().load_index_db_cache(self.cache_path, "key-1"))
+            config_vars["DEPENDS_ON"] = "X_IID", "Y_IID"
+            config_vars["ITEM_TEMPLATE"] = "$(name)_IID:\n    name: new $(name)\n"
+            self.assertFalse(self.new_items_table().load_index_db_cache(self.cache_path, "key-1"))
+            del config_vars["ITEM_TEMPLATE"]
+            self.assertFalse(self.new_items_table().load_index_db_cache(self.cache_path, "key-1"))
+        finally:
+            for var_name in ("ITEM_TEMPLATE", "DEPENDS_ON"):
+                if var_name in config_vars:
+                    del config_vars[var_name]
+
+    def test_broken_cache_file(self):
+        for broken_contents in (b"", b"not a database", b"SQLite format 3\x00" + b"\x00" * 80):
+            Path(self.cache_path).write_bytes(broken_contents)
+            broken_table = self.new_items_table()
+            self.assertFalse(broken_table.load_index_db_cache(self.cache_path, "key-1"))
+            self.assertEqual(self.index_rows(broken_table), ([], []))
+
+        read_table = self.new_items_table()
+        index_node = yaml.compose(io.StringIO(self.index_text))
+        read_table.read_index_node(index_node, **{'node-stack': YamlNodeStack()})
+        read_table.save_index_db_cache(self.cache_path, "key-1", defines_for_iids=read_table.defines_for_iids)
+        with sqlite3.connect(self.cache_path) as cache_db:
+            cache_db.execute("""UPDATE defines_for_iids_t SET define_text = ?""", ("A: [unclosed",))
+        cache_db.close()
+        broken_table = self.new_items_table()
+        self.assertFalse(broken_table.load_index_db_cache(self.cache_path, "key-1"))
+        self.assertEqual(self.index_rows(broken_table), ([], []))
+        self.assertEqual(broken_table.defines_for_iids, {})
+
+
+class IndexYamlReaderWithOwnTable(IndexYamlReaderBase):
+    """ read index.yaml into a new in-memory db instead of the shared one """
+    items_table = None
+
+    def __init__(self, items_table):
+        super().__init__(config_vars)
+        self.items_table = items_table
+
+
+class TestIndexYamlReaderCache(unittest.TestCase):
+    """ reading index.yaml through IndexYamlReaderBase with INDEX_DB_CACHE_DIR defined """
+    index_text = """--- !define
+LOCAL_TEMPLATE: "$(name)_IID:\\n    name: local $(name)\\n"
+--- !index
+A_IID:
+    name: A
+    depends: $(DEPENDS_ON)
+OUTER_TEMPLATE<name>:
+    - [B]
+LOCAL_TEMPLATE<name>:
+    - [C]
+"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_path = Path(self.temp_dir.name, "index.yaml")
+        self.index_path.write_text(self.index_text)
+        self.cache_dir = Path(self.temp_dir.name, "index_db_cache")
+        config_vars["__INSTL_DEFAULTS_FOLDER__"] = Path(__file__).resolve().parent.parent.parent.joinpath("defaults")
+        config_vars["INDEX_DB_CACHE_DIR"] = os.fspath(self.cache_dir)
+        config_vars["OUTER_TEMPLATE"] = "$(name)_IID:\n    name: outer $(name)\n"
+        config_vars["DEPENDS_ON"] = "X_IID", "Y_IID"
+        config_vars.setdefault("__INSTL_VERSION__", ("2", "5", "0"))
+
+    def tearDown(self):
+        for var_name in ("INDEX_DB_CACHE_DIR", "OUTER_TEMPLATE", "DEPENDS_ON", "LOCAL_TEMPLATE"):
+            if var_name in config_vars:
+                del config_vars[var_name]
+        self.temp_dir.cleanup()
+
+    def read_index(self):
+        """ read index.yaml into a new db, return the names and depends of all items """
+        db = DBMaster(":memory:", config_vars["__INSTL_DEFAULTS_FOLDER__"].Path())
+        db.open()
+        reader = IndexYamlReaderWithOwnTable(IndexItemsTable(db))
+        reader.items_table.activate_all_oses()
+        reader.read_yaml_file(self.index_path)
+        return sorted(tuple(row) for row in reader.items_table.db.curs.execute(
+            """SELECT owner_iid, detail_name, detail_value FROM index_item_detail_t WHERE detail_name IN ('name', 'depends')"""))
+
+    def test_cache(self):
+        parsed_rows = self.read_index()
+        self.assertEqual(parsed_rows, [("A_IID", "depends", "X_IID"), ("A_IID", "depends", "Y_IID"), ("A_IID", "name", "A"),
+                                       ("B_IID", "name", "outer B"), ("C_IID", "name", "local C")])
+        self.assertEqual(len(list(self.cache_dir.glob("*.sqlite"))), 1)
+        with mock.patch.object(IndexItemsTable, "read_index_node", side_effect=AssertionError("index should be read from cache")):
+            self.assertEqual(self.read_index(), parsed_rows)
+
+        config_vars["OUTER_TEMPLATE"] = "$(name)_IID:\n    name: changed $(name)\n"
+        self.assertIn(("B_IID", "name", "changed B"), self.read_index())
+        config_vars["DEPENDS_ON"] = "Z_IID"
+        self.assertIn(("A_IID", "depends", "Z_IID"), self.read_index())
+        config_vars["TARGET_OS"] = "Mac"  # !index_Mac documents are index documents now, so the key changes
+        try:
+            self.read_index()
+        finally:
+            del config_vars["TARGET_OS"]
+        self.assertEqual(len(list(self.cache_dir.glob("*.sqlite"))), 2)
+
+    def resolve_index(self, require_version):
+        """ read index.yaml into a new db, add a require_version like require.yaml would, resolve and return all rows """
+        db = DBMaster(":memory:", config_vars["__INSTL_DEFAULTS_FOLDER__"].Path())
+        db.open()
+        reader = IndexYamlReaderWithOwnTable(IndexItemsTable(db))
+        reader.items_table.activate_all_oses()
+        reader.read_yaml_file(self.index_path)
+        with reader.items_table.db.transaction() as curs:
+            curs.execute("""INSERT INTO index_item_detail_t (original_iid, owner_iid, os_id, detail_name, detail_value, generation)
+                            VALUES ("A_IID", "A_IID", 0, "require_version", ?, 0)""", (require_version,))
+        reader.items_table.resolve_index_items(with_default_items=True, iids_to_ignore=["C_IID"])
+        items = [tuple(row) for row in db.curs.execute("SELECT * FROM index_item_t ORDER BY _id")]
+        details = [tuple(row) for row in db.curs.execute("SELECT * FROM index_item_detail_t ORDER BY _id")]
+        return items, details
+
+    def test_resolved_cache(self):
+        self.index_path.write_text("--- !index\nA_IID:\n    version: 1\n    guid: a-guid\nB_IID:\n    inherit: A_IID\nC_IID:\n    inherit: B_IID\n")
+        resolved_rows = self.resolve_index("1")
+        self.assertIn(("C_IID", "require_version", "1", 2), [(row[2], row[4], row[5], row[6]) for row in resolved_rows[1]])
+        self.assertIn("__REPAIR_INSTALLED_ITEMS__", [row[1] for row in resolved_rows[0]])
+
+        with mock.patch.object(IndexItemsTable, "resolve_inheritance", side_effect=AssertionError("resolved rows should be read from cache")), \
+             mock.patch.object(IndexItemsTable, "create_default_items", side_effect=AssertionError("default items should be read from cache")):
+            self.assertEqual(self.resolve_index("1"), resolved_rows)
+
+        # a different require_version must be resolved again
+        resolved_rows_2 = self.resolve_index("2")
+        self.assertIn(("C_IID", "require_version", "2", 2), [(row[2], row[4], row[5], row[6]) for row in resolved_rows_2[1]])
+        self.assertIn("__UPDATE_INSTALLED_ITEMS__", [row[1] for row in resolved_rows_2[0]])
+        del config_vars["INDEX_DB_CACHE_DIR"]  # compare with reading and resolving without cache
+        self.assertEqual(self.resolve_index("2"), resolved_rows_2)
+
+    def test_not_cached(self):
+        for not_cacheable_text in ("--- !index\nA_IID:\n    __ifdef__(SOMETHING):\n        name: A\n",
+                                   "--- !define\n__include__: other.yaml\n--- !index\nA_IID:\n    name: A\n",
+                                   "--- !index\nA_IID:\n    name: A\n--- !define\nX: x\n--- !index\nB_IID:\n    name: B\n"):
+            self.index_path.write_text(not_cacheable_text)
+            with mock.patch.object(IndexItemsTable, "load_index_db_cache", side_effect=AssertionError("index should not be cached")):
+                try:
+                    self.read_index()
+                except AssertionError:
+                    raise
+                except Exception:  # other.yaml does not exist
+                    pass
+        self.assertFalse(self.cache_dir.exists())
+
+
+class TestResolveInheritance(unittest.TestCase):
+    """ compare get_inherited_details with the SQL script of get_resolve_item_query_for_iid """
+    # D_IID inherits A_IID through both B_IID and C_IID (diamond), E_IID -> D_IID -> B_IID -> A_IID is multi level,
+    # F_IID inherits A_IID directly and through E_IID, so A_IID's details reach it in different generations
+    index_text = """--- !index
+A_IID:
+    name: AAA
+    install_sources: source_A
+    Mac:
+        install_folders: mac_folder_A
+    Win:
+        install_folders: win_folder_A
+    actions:
+        pre_copy: a action
+B_IID:
+    name: BBB
+    inherit: A_IID
+    install_sources: source_B
+C_IID:
+    inherit: A_IID
+    Mac:
+        actions:
+            post_copy: c mac action
+D_IID:
+    inherit: [B_IID, C_IID]
+E_IID:
+    inherit: D_IID
+    install_folders: folder_E
+F_IID:
+    inherit: [E_IID, A_IID]
+G_IID:
+    install_sources: source_G
+"""
+
+    def setUp(self):
+        self.defaults_folder = Path(__file__).resolve().parent.parent.parent.joinpath("defaults")
+        self.tables = list()
+
+    def tearDown(self):
+        for items_table in self.tables:
+            items_table.db.close()
+
+    def new_items_table(self):
+        db = DBMaster(":memory:", self.defaults_folder)
+        db.open()
+        items_table = IndexItemsTable(db)
+        items_table.activate_specific_oses("Mac")
+        index_node = yaml.compose(io.StringIO(self.index_text))
+        items_table.read_index_node(index_node, **{'node-stack': YamlNodeStack()})
+        self.tables.append(items_table)
+        return items_table
+
+    def inherited_rows(self, items_table):
+        # rows are compared sorted since the order the SQL script inserts rows depends on sqlite's query plan
+        return sorted(tuple(row) for row in items_table.db.curs.execute("""
+                        SELECT original_iid, owner_iid, os_id, detail_name, detail_value, generation, tag, os_is_active
+                        FROM index_item_detail_t WHERE generation > 0"""))
+
+    def resolve_with_sql_script(self):
+        items_table = self.new_items_table()
+        inherit_order, inherit_dict = items_table.prepare_inherit_order()
+        with items_table.db.transaction() as curs:
+            for iid in inherit_order:
+                curs.executescript(items_table.get_resolve_item_query_for_iid(iid, inherit_dict[iid]))
+        return self.inherited_rows(items_table)
+
+    def test_inherit_order(self):
+        inherit_order, inherit_dict = self.new_items_table().prepare_inherit_order()
+        self.assertEqual(set(inherit_order), {"B_IID", "C_IID", "D_IID", "E_IID", "F_IID"})
+        for before, after in (("B_IID", "D_IID"), ("C_IID", "D_IID"), ("D_IID", "E_IID"), ("E_IID", "F_IID")):
+            self.assertLess(inherit_order.index(before), inherit_order.index(after))
+
+    def test_get_inherited_details_same_as_sql_script(self):
+        items_table = self.new_items_table()
+        inherited_details = items_table.get_inherited_details(*items_table.prepare_inherit_order())
+        self.assertEqual(sorted(inherited_details), self.resolve_with_sql_script())
+
+    def test_resolve_inheritance_same_as_sql_script(self):
+        items_table = self.new_items_table()
+        items_table.resolve_inheritance()
+        inherited_rows = self.inherited_rows(items_table)
+        self.assertEqual(inherited_rows, self.resolve_with_sql_script())
+
+        def details_of(owner_iid, detail_name):
+            return sorted((row[0], row[4], row[5]) for row in inherited_rows if row[1] == owner_iid and row[3] == detail_name)
+        # name and inherit are not inherited
+        self.assertEqual(details_of("B_IID", "name") + details_of("C_IID", "inherit"), [])
+        # diamond: A_IID's details reach D_IID through B_IID and C_IID but are inherited once
+        self.assertEqual(details_of("D_IID", "pre_copy"), [("A_IID", "a action", 2)])
+        self.assertEqual(details_of("D_IID", "install_folders"), [("A_IID", "mac_folder_A", 2)])
+        self.assertEqual(details_of("D_IID", "post_copy"), [("C_IID", "c mac action", 1)])
+        # multi level
+        self.assertEqual(details_of("E_IID", "pre_copy"), [("A_IID", "a action", 3)])
+        self.assertEqual(details_of("E_IID", "install_sources"), [("A_IID", "Mac/source_A", 3), ("B_IID", "Mac/source_B", 2)])
+        # A_IID's details reach F_IID in two different generations
+        self.assertEqual(details_of("F_IID", "pre_copy"), [("A_IID", "a action", 1), ("A_IID", "a action", 4)])
+        self.assertEqual(details_of("F_IID", "install_folders"), [("A_IID", "mac_folder_A", 1), ("A_IID", "mac_folder_A", 4),
+                                                                  ("E_IID", "folder_E", 1)])
+        # Win is not active
+        self.assertFalse([row for row in inherited_rows if row[4] == "win_folder_A"])
+
+
 class TestReadWrite(unittest.TestCase):
     @timing
     def setUp(self):
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3.12
+
+
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from db.dbMaster import DBMaster
+from svnTree.svnTable import SVNTable
+
+defaults_folder = Path(__file__).resolve().parent.parent.parent.joinpath("defaults")
+
+info_map_text = """# a comment
+instl, dv, 17
+instl/index.yaml, f, 17, 0123456789abcdef0123456789abcdef01234567, 1234
+Mac/Plugins/NX.bundle/Contents/Resources.wtar.aa, fv, 12, 1123456789abcdef0123456789abcdef01234567, 10240
+Mac/Plugins/NX.bundle/Contents/Resources.wtar.ab, fv, 12, 2123456789abcdef0123456789abcdef01234567, 512
+Mac/Plugins/NX.bundle/Contents/Info.plist.wtar, f, 12, 3123456789abcdef0123456789abcdef01234567, 77
+Mac/Shells/Frameworks/a.framework/Versions/Current.symlink, fs, 3, 4123456789abcdef0123456789abcdef01234567, 1
+Mac/Shells/some.wtarnot, f, 4, 5123456789abcdef0123456789abcdef01234567, 2
+Win/Plugins/x.dll, f, 5, 6123456789abcdef0123456789abcdef01234567, 3, dl_path:'Win/Plugins/other/x.dll'
+Win/Plugins/y.dll, f, 6, 7123456789abcdef0123456789abcdef01234567, 4, https://example.com/y.dll
+Win/Plugins/z.dll, f, 7, 8123456789abcdef0123456789abcdef01234567, 5, https://example.com/z.dll, dl_path:'Win/z.dll'
+"Win/Plugins/comma, in name.dll", f, 8, 9123456789abcdef0123456789abcdef01234567, 6
+
+top_level_file, f, 9
+"""
+
+
+class TestSVNTable(unittest.TestCase):
+    def read_info_map_rows(self, read_func_name):
+        db = DBMaster(":memory:", defaults_folder)
+        db.open()
+        info_map_table = SVNTable(db)
+        rfd = io.StringIO(info_map_text)
+        rfd.name = "info_map.txt"
+        getattr(info_map_table, read_func_name)(rfd)
+        retVal = [tuple(row) for row in db.curs.execute("SELECT * FROM svn_item_t ORDER BY _id").fetchall()]
+        db.close()
+        return retVal
+
+    def test_read_from_text_same_as_by_row(self):
+        rows_by_row = self.read_info_map_rows("read_from_text_by_row")
+        rows_in_blocks = self.read_info_map_rows("read_from_text")
+        self.assertEqual(len(rows_by_row), 12)
+        self.assertEqual(rows_by_row, rows_in_blocks)
+
+    def test_read_from_text_small_blocks(self):
+        rows_by_row = self.read_info_map_rows("read_from_text_by_row")
+        saved_block_size = SVNTable.info_map_read_block_size
+        SVNTable.info_map_read_block_size = 3
+        try:
+            rows_in_blocks = self.read_info_map_rows("read_from_text")
+        finally:
+            SVNTable.info_map_read_block_size = saved_block_size
+        self.assertEqual(rows_by_row, rows_in_blocks)
+
+
+# a tree where sibling folders share a prefix with a/b: 'a/b-c' and 'a/b.c' sort before 'a/b/',
+# 'a/b0' sorts right after the last possible descendant of 'a/b'
+tree_info_map_text = """a, dv, 1
+a/b, dv, 1
+a/b/c, dv, 1
+a/b/c/deep.txt, f, 1, 0000000000000000000000000000000000000001, 1
+a/b/file.txt, f, 1, 0000000000000000000000000000000000000002, 1
+a/b/x.wtar.aa, f, 1, 0000000000000000000000000000000000000003, 1
+a/b/x.wtar.ab, f, 1, 0000000000000000000000000000000000000004, 1
+a/b/single.wtar, f, 1, 0000000000000000000000000000000000000005, 1
+a/b/c/link.symlink, fs, 1, 0000000000000000000000000000000000000006, 1
+a/b-c, dv, 1
+a/b-c/file-c.txt, f, 1, 0000000000000000000000000000000000000007, 1
+a/b-c/link-c.symlink, fs, 1, 0000000000000000000000000000000000000008, 1
+a/b.c, dv, 1
+a/b.c/file.c.txt, f, 1, 0000000000000000000000000000000000000009, 1
+a/b.txt, f, 1, 0000000000000000000000000000000000000010, 1
+a/b0, dv, 1
+a/b0/file0.txt, f, 1, 0000000000000000000000000000000000000011, 1
+a/b0/y.wtar.aa, f, 1, 0000000000000000000000000000000000000012, 1
+a/b0/y.wtar.ab, f, 1, 0000000000000000000000000000000000000013, 1
+a/b0/link0.symlink, fs, 1, 0000000000000000000000000000000000000014, 1
+z, dv, 1
+z/z.txt, f, 1, 0000000000000000000000000000000000000015, 1
+"""
+
+tree_dir_paths = ("a", "a/b", "a/b/c", "a/b-c", "a/b.c", "a/b0", "z", "a/b/x", "a/b0/y", "a/b/single", "no/such/dir")
+
+# the recursive queries that were replaced by path range queries, kept here as the reference semantics
+recursive_children_of_unwtarred_q = """
+    WITH RECURSIVE get_children(__ID) AS
+    (
+        SELECT first_item_t._id
+        FROM svn_item_t AS first_item_t
+        WHERE first_item_t.unwtarred == :dir_path
+
+        UNION
+
+        SELECT child_item_t._id
+        FROM svn_item_t child_item_t, get_children
+        WHERE child_item_t.parent_id = get_children.__ID
+    )
+    SELECT _id FROM svn_item_t
+    WHERE _id IN (SELECT __ID FROM get_children)
+    {another_filter}
+    ORDER BY _id
+    """
+
+recursive_children_of_parent_id_q = """
+    WITH RECURSIVE get_children(__ID) AS
+    (
+        SELECT first_item_t._id
+        FROM svn_item_t AS first_item_t
+        WHERE first_item_t.parent_id=:parent_id
+
+        UNION
+
+        SELECT child_item_t._id
+        FROM svn_item_t child_item_t, get_children
+        WHERE child_item_t.parent_id = get_children.__ID
+    )
+    SELECT _id FROM svn_item_t
+    WHERE _id IN get_children
+    {another_filter}
+    ORDER BY _id
+    """
+
+recursive_mark_required_completion_q = """
+    WITH RECURSIVE get_parents(__ID, __PATH, __PARENT_ID) AS
+    (
+        SELECT file_item_t._id, file_item_t.path, file_item_t.parent_id
+        FROM svn_item_t AS file_item_t
+        WHERE file_item_t.fileFlag=1
+        AND file_item_t.required=1
+
+        UNION
+
+        SELECT parent_item_t._id, parent_item_t.path, parent_item_t.parent_id
+        FROM svn_item_t parent_item_t, get_parents
+        WHERE parent_item_t._id = get_parents.__PARENT_ID
+    )
+    UPDATE svn_item_t
+    SET required=1
+    WHERE _id IN (SELECT __ID FROM get_parents);
+    """
+
+recursive_mark_need_download_parents_q = """
+    WITH RECURSIVE get_parents(__PARENT_ID) AS
+    (
+        SELECT file_item_t.parent_id
+        FROM svn_item_t AS file_item_t
+        WHERE file_item_t.fileFlag=1
+        AND file_item_t.need_download=1
+
+        UNION
+
+        SELECT parent_item_t.parent_id
+        FROM svn_item_t parent_item_t, get_parents
+        WHERE parent_item_t._id = get_parents.__PARENT_ID
+    )
+    UPDATE svn_item_t
+    SET need_download=1
+    WHERE _id IN (SELECT __PARENT_ID FROM get_parents)
+    """
+
+recursive_mark_required_files_for_active_items_q = """
+    UPDATE svn_item_t
+    SET required=1
+    WHERE svn_item_t._id IN
+    (
+        SELECT svn_item_t._id
+        FROM svn_item_t
+        JOIN index_item_t as active_items_t
+            ON active_items_t.install_status > 0
+            AND active_items_t.ignore = 0
+        JOIN index_item_detail_t as install_sources_t
+            ON install_sources_t.owner_iid=active_items_t.iid
+            AND install_sources_t.detail_name='install_sources'
+            AND install_sources_t.os_is_active = 1
+        WHERE svn_item_t.unwtarred == install_sources_t.detail_value
+    );
+
+    WITH RECURSIVE get_children(__ID) AS
+    (
+        SELECT first_item_t._id
+        FROM svn_item_t AS first_item_t
+        WHERE required==1 AND fileFlag==0
+
+        UNION
+
+        SELECT child_item_t._id
+        FROM svn_item_t child_item_t, get_children
+        WHERE child_item_t.parent_id = get_children.__ID
+    )
+    UPDATE svn_item_t
+    SET required=1
+    WHERE _id IN (SELECT __ID FROM get_children);
+
+    WITH RECURSIVE get_parents(__ID) AS
+    (
+        SELECT file_item_t.parent_id
+        FROM svn_item_t AS file_item_t
+        WHERE file_item_t.fileFlag=1
+        AND file_item_t.required=1
+
+        UNION
+
+        SELECT parent_item_t.parent_id
+        FROM svn_item_t parent_item_t, get_parents
+        WHERE parent_item_t._id = get_parents.__ID
+    )
+    UPDATE svn_item_t
+    SET required=1
+    WHERE _id IN (SELECT __ID FROM get_parents);
+    """
+
+
+class ChecksumsNeedDownload(object):
+    """ stands in for utils.ChecksumCache, files need download if their checksum is in checksums """
+    def __init__(self, checksums):
+        self.checksums = checksums
+
+    def need_to_download_file(self, file_path, file_checksum):
+        return file_checksum in self.checksums
+
+
+class TestSVNTablePathRanges(unittest.TestCase):
+    """ compare the path range queries with the recursive parent_id queries they replaced """
+    def setUp(self):
+        self.db = DBMaster(":memory:", defaults_folder)
+        self.db.open()
+        self.info_map_table = SVNTable(self.db)
+        rfd = io.StringIO(tree_info_map_text)
+        rfd.name = "info_map.txt"
+        with self.info_map_table.reading_files_context():
+            self.info_map_table.read_from_text(rfd)
+
+    def tearDown(self):
+        self.db.close()
+
+    def select_ids(self, query_text, query_params=None):
+        return [row[0] for row in self.db.curs.execute(query_text, query_params or {}).fetchall()]
+
+    def paths_where(self, where_clause):
+        return self.select_ids(f"""SELECT path FROM svn_item_t WHERE {where_clause} ORDER BY _id""")
+
+    def flags_of_all_items(self, flag_name):
+        return self.db.curs.execute(f"""SELECT path, {flag_name} FROM svn_item_t ORDER BY _id""").fetchall()
+
+    def clear_flags(self, *flag_names):
+        set_clause = ", ".join(f"{flag_name}=0" for flag_name in flag_names)
+        self.db.curs.execute(f"""UPDATE svn_item_t SET {set_clause}""")
+
+    def test_parent_ids(self):
+        # the reference queries depend on parent_id, make sure it was set
+        self.assertEqual(self.select_ids("""SELECT COUNT(*) FROM svn_item_t WHERE parent_id IS NULL"""), [2])
+
+    def test_unwtarred_queries(self):
+        for dir_path in tree_dir_paths:
+            with self.subTest(dir_path=dir_path):
+                for what, file_or_dir_clause in (("file", "AND fileFlag=1"), ("dir", "AND fileFlag=0"), ("any", "")):
+                    expected = self.select_ids(recursive_children_of_unwtarred_q.format(another_filter=file_or_dir_clause), {"dir_path": dir_path})
+                    got = [row[0] for row in self.info_map_table.get_recursive_paths_in_dir(dir_path, what)]
+                    self.assertEqual(got, expected, what)
+
+                expected = self.select_ids(recursive_children_of_unwtarred_q.format(another_filter="AND fileFlag=1"), {"dir_path": dir_path})
+                got = [item._id for item in self.info_map_table.get_file_items_of_dir(dir_path)]
+                self.assertEqual(got, expected)
+
+                expected = len(self.select_ids(recursive_children_of_unwtarred_q.format(another_filter="AND wtarFlag=1"), {"dir_path": dir_path}))
+                self.assertEqual(self.info_map_table.count_wtar_items_of_dir(dir_path), expected)
+
+                self.clear_flags("ignore")
+                self.info_map_table.ignore_file_paths_of_dir(dir_path)
+                got = self.paths_where("ignore==1")
+                self.clear_flags("ignore")
+                self.db.curs.execute(f"""UPDATE svn_item_t SET ignore=1 WHERE _id IN ({recursive_children_of_unwtarred_q.format(another_filter="AND fileFlag==1")})""", {"dir_path": dir_path})
+                expected = self.paths_where("ignore==1")
+                self.assertEqual(got, expected)
+
+        self.assertEqual(self.info_map_table.count_wtar_items_of_dir("a/b"), 3)
+        self.assertEqual(self.info_map_table.count_wtar_items_of_dir("a/b/x"), 2)
+        self.assertEqual([row[1] for row in self.info_map_table.get_recursive_paths_in_dir("a/b", "dir")], ["a/b", "a/b/c"])
+
+    def test_child_items(self):
+        for dir_path in tree_dir_paths:
+            with self.subTest(dir_path=dir_path):
+                dir_item = self.info_map_table.get_dir_item(dir_path)
+                parent_id = dir_item._id if dir_item is not None else -1
+                expected = self.select_ids(recursive_children_of_parent_id_q.format(another_filter=""), {"parent_id": parent_id})
+                got = sorted(item._id for item in self.info_map_table.get_items_in_dir(dir_path))
+                self.assertEqual(got, expected)
+
+                expected = len(self.select_ids(recursive_children_of_parent_id_q.format(another_filter="AND symlinkFlag==1"), {"parent_id": parent_id}))
+                self.assertEqual(self.info_map_table.count_symlinks_in_dir(dir_path), expected)
+
+        self.assertEqual(self.info_map_table.count_symlinks_in_dir("a/b"), 1)
+        self.assertEqual(self.info_map_table.count_symlinks_in_dir("a"), 3)
+
+    def test_mark_required_completion(self):
+        required_files = ("a/b/c/deep.txt", "a/b0/y.wtar.ab", "a/b-c/file-c.txt")
+        self.db.curs.executemany("""UPDATE svn_item_t SET required=1 WHERE path==?""", ((path,) for path in required_files))
+        self.info_map_table.mark_required_completion()
+        got = self.flags_of_all_items("required")
+
+        self.clear_flags("required")
+        self.db.curs.executemany("""UPDATE svn_item_t SET required=1 WHERE path==?""", ((path,) for path in required_files))
+        self.db.curs.execute(recursive_mark_required_completion_q)
+        expected = self.flags_of_all_items("required")
+
+        self.assertEqual(got, expected)
+        self.assertEqual(self.paths_where("required==1 AND fileFlag==0"), ["a", "a/b", "a/b/c", "a/b-c", "a/b0"])
+
+    def test_mark_need_download(self):
+        checksum_cache = ChecksumsNeedDownload({"0000000000000000000000000000000000000001",  # a/b/c/deep.txt
+                                                "0000000000000000000000000000000000000003",  # a/b/x.wtar.aa
+                                                "0000000000000000000000000000000000000009",  # a/b.c/file.c.txt, not required
+                                                "0000000000000000000000000000000000000011"})  # a/b0/file0.txt
+        self.db.curs.execute("""UPDATE svn_item_t SET required=1 WHERE path != 'a/b.c/file.c.txt'""")
+        self.info_map_table.mark_need_download(checksum_cache=checksum_cache)
+        got = self.flags_of_all_items("need_download")
+
+        self.clear_flags("need_download")
+        self.db.curs.execute("""UPDATE svn_item_t SET need_download=1
+                                WHERE required == 1 AND ignore == 0 AND fileFlag == 1
+                                AND need_to_download_file(download_path, checksum)""")
+        self.db.curs.execute(recursive_mark_need_download_parents_q)
+        expected = self.flags_of_all_items("need_download")
+
+        self.assertEqual(got, expected)
+        self.assertEqual(self.paths_where("need_download==1"),
+                         ["a", "a/b", "a/b/c", "a/b/c/deep.txt", "a/b/x.wtar.aa", "a/b0", "a/b0/file0.txt"])
+
+    def test_mark_required_files_for_active_items(self):
+        self.db.curs.executemany("""INSERT INTO index_item_t(iid, install_status, ignore) VALUES(?, ?, ?)""",
+                                 (("BEE_IID", 1, 0), ("WTAR_IID", 1, 0), ("FILE_IID", 1, 0),
+                                  ("NOT_INSTALLED_IID", 0, 0), ("IGNORED_IID", 1, 1)))
+        self.db.curs.executemany("""INSERT INTO index_item_detail_t(original_iid, owner_iid, os_id, detail_name, detail_value, os_is_active)
+                                    VALUES(?, ?, 0, 'install_sources', ?, 1)""",
+                                 (("BEE_IID", "BEE_IID", "a/b"), ("WTAR_IID", "WTAR_IID", "a/b0/y"),
+                                  ("FILE_IID", "FILE_IID", "a/b.txt"),
+                                  ("NOT_INSTALLED_IID", "NOT_INSTALLED_IID", "a/b-c"),
+                                  ("IGNORED_IID", "IGNORED_IID", "a/b.c")))
+        self.info_map_table.mark_required_files_for_active_items()
+        got = self.flags_of_all_items("required")
+
+        self.clear_flags("required")
+        self.db.curs.executescript(recursive_mark_required_files_for_active_items_q)
+        expected = self.flags_of_all_items("required")
+
+        self.assertEqual(got, expected)
+        self.assertEqual(self.paths_where("required==1"),
+                         ["a", "a/b", "a/b/c", "a/b/c/deep.txt", "a/b/file.txt", "a/b/x.wtar.aa", "a/b/x.wtar.ab",
+                          "a/b/single.wtar", "a/b/c/link.symlink", "a/b.txt", "a/b0", "a/b0/y.wtar.aa", "a/b0/y.wtar.ab"])
+
+
+class TestInfoMapSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.info_map_path = os.path.join(self.temp_dir.name, "info_map.txt")
+        with open(self.info_map_path, "w") as wfd:
+            wfd.write(info_map_text)
+        self.snapshot_path = os.path.join(self.temp_dir.name, "info_map_snapshot.sqlite")
+        self.tables = list()
+
+    def tearDown(self):
+        for info_map_table in self.tables:
+            info_map_table.db.close()
+        self.temp_dir.cleanup()
+
+    def new_info_map_table(self):
+        db = DBMaster(":memory:", defaults_folder)
+        db.open()
+        info_map_table = SVNTable(db)
+        self.tables.append(info_map_table)
+        return info_map_table
+
+    def info_map_rows(self, info_map_table):
+        columns = ", ".join(SVNTable.info_map_snapshot_columns)
+        return [tuple(row) for row in info_map_table.db.curs.execute(f"SELECT {columns} FROM svn_item_t ORDER BY _id")]
+
+    def read_with_snapshot(self, snapshot_key):
+        """ read info_map_path with snapshot, return the rows and whether info_map_path was parsed """
+        info_map_table = self.new_info_map_table()
+        with mock.patch.object(info_map_table, "read_from_file", wraps=info_map_table.read_from_file) as read_from_file:
+            info_map_table.read_from_file_with_snapshot(self.info_map_path, self.snapshot_path, snapshot_key)
+        return self.info_map_rows(info_map_table), read_from_file.called
+
+    def test_first_read_writes_snapshot(self):
+        parsed_table = self.new_info_map_table()
+        parsed_table.read_from_file(self.info_map_path)
+        rows, parsed = self.read_with_snapshot("key1")
+        self.assertTrue(parsed)
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(rows, self.info_map_rows(parsed_table))
+        self.assertTrue(os.path.isfile(self.snapshot_path))
+        self.assertFalse(os.path.exists(self.snapshot_path + ".tmp"))
+
+    def test_second_read_loads_snapshot(self):
+        first_rows, first_parsed = self.read_with_snapshot("key1")
+        second_rows, second_parsed = self.read_with_snapshot("key1")
+        self.assertTrue(first_parsed)
+        self.assertFalse(second_parsed)
+        self.assertEqual(second_rows, first_rows)
+
+    def test_snapshot_appended_to_existing_rows(self):
+        self.read_with_snapshot("key1")
+        info_map_table = self.new_info_map_table()
+        info_map_table.db.curs.execute("""INSERT INTO svn_item_t (path, fileFlag) VALUES ('already/there', 1)""")
+        info_map_table.read_from_file_with_snapshot(self.info_map_path, self.snapshot_path, "key1")
+        rows = self.info_map_rows(info_map_table)
+        self.assertEqual(len(rows), 13)
+        self.assertEqual(rows[0][0], "already/there")
+
+    def test_changed_key_parses(self):
+        first_rows, _ = self.read_with_snapshot("key1")
+        second_rows, second_parsed = self.read_with_snapshot("key2")
+        self.assertTrue(second_parsed)
+        self.assertEqual(second_rows, first_rows)
+        # the snapshot was rewritten with the new key
+        _, third_parsed = self.read_with_snapshot("key2")
+        self.assertFalse(third_parsed)
+
+    def test_corrupt_snapshot_parses(self):
+        first_rows, _ = self.read_with_snapshot("key1")
+        with open(self.snapshot_path, "wb") as wfd:
+            wfd.write(b"this is not an sqlite database" * 100)
+        second_rows, second_parsed = self.read_with_snapshot("key1")
+        self.assertTrue(second_parsed)
+        self.assertEqual(second_rows, first_rows)
+
+    def test_snapshot_without_key_parses(self):
+        first_rows, _ = self.read_with_snapshot("key1")
+        os.remove(self.snapshot_path)
+        info_map_table = self.new_info_map_table()
+        info_map_table.db.curs.execute("""ATTACH DATABASE ? AS snapshot_db""", (self.snapshot_path,))
+        info_map_table.db.curs.execute("""CREATE TABLE snapshot_db.snapshot_info_t (snapshot_key TEXT)""")
+        info_map_table.db.curs.execute("""DETACH DATABASE snapshot_db""")
+        second_rows, second_parsed = self.read_with_snapshot("key1")
+        self.assertTrue(second_parsed)
+        self.assertEqual(second_rows, first_rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
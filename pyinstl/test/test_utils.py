@@ -4,8 +4,11 @@
 import sys
 import os
 import unittest
+import tempfile
+from pathlib import Path
 
 from utils import misc_utils
+from utils.checksum_cache import ChecksumCache
 
 
 sys.path.append(os.path.realpath(os.path.join(__file__, os.pardir, os.pardir)))
@@ -42,6 +45,54 @@ class TestUtils(unittest.TestCase):
             result_list.extend(i)
         self.assertEqual(result_list, [1, 'a', None, 2, 'b', None, 3, 'c', None, 4, None, None, 5, None, None])
 
+    def test_get_file_checksum_in_chunks(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir, "a_file.bin")
+            contents = os.urandom(100000)
+            file_path.write_bytes(contents)
+            expected_checksum = misc_utils.get_buffer_checksum(contents)
+            for buffer_size in (1, 4096, 99999, 100000, 1024 * 1024):
+                self.assertEqual(misc_utils.get_file_checksum(file_path, buffer_size=buffer_size), expected_checksum)
+            self.assertTrue(misc_utils.check_file_checksum(file_path, expected_checksum.upper()))
+
+            empty_file_path = Path(temp_dir, "empty_file.bin")
+            empty_file_path.touch()
+            self.assertEqual(misc_utils.get_file_checksum(empty_file_path), misc_utils.get_buffer_checksum(b""))
+
+    def test_ChecksumCache(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = Path(temp_dir, "checksum_cache.sqlite")
+            file_path = Path(temp_dir, "a_file.txt")
+            file_path.write_text("The wind and the rain")
+            expected_checksum = misc_utils.get_file_checksum(file_path)
+
+            with ChecksumCache(cache_path) as cache:
+                self.assertEqual(cache.get_file_checksum(file_path), expected_checksum)
+                self.assertEqual((cache.num_hits, cache.num_misses), (0, 1))
+                self.assertEqual(cache.get_file_checksum(file_path), expected_checksum)
+                self.assertEqual((cache.num_hits, cache.num_misses), (1, 1))
+
+            # cached checksum survives between runs
+            with ChecksumCache(cache_path) as cache:
+                self.assertFalse(cache.need_to_download_file(os.fspath(file_path), expected_checksum))
+                self.assertEqual((cache.num_hits, cache.num_misses), (1, 0))
+
+                # a changed file is checksummed again
+                file_path.write_text("The wind and the rain and the snow")
+                os.utime(file_path, ns=(0, 0))
+                self.assertTrue(cache.need_to_download_file(os.fspath(file_path), expected_checksum))
+                self.assertEqual(cache.num_misses, 1)
+
+            with ChecksumCache(cache_path, max_items=0) as cache:
+                pass
+            with ChecksumCache(cache_path) as cache:
+                self.assertEqual(len(cache.entries), 0)
+
+            # pass-through cache remembers nothing
+            with ChecksumCache(None) as cache:
+                self.assertTrue(cache.check_file_checksum(file_path, misc_utils.get_file_checksum(file_path)))
+            self.assertFalse(cache.check_file_checksum(Path(temp_dir, "no_such_file"), expected_checksum))
+
     """
     def test_gen_col_format(self):
         varoom = utils.gen_col_format([5, 3, 12])
@@ -0,0 +1,45 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 12
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"ForInConfigVar test #1;", prog_num=1):  # 0m:0.016s
+    with Stage(r"doit", prog_num=2):  # 0m:0.016s
+        with ForInConfigVar(r"TOUCH_ME_SINGLE_VALUE", r"TOUCH_ME", r'Touch("@(TOUCH_ME)")', prog_num=3) as for_in_config_var_001_3:  # 0m:0.001s
+            for_in_config_var_001_3()
+        with ForInConfigVar(r"TOUCH_ME_LIST", r"TOUCH_ME", r'Touch("@(TOUCH_ME)")', prog_num=4) as for_in_config_var_002_4:  # 0m:0.002s
+            for_in_config_var_002_4()
+        with ForInConfigVar(r"TOUCH_ME_EMPTY_LIST", r"TOUCH_ME", r'Touch("@(TOUCH_ME)")', prog_num=5) as for_in_config_var_003_5:  # 0m:0.000s
+            for_in_config_var_003_5()
+        with ForInConfigVar(r"TOUCH_ME_NO_LIST", r"TOUCH_ME", r'Touch("@(TOUCH_ME)")', prog_num=6) as for_in_config_var_004_6:  # 0m:0.000s
+            for_in_config_var_004_6()
+        with ForInConfigVar(r"TOUCH_ME_SINGLE_VALUE_ALT", r"TOUCH_ME", r'Touch("!(TOUCH_ME)")', resolve_indicator=r"!", prog_num=7) as for_in_config_var_005_7:  # 0m:0.007s
+            for_in_config_var_005_7()
+        with ForInConfigVar(r"TOUCH_ME_LIST_ALT", r"TOUCH_ME", r'Touch("!(TOUCH_ME)")', resolve_indicator=r"!", prog_num=8) as for_in_config_var_006_8:  # 0m:0.006s
+            for_in_config_var_006_8()
+        with ForInConfigVar(r"TOUCH_ME_EMPTY_LIST_ALT", r"TOUCH_ME", r'Touch("!(TOUCH_ME)")', resolve_indicator=r"!", prog_num=9) as for_in_config_var_007_9:  # 0m:0.000s
+            for_in_config_var_007_9()
+        with ForInConfigVar(r"TOUCH_ME_NO_LIST_ALT", r"TOUCH_ME", r'Touch("!(TOUCH_ME)")', resolve_indicator=r"!", prog_num=10) as for_in_config_var_008_10:  # 0m:0.000s
+            for_in_config_var_008_10()
+
+with Stage(r"epilog", prog_num=11):  # 0m:0.000s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchConditional/ForInConfigVar/1_ForInConfigVar.py", prog_num=12) as patch_py_batch_with_timings_009_12:  # 0m:0.001s
+        patch_py_batch_with_timings_009_12()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.016s
@@ -0,0 +1,33 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 7
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"IfFileExist test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IfFileExist/should_exist", prog_num=3) as touch_001_3:
+            touch_001_3()
+        with If(IsFile(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IfFileExist/should_exist"), if_true=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IfFileExist/touched_if_exist"), if_false=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IfFileExist/should_not_exist"), prog_num=4) as if_002_4:
+            if_002_4()
+        with If(IsFile(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IfFileExist/should_not_exist"), if_true=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IfFileExist/should_not_exist"), if_false=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IfFileExist/touched_if_not_exist"), prog_num=5) as if_003_5:
+            if_003_5()
+
+with Stage(r"epilog", prog_num=6):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IfFileExist/1_IfFileExist.py", prog_num=7) as patch_py_batch_with_timings_004_7:
+        patch_py_batch_with_timings_004_7()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
@@ -0,0 +1,31 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 6
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"If_Eq test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with If(IsEq(1234, 1234), if_true=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/If_Eq/should_exist_if_true"), if_false=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/If_Eq/should_not_exist_if_true"), prog_num=3) as if_001_3:
+            if_001_3()
+        with If(IsEq(r"yoyo", r"ma"), if_true=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/If_Eq/should_not_exist_if_false"), if_false=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/If_Eq/should_exist_if_false"), prog_num=4) as if_002_4:
+            if_002_4()
+
+with Stage(r"epilog", prog_num=5):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchConditional/If_Eq/1_If_Eq.py", prog_num=6) as patch_py_batch_with_timings_003_6:
+        patch_py_batch_with_timings_003_6()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
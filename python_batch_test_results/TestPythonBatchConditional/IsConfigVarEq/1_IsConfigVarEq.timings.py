@@ -0,0 +1,38 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 8
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"IsConfigVarEq test #1;", prog_num=1):  # 0m:0.003s
+    with Stage(r"doit", prog_num=2):  # 0m:0.003s
+        config_vars['BOO'] = r"MOO"
+        with If(IsConfigVarEq(r"BOO", r"MOO"), if_true=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IsConfigVarEq/touched_if_var_eq"), if_false=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IsConfigVarEq/should_not_exist"), prog_num=3) as if_001_3:  # 0m:0.001s
+            if_001_3()
+        with If(IsConfigVarEq(r"BOO", r"YOOOO"), if_true=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IsConfigVarEq/should_not_exist"), if_false=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IsConfigVarEq/touched_if_not_var_eq"), prog_num=4) as if_002_4:  # 0m:0.001s
+            if_002_4()
+        with If(IsConfigVarEq(r"POO", r"MOO", r"MOO"), if_true=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IsConfigVarEq/touched_if_var_eq_w_default"), if_false=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IsConfigVarEq/should_not_exist_w_default"), prog_num=5) as if_003_5:  # 0m:0.000s
+            if_003_5()
+        with If(IsConfigVarEq(r"POO", r"MOO", r"YOOOO"), if_true=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IsConfigVarEq/should_not_exist_w_default"), if_false=Touch(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IsConfigVarEq/touched_if_not_var_eq_w_default"), prog_num=6) as if_004_6:  # 0m:0.001s
+            if_004_6()
+
+with Stage(r"epilog", prog_num=7):  # 0m:0.001s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchConditional/IsConfigVarEq/1_IsConfigVarEq.py", prog_num=8) as patch_py_batch_with_timings_005_8:  # 0m:0.006s
+        patch_py_batch_with_timings_005_8()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.003s
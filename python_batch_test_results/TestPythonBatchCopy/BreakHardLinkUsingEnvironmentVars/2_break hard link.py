@@ -0,0 +1,33 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 6
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"BreakHardLinkUsingEnvironmentVars test #2;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        os.environ["linked_file_path"]="/root/package/python_batch_test_results/TestPythonBatchCopy/BreakHardLinkUsingEnvironmentVars/linked"
+        os.environ["temp_file_path"]="${linked_file_path}.14429"
+        with MoveFileToFile(r"/root/package/python_batch_test_results/TestPythonBatchCopy/BreakHardLinkUsingEnvironmentVars/linked", r"${temp_file_path}", hard_links=False, prog_num=3) as move_file_to_file_001_3:
+            move_file_to_file_001_3()
+        with MoveFileToFile(r"${temp_file_path}", r"/root/package/python_batch_test_results/TestPythonBatchCopy/BreakHardLinkUsingEnvironmentVars/linked", prog_num=4) as move_file_to_file_002_4:
+            move_file_to_file_002_4()
+
+with Stage(r"epilog", prog_num=5):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchCopy/BreakHardLinkUsingEnvironmentVars/2_break hard link.py", prog_num=6) as patch_py_batch_with_timings_003_6:
+        patch_py_batch_with_timings_003_6()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
@@ -0,0 +1,39 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 10
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"CopyDirToDir test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyDirToDir/copy-resource_source_file", prog_num=3) as make_dir_001_3:
+            make_dir_001_3()
+        with Cd(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyDirToDir/copy-resource_source_file", prog_num=4) as cd_002_4:
+            cd_002_4()
+            with Touch(r"hootenanny", prog_num=5) as touch_003_5:
+                touch_003_5()
+            with MakeRandomDirs(num_levels=5, num_dirs_per_level=3, num_files_per_dir=5, file_size=413, prog_num=6) as make_random_dirs_004_6:
+                make_random_dirs_004_6()
+        with CopyDirToDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyDirToDir/copy-resource_source_file", r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyDirToDir/copy-target-no-hard-links", hard_links=False, prog_num=7) as copy_dir_to_dir_005_7:
+            copy_dir_to_dir_005_7()
+        with CopyDirToDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyDirToDir/copy-resource_source_file", r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyDirToDir/copy-target-with-ignore", ignore_patterns=[r"hootenanny"], prog_num=8) as copy_dir_to_dir_006_8:
+            copy_dir_to_dir_006_8()
+
+with Stage(r"epilog", prog_num=9):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyDirToDir/1_target-not-exist.py", prog_num=10) as patch_py_batch_with_timings_007_10:
+        patch_py_batch_with_timings_007_10()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
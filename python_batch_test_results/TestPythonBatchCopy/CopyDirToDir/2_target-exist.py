@@ -0,0 +1,33 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 7
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"CopyDirToDir test #2;", prog_num=1):
+    with Stage(r"prepare", prog_num=2):
+        with CopyDirToDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyDirToDir/copy-resource_source_file", r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyDirToDir/copy-target-no-hard-links", hard_links=False, prog_num=3) as copy_dir_to_dir_001_3:
+            copy_dir_to_dir_001_3()
+        with CopyDirToDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyDirToDir/copy-resource_source_file", r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyDirToDir/copy-target-with-ignore", ignore_patterns=[r"hootenanny"], prog_num=4) as copy_dir_to_dir_002_4:
+            copy_dir_to_dir_002_4()
+    with Stage(r"doit", prog_num=5):
+        pass
+
+with Stage(r"epilog", prog_num=6):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyDirToDir/2_target-exist.py", prog_num=7) as patch_py_batch_with_timings_003_7:
+        patch_py_batch_with_timings_003_7()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
@@ -0,0 +1,37 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 9
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"CopyFileToDir test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToDir/copy-resource_source_file", prog_num=3) as make_dir_001_3:
+            make_dir_001_3()
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToDir/copy-target-no-hard-links", prog_num=4) as make_dir_002_4:
+            make_dir_002_4()
+        with Cd(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToDir/copy-resource_source_file", prog_num=5) as cd_003_5:
+            cd_003_5()
+            with Touch(r"hootenanny", prog_num=6) as touch_004_6:
+                touch_004_6()
+        with CopyFileToDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToDir/copy-resource_source_file/hootenanny", r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToDir/copy-target-no-hard-links", hard_links=False, prog_num=7) as copy_file_to_dir_005_7:
+            copy_file_to_dir_005_7()
+
+with Stage(r"epilog", prog_num=8):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToDir/1_CopyFileToDir.py", prog_num=9) as patch_py_batch_with_timings_006_9:
+        patch_py_batch_with_timings_006_9()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
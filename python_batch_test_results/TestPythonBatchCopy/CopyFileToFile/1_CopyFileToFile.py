@@ -0,0 +1,45 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 13
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"CopyFileToFile test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/copy-resource_source_file", prog_num=3) as make_dir_001_3:
+            make_dir_001_3()
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/target_dir_no_hard_links", prog_num=4) as make_dir_002_4:
+            make_dir_002_4()
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/target_dir_with_hard_links", prog_num=5) as make_dir_003_5:
+            make_dir_003_5()
+        with Cd(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/copy-resource_source_file", prog_num=6) as cd_004_6:
+            cd_004_6()
+            with Touch(r"hootenanny", prog_num=7) as touch_005_7:
+                touch_005_7()
+        with CopyFileToFile(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/copy-resource_source_file/hootenanny", r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/target_dir_no_hard_links/hootenanny", hard_links=False, prog_num=8) as copy_file_to_file_006_8:
+            copy_file_to_file_006_8()
+        with CopyFileToFile(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/copy-resource_source_file/hootenanny", r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/target_dir_with_hard_links/hootenanny", prog_num=9) as copy_file_to_file_007_9:
+            copy_file_to_file_007_9()
+        with CopyFileToFile(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/copy-resource_source_file/hootenanny", r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/target_dir_with_different_name/Scrooge", hard_links=False, prog_num=10) as copy_file_to_file_008_10:
+            copy_file_to_file_008_10()
+        with CopyFileToFile(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/copy-resource_source_file/hootenanny", r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/target_dir_with_different_name/Ebenezer", prog_num=11) as copy_file_to_file_009_11:
+            copy_file_to_file_009_11()
+
+with Stage(r"epilog", prog_num=12):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyFileToFile/1_CopyFileToFile.py", prog_num=13) as patch_py_batch_with_timings_010_13:
+        patch_py_batch_with_timings_010_13()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
@@ -0,0 +1,41 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 11
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"CopyGlobToDir test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with Touch(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyGlobToDir/chimi/chury/a.banana", prog_num=3) as touch_001_3:
+            touch_001_3()
+        with Touch(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyGlobToDir/chimi/chury/b.banana", prog_num=4) as touch_002_4:
+            touch_002_4()
+        with Touch(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyGlobToDir/chimi/chury/c.banana", prog_num=5) as touch_003_5:
+            touch_003_5()
+        with Touch(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyGlobToDir/chimi/d.banana", prog_num=6) as touch_004_6:
+            touch_004_6()
+        with Touch(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyGlobToDir/chimi/chury/cofix/e.banana", prog_num=7) as touch_005_7:
+            touch_005_7()
+        with Touch(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyGlobToDir/chimi/chury/f.banana/g.ananas", prog_num=8) as touch_006_8:
+            touch_006_8()
+        with CopyGlobToDir(r"*/*/*.banana", r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyGlobToDir", r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyGlobToDir/some bananas", prog_num=9) as copy_glob_to_dir_007_9:
+            copy_glob_to_dir_007_9()
+
+with Stage(r"epilog", prog_num=10):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchCopy/CopyGlobToDir/1_CopyGlobToDir.py", prog_num=11) as patch_py_batch_with_timings_008_11:
+        patch_py_batch_with_timings_008_11()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
@@ -0,0 +1,33 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 6
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"MoveFileToFile test #1;", prog_num=1):  # 0m:0.001s
+    with Stage(r"doit", prog_num=2):  # 0m:0.001s
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/MoveFileToFile/source_dir", prog_num=3) as make_dir_001_3:  # 0m:0.000s
+            make_dir_001_3()
+        with Touch(r"/root/package/python_batch_test_results/TestPythonBatchCopy/MoveFileToFile/source_dir/hootenanny", prog_num=4) as touch_002_4:  # 0m:0.001s
+            touch_002_4()
+
+with Stage(r"epilog", prog_num=5):  # 0m:0.000s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchCopy/MoveFileToFile/1_MoveFileToFile.py", prog_num=6) as patch_py_batch_with_timings_003_6:  # 0m:1.395s
+        patch_py_batch_with_timings_003_6()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.001s
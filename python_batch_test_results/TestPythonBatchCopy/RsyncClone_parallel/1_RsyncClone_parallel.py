@@ -0,0 +1,35 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 8
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"RsyncClone_parallel test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchCopy/RsyncClone_parallel/copy-source", prog_num=3) as make_dir_001_3:
+            make_dir_001_3()
+        with Cd(r"/root/package/python_batch_test_results/TestPythonBatchCopy/RsyncClone_parallel/copy-source", prog_num=4) as cd_002_4:
+            cd_002_4()
+            with Touch(r"hootenanny", prog_num=5) as touch_003_5:
+                touch_003_5()
+            with MakeRandomDirs(num_levels=3, num_dirs_per_level=3, num_files_per_dir=7, file_size=413, prog_num=6) as make_random_dirs_004_6:
+                make_random_dirs_004_6()
+
+with Stage(r"epilog", prog_num=7):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchCopy/RsyncClone_parallel/1_RsyncClone_parallel.py", prog_num=8) as patch_py_batch_with_timings_005_8:
+        patch_py_batch_with_timings_005_8()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
@@ -0,0 +1,31 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 5
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"ParallelDownload_in_batch test #1;", prog_num=1):  # 0m:0.014s
+    with Stage(r"doit", prog_num=2):  # 0m:0.014s
+        with ParallelDownload(r"/root/package/python_batch_test_results/TestPythonBatchDownload/ParallelDownload_in_batch/dl-native-all.csv", prog_num=3) as parallel_download_001_3:  # 0m:0.014s
+            parallel_download_001_3()
+
+with Stage(r"epilog", prog_num=4):  # 0m:0.314s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchDownload/ParallelDownload_in_batch/1_ParallelDownload_in_batch.py", prog_num=5) as patch_py_batch_with_timings_002_5:  # 0m:0.000s
+        patch_py_batch_with_timings_002_5()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.014s
@@ -0,0 +1,33 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 7
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"Cd_and_Touch test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Cd_and_Touch/cd-here", prog_num=3, remove_obstacles=False) as make_dir_001_3:
+            make_dir_001_3()
+        with Cd(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Cd_and_Touch/cd-here", prog_num=4) as cd_002_4:
+            cd_002_4()
+            with Touch(r"touch-me", prog_num=5) as touch_003_5:
+                touch_003_5()
+
+with Stage(r"epilog", prog_num=6):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Cd_and_Touch/1_Cd_and_Touch.py", prog_num=7) as patch_py_batch_with_timings_004_7:
+        patch_py_batch_with_timings_004_7()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
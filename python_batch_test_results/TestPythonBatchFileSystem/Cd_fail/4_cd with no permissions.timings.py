@@ -0,0 +1,35 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 7
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"Cd_fail test #4;", prog_num=1):  # 0m:0.001s
+    with Stage(r"doit", prog_num=2):  # 0m:0.001s
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Cd_fail/no-permissions-folder", prog_num=3) as make_dir_001_3:  # 0m:0.000s
+            make_dir_001_3()
+        with Chmod(path=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Cd_fail/no-permissions-folder", mode="a-x", prog_num=4) as chmod_002_4:  # 0m:0.001s
+            chmod_002_4()
+        with Cd(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Cd_fail/no-permissions-folder", prog_num=5) as cd_003_5:  # 0m:0.000s
+            cd_003_5()
+
+with Stage(r"epilog", prog_num=6):  # 0m:0.002s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Cd_fail/4_cd with no permissions.py", prog_num=7) as patch_py_batch_with_timings_004_7:  # 0m:0.001s
+        patch_py_batch_with_timings_004_7()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.001s
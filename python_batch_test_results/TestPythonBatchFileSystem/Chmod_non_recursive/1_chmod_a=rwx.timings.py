@@ -0,0 +1,31 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 5
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"Chmod_non_recursive test #1;", prog_num=1):  # 0m:0.000s
+    with Stage(r"doit", prog_num=2):  # 0m:0.000s
+        with Chmod(path=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Chmod_non_recursive/file-to-chmod", mode="a=rwx", prog_num=3) as chmod_001_3:  # 0m:0.000s
+            chmod_001_3()
+
+with Stage(r"epilog", prog_num=4):  # 0m:0.001s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Chmod_non_recursive/1_chmod_a=rwx.py", prog_num=5) as patch_py_batch_with_timings_002_5:  # 0m:0.000s
+        patch_py_batch_with_timings_002_5()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.000s
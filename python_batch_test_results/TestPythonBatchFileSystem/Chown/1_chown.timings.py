@@ -0,0 +1,35 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 7
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"Chown test #1;", prog_num=1):  # 0m:0.001s
+    with Stage(r"doit", prog_num=2):  # 0m:0.001s
+        with Touch(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Chown/chown-this-file", prog_num=3) as touch_001_3:  # 0m:0.000s
+            touch_001_3()
+        with Chmod(path=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Chown/chown-this-file", mode="a+rw", prog_num=4) as chmod_002_4:  # 0m:0.000s
+            chmod_002_4()
+        with Chown(path=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Chown/chown-this-file", user_id=502, group_id=20, prog_num=5) as chown_003_5:  # 0m:0.000s
+            chown_003_5()
+
+with Stage(r"epilog", prog_num=6):  # 0m:0.001s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Chown/1_chown.py", prog_num=7) as patch_py_batch_with_timings_004_7:  # 0m:0.000s
+        patch_py_batch_with_timings_004_7()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.001s
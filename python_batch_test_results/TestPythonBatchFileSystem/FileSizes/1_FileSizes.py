@@ -0,0 +1,33 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 7
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"FileSizes test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with MakeRandomDataFile(file_path=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/FileSizes/random_data_file_1", file_size=999, prog_num=3) as make_random_data_file_001_3:
+            make_random_data_file_001_3()
+        with MakeRandomDataFile(file_path=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/FileSizes/random_data_file_2", file_size=888, prog_num=4) as make_random_data_file_002_4:
+            make_random_data_file_002_4()
+        with FileSizes(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/FileSizes/folder-to-list", r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/FileSizes/list_file", prog_num=5) as file_sizes_003_5:
+            file_sizes_003_5()
+
+with Stage(r"epilog", prog_num=6):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/FileSizes/1_FileSizes.py", prog_num=7) as patch_py_batch_with_timings_004_7:
+        patch_py_batch_with_timings_004_7()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
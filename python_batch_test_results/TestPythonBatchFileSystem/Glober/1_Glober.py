@@ -0,0 +1,35 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 8
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"Glober test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with Touch(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Glober/file_to_remove_1", prog_num=3) as touch_001_3:
+            touch_001_3()
+        with Touch(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Glober/file_to_remove_2", prog_num=4) as touch_002_4:
+            touch_002_4()
+        with MakeRandomDataFile(file_path=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Glober/file_to_stay_1", file_size=68, prog_num=5) as make_random_data_file_003_5:
+            make_random_data_file_003_5()
+        with MakeRandomDataFile(file_path=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Glober/file_to_stay_2", file_size=32, prog_num=6) as make_random_data_file_004_6:
+            make_random_data_file_004_6()
+
+with Stage(r"epilog", prog_num=7):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Glober/1_Glober.py", prog_num=8) as patch_py_batch_with_timings_005_8:
+        patch_py_batch_with_timings_005_8()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
@@ -0,0 +1,43 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 11
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"Glober test #2;", prog_num=1):  # 0m:0.007s
+    with Stage(r"doit", prog_num=2):  # 0m:0.007s
+        with Glober(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Glober/file_to_stay*", AppendFileToFile, None, r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Glober/united_file", prog_num=3) as glober_001_3:  # 0m:0.005s
+            glober_001_3()
+        with Glober(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Glober/file_to_remove*", RmFile, r"path", prog_num=4) as glober_002_4:  # 0m:0.001s
+            glober_002_4()
+        with Glober(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Glober/no_match*", RmFile, r"path", prog_num=5) as glober_003_5:  # 0m:0.000s
+            glober_003_5()
+        with Glober(r"$(NATIVE_INSTRUMENTS_SERVICE_CENTER_DIR)/Waves-*", Chmod, None, r"a+rw", prog_num=6) as glober_004_6:  # 0m:0.000s
+            glober_004_6()
+        with Glober(r"$(NATIVE_INSTRUMENTS_SERVICE_CENTER_DIR)/Waves-*", Chown, r"path", user_id=-1, group_id=-1, prog_num=7) as glober_005_7:  # 0m:0.000s
+            glober_005_7()
+        with Glober(r"$(WAVESHELL_AAX_DIR)/WaveShell*.aaxplugin", Chown, r"path", user_id=-1, group_id=-1, recursive=True, prog_num=8) as glober_006_8:  # 0m:0.000s
+            glober_006_8()
+        with Glober(r"$(WAVESHELL_AAX_DIR)/WaveShell*.aaxplugin", Chmod, None, r"a+rwX", recursive=True, prog_num=9) as glober_007_9:  # 0m:0.000s
+            glober_007_9()
+
+with Stage(r"epilog", prog_num=10):  # 0m:0.259s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/Glober/2_Glober.py", prog_num=11) as patch_py_batch_with_timings_008_11:  # 0m:0.112s
+        patch_py_batch_with_timings_008_11()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.007s
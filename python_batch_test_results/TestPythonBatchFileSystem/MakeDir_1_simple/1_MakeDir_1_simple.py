@@ -0,0 +1,35 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 8
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"MakeDir_1_simple test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/MakeDir_1_simple/dir_to_make_level_1", prog_num=3, skip_chmod=True) as make_dir_001_3:
+            make_dir_001_3()
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/MakeDir_1_simple/dir_to_make/level_2", prog_num=4, skip_chown=True) as make_dir_002_4:
+            make_dir_002_4()
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/MakeDir_1_simple/dir_to_make_level_1", prog_num=5, remove_obstacles=False) as make_dir_003_5:
+            make_dir_003_5()
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/MakeDir_1_simple/dir_to_make/level_2", prog_num=6, remove_obstacles=False) as make_dir_004_6:
+            make_dir_004_6()
+
+with Stage(r"epilog", prog_num=7):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/MakeDir_1_simple/1_MakeDir_1_simple.py", prog_num=8) as patch_py_batch_with_timings_005_8:
+        patch_py_batch_with_timings_005_8()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
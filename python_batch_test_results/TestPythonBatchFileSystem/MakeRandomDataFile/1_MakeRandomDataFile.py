@@ -0,0 +1,31 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 6
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"MakeRandomDataFile test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with MakeRandomDataFile(file_path=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/MakeRandomDataFile/random_data_file_1", file_size=1799, prog_num=3) as make_random_data_file_001_3:
+            make_random_data_file_001_3()
+        with MakeRandomDataFile(file_path=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/MakeRandomDataFile/random_data_file_zero", file_size=0, prog_num=4) as make_random_data_file_002_4:
+            make_random_data_file_002_4()
+
+with Stage(r"epilog", prog_num=5):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/MakeRandomDataFile/1_MakeRandomDataFile.py", prog_num=6) as patch_py_batch_with_timings_003_6:
+        patch_py_batch_with_timings_003_6()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
@@ -0,0 +1,39 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 9
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"SplitJoinFile test #1;", prog_num=1):  # 0m:0.007s
+    with Stage(r"doit", prog_num=2):  # 0m:0.007s
+        with MakeRandomDataFile(file_path=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/SplitJoinFile/file_to_split", file_size=15, prog_num=3) as make_random_data_file_001_3:  # 0m:0.004s
+            make_random_data_file_001_3()
+        with SplitFile(file_to_split=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/SplitJoinFile/file_to_split", max_size=5, remove_original=False, prog_num=4) as split_file_002_4:  # 0m:0.000s
+            split_file_002_4()
+        with CopyFileToFile(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/SplitJoinFile/file_to_split", r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/SplitJoinFile/file_to_split.before", prog_num=5) as copy_file_to_file_003_5:  # 0m:0.001s
+            copy_file_to_file_003_5()
+        with RmFile(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/SplitJoinFile/file_to_split", prog_num=6) as rm_file_004_6:  # 0m:0.000s
+            rm_file_004_6()
+        with JoinFile(file_to_join=r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/SplitJoinFile/file_to_split.aa", remove_parts=False, prog_num=7) as join_file_005_7:  # 0m:0.001s
+            join_file_005_7()
+
+with Stage(r"epilog", prog_num=8):  # 0m:0.000s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchFileSystem/SplitJoinFile/1_SplitJoinFile.py", prog_num=9) as patch_py_batch_with_timings_006_9:  # 0m:0.000s
+        patch_py_batch_with_timings_006_9()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.007s
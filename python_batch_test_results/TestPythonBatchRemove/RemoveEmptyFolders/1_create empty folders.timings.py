@@ -0,0 +1,37 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 8
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"RemoveEmptyFolders test #1;", prog_num=1):  # 0m:0.006s
+    with Stage(r"doit", prog_num=2):  # 0m:0.006s
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RemoveEmptyFolders/folder-to-remove", prog_num=3) as make_dir_001_3:  # 0m:0.000s
+            make_dir_001_3()
+        with Cd(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RemoveEmptyFolders/folder-to-remove", prog_num=4) as cd_002_4:  # 0m:0.005s
+            cd_002_4()
+            with Touch(r"paramedic", prog_num=5) as touch_003_5:  # 0m:0.000s
+                touch_003_5()
+            with MakeRandomDirs(num_levels=3, num_dirs_per_level=2, num_files_per_dir=0, file_size=41, prog_num=6) as make_random_dirs_004_6:  # 0m:0.005s
+                make_random_dirs_004_6()
+
+with Stage(r"epilog", prog_num=7):  # 0m:0.009s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RemoveEmptyFolders/1_create empty folders.py", prog_num=8) as patch_py_batch_with_timings_005_8:  # 0m:0.004s
+        patch_py_batch_with_timings_005_8()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.006s
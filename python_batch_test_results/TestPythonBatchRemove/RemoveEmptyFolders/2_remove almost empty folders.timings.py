@@ -0,0 +1,33 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 6
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"RemoveEmptyFolders test #2;", prog_num=1):  # 0m:0.011s
+    with Stage(r"doit", prog_num=2):  # 0m:0.011s
+        with RemoveEmptyFolders(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RemoveEmptyFolders/folder-to-remove", files_to_ignore=[r".DS_Store"], prog_num=3) as remove_empty_folders_001_3:  # 0m:0.011s
+            remove_empty_folders_001_3()
+        with RemoveEmptyFolders(r"kajagogo", files_to_ignore=[r".DS_Store"], prog_num=4) as remove_empty_folders_002_4:  # 0m:0.000s
+            remove_empty_folders_002_4()
+
+with Stage(r"epilog", prog_num=5):  # 0m:0.000s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RemoveEmptyFolders/2_remove almost empty folders.py", prog_num=6) as patch_py_batch_with_timings_003_6:  # 0m:0.005s
+        patch_py_batch_with_timings_003_6()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.011s
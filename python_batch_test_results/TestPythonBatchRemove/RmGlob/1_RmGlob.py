@@ -0,0 +1,45 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 13
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"RmGlob test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RmGlob/folder-to-glob", prog_num=3) as make_dir_001_3:
+            make_dir_001_3()
+        with Cd(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RmGlob/folder-to-glob", prog_num=4) as cd_002_4:
+            cd_002_4()
+            with Touch(r"abc.kif", prog_num=5) as touch_003_5:
+                touch_003_5()
+            with Touch(r"cba.kmf", prog_num=6) as touch_004_6:
+                touch_004_6()
+            with Touch(r"acb.kof", prog_num=7) as touch_005_7:
+                touch_005_7()
+            with Touch(r"bac.kaf", prog_num=8) as touch_006_8:
+                touch_006_8()
+            with Touch(r"bca.kuf", prog_num=9) as touch_007_9:
+                touch_007_9()
+            with Touch(r"cab.kef", prog_num=10) as touch_008_10:
+                touch_008_10()
+        with RmGlob(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RmGlob/folder-to-glob", r"?b*.k*", prog_num=11) as rm_glob_009_11:
+            rm_glob_009_11()
+
+with Stage(r"epilog", prog_num=12):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RmGlob/1_RmGlob.py", prog_num=13) as patch_py_batch_with_timings_010_13:
+        patch_py_batch_with_timings_010_13()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
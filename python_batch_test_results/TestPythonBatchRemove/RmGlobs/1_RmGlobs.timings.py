@@ -0,0 +1,55 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 17
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"RmGlobs test #1;", prog_num=1):  # 0m:0.023s
+    with Stage(r"doit", prog_num=2):  # 0m:0.023s
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RmGlobs/folder-to-glob", prog_num=3) as make_dir_001_3:  # 0m:0.001s
+            make_dir_001_3()
+        with Cd(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RmGlobs/folder-to-glob", prog_num=4) as cd_002_4:  # 0m:0.021s
+            cd_002_4()
+            with Touch(r"abc.kif", prog_num=5) as touch_003_5:  # 0m:0.001s
+                touch_003_5()
+            with Touch(r"cba.kmf", prog_num=6) as touch_004_6:  # 0m:0.003s
+                touch_004_6()
+            with Touch(r"hi-mama", prog_num=7) as touch_005_7:  # 0m:0.000s
+                touch_005_7()
+            with Touch(r"mama-hi", prog_num=8) as touch_006_8:  # 0m:0.000s
+                touch_006_8()
+            with Touch(r"mama", prog_num=9) as touch_007_9:  # 0m:0.000s
+                touch_007_9()
+            with Touch(r"acb.kof", prog_num=10) as touch_008_10:  # 0m:0.000s
+                touch_008_10()
+            with Touch(r"bac.kaf", prog_num=11) as touch_009_11:  # 0m:0.000s
+                touch_009_11()
+            with Touch(r"bca.kuf", prog_num=12) as touch_010_12:  # 0m:0.000s
+                touch_010_12()
+            with Touch(r"cab.kef", prog_num=13) as touch_011_13:  # 0m:0.004s
+                touch_011_13()
+            with Touch(r"big-mami", prog_num=14) as touch_012_14:  # 0m:0.000s
+                touch_012_14()
+        with RmGlobs(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RmGlobs/folder-to-glob", r"*mama*", r"?b*.k*", prog_num=15) as rm_globs_013_15:  # 0m:0.001s
+            rm_globs_013_15()
+
+with Stage(r"epilog", prog_num=16):  # 0m:0.001s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchRemove/RmGlobs/1_RmGlobs.py", prog_num=17) as patch_py_batch_with_timings_014_17:  # 0m:0.000s
+        patch_py_batch_with_timings_014_17()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.023s
@@ -0,0 +1,30 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 5
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"ConfigVarPrint test #1;", prog_num=1):  # 0m:0.000s
+    with Stage(r"doit", prog_num=2):  # 0m:0.000s
+        ConfigVarPrint(r"SOME_VAR_TO_PRINT", prog_num=3)()  # 0m:0.005s
+
+with Stage(r"epilog", prog_num=4):  # 0m:0.357s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchReporting/ConfigVarPrint/1_ConfigVarPrint.py", prog_num=5) as patch_py_batch_with_timings_001_5:  # 0m:0.357s
+        patch_py_batch_with_timings_001_5()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.000s
@@ -0,0 +1,28 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 4
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"EnvironVarAssign test #1;", prog_num=1):
+    with Stage(r"doit", prog_num=2):
+        os.environ["hila"]="lulu lin"
+
+with Stage(r"epilog", prog_num=3):
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchReporting/EnvironVarAssign/1_EnvironVarAssign.py", prog_num=4) as patch_py_batch_with_timings_001_4:
+        patch_py_batch_with_timings_001_4()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
@@ -0,0 +1,34 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 6
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"ResolveConfigVarsInFile test #1;", prog_num=1):  # 0m:0.006s
+    with Stage(r"doit", prog_num=2):  # 0m:0.006s
+        config_vars['BANANA'] = r"Rama"
+        with ResolveConfigVarsInFile(r"/root/package/python_batch_test_results/TestPythonBatchReporting/ResolveConfigVarsInFile/unresolved_file", r"/root/package/python_batch_test_results/TestPythonBatchReporting/ResolveConfigVarsInFile/resolve_file_dollar", config_files=[r"/root/package/python_batch_test_results/TestPythonBatchReporting/ResolveConfigVarsInFile/config_file"], prog_num=3) as resolve_config_vars_in_file_001_3:  # 0m:0.001s
+            resolve_config_vars_in_file_001_3()
+        with ResolveConfigVarsInFile(r"/root/package/python_batch_test_results/TestPythonBatchReporting/ResolveConfigVarsInFile/unresolved_file", r"/root/package/python_batch_test_results/TestPythonBatchReporting/ResolveConfigVarsInFile/resolve_file_at", config_files=[r"/root/package/python_batch_test_results/TestPythonBatchReporting/ResolveConfigVarsInFile/config_file"], resolve_indicator=r"@", prog_num=4) as resolve_config_vars_in_file_002_4:  # 0m:0.005s
+            resolve_config_vars_in_file_002_4()
+
+with Stage(r"epilog", prog_num=5):  # 0m:0.000s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchReporting/ResolveConfigVarsInFile/1_ResolveConfigVarsInFile.py", prog_num=6) as patch_py_batch_with_timings_003_6:  # 0m:0.000s
+        patch_py_batch_with_timings_003_6()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.006s
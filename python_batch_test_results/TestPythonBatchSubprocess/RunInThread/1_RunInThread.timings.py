@@ -0,0 +1,39 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 9
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"RunInThread test #1;", prog_num=1):  # 0m:0.034s
+    with Stage(r"doit", prog_num=2):  # 0m:0.033s
+        with Cd(r"/root/package/python_batch_test_results/TestPythonBatchSubprocess/RunInThread", prog_num=3) as cd_001_3:  # 0m:0.033s
+            cd_001_3()
+            with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchSubprocess/RunInThread/folder-to-list", prog_num=4) as make_dir_002_4:  # 0m:0.000s
+                make_dir_002_4()
+            with Cd(r"/root/package/python_batch_test_results/TestPythonBatchSubprocess/RunInThread/folder-to-list", prog_num=5) as cd_003_5:  # 0m:0.029s
+                cd_003_5()
+                with MakeRandomDirs(num_levels=3, num_dirs_per_level=2, num_files_per_dir=8, file_size=41, prog_num=6) as make_random_dirs_004_6:  # 0m:0.029s
+                    make_random_dirs_004_6()
+            with RunInThread(Ls(r"/root/package/python_batch_test_results/TestPythonBatchSubprocess/RunInThread/folder-to-list", out_file=r"/root/package/python_batch_test_results/TestPythonBatchSubprocess/RunInThread/list-output"), prog_num=7) as run_in_thread_005_7:  # 0m:0.004s
+                run_in_thread_005_7()
+
+with Stage(r"epilog", prog_num=8):  # 0m:0.000s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchSubprocess/RunInThread/1_RunInThread.py", prog_num=9) as patch_py_batch_with_timings_006_9:  # 0m:0.000s
+        patch_py_batch_with_timings_006_9()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.033s
@@ -0,0 +1 @@
+while True: print(0)
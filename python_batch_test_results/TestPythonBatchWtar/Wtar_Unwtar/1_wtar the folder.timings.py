@@ -0,0 +1,45 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 12
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"Wtar_Unwtar test #1;", prog_num=1):  # 0m:0.702s
+    with Stage(r"doit", prog_num=2):  # 0m:0.702s
+        with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchWtar/Wtar_Unwtar/folder-to-wtar", prog_num=3) as make_dir_001_3:  # 0m:0.000s
+            make_dir_001_3()
+        with Cd(r"/root/package/python_batch_test_results/TestPythonBatchWtar/Wtar_Unwtar/folder-to-wtar", prog_num=4) as cd_002_4:  # 0m:0.701s
+            cd_002_4()
+            with Touch(r"dohickey", prog_num=5) as touch_003_5:  # 0m:0.000s
+                touch_003_5()
+            with MakeRandomDirs(num_levels=3, num_dirs_per_level=4, num_files_per_dir=7, file_size=41, prog_num=6) as make_random_dirs_004_6:  # 0m:0.058s
+                make_random_dirs_004_6()
+            with Wtar(what_to_wtar=r"/root/package/python_batch_test_results/TestPythonBatchWtar/Wtar_Unwtar/folder-to-wtar", prog_num=7) as wtar_005_7:  # 0m:0.218s
+                wtar_005_7()
+            with Wtar(what_to_wtar=r"/root/package/python_batch_test_results/TestPythonBatchWtar/Wtar_Unwtar/folder-to-wtar", where_to_put_wtar=r"/root/package/python_batch_test_results/TestPythonBatchWtar/Wtar_Unwtar/dummy-wtar-file-to-replace.dummy", prog_num=8) as wtar_006_8:  # 0m:0.214s
+                wtar_006_8()
+            with MakeDir(r"/root/package/python_batch_test_results/TestPythonBatchWtar/Wtar_Unwtar/another-folder", prog_num=9) as make_dir_007_9:  # 0m:0.000s
+                make_dir_007_9()
+            with Wtar(what_to_wtar=r"/root/package/python_batch_test_results/TestPythonBatchWtar/Wtar_Unwtar/folder-to-wtar", where_to_put_wtar=r"/root/package/python_batch_test_results/TestPythonBatchWtar/Wtar_Unwtar/another-folder", prog_num=10) as wtar_008_10:  # 0m:0.212s
+                wtar_008_10()
+
+with Stage(r"epilog", prog_num=11):  # 0m:0.027s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchWtar/Wtar_Unwtar/1_wtar the folder.py", prog_num=12) as patch_py_batch_with_timings_009_12:  # 0m:0.013s
+        patch_py_batch_with_timings_009_12()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.702s
@@ -0,0 +1,31 @@
+# Creation time: 18-10-26_07-19
+import os
+import sys
+sys.path.append(r"/root/package")
+import logging
+log = logging.getLogger(__name__)
+import utils
+from configVar import config_vars
+utils.set_acting_ids(config_vars.get("ACTING_UID", -1).int(), config_vars.get("ACTING_GID", -1).int())
+from pybatch import *
+PythonBatchCommandBase.total_progress = 5
+PythonBatchCommandBase.running_progress = 0
+if __name__ == '__main__':
+    from utils import log_utils
+    log_utils.config_logger()
+
+
+with PythonBatchRuntime(r"ZipMany test #1;", prog_num=1):  # 0m:0.002s
+    with Stage(r"doit", prog_num=2):  # 0m:0.002s
+        with ZipFlat(target_zip=r"/root/package/python_batch_test_results/TestPythonBatchWtar/ZipMany/many_files.wzip", files_to_zip=[r"/root/package/python_batch_test_results/TestPythonBatchWtar/ZipMany/source/to_zip_0",r"/root/package/python_batch_test_results/TestPythonBatchWtar/ZipMany/source/to_zip_1",r"/root/package/python_batch_test_results/TestPythonBatchWtar/ZipMany/source/to_zip_2",r"/root/package/python_batch_test_results/TestPythonBatchWtar/ZipMany/source/to_zip_3",r"/root/package/python_batch_test_results/TestPythonBatchWtar/ZipMany/source/to_zip_4",r"/root/package/python_batch_test_results/TestPythonBatchWtar/ZipMany/source/to_zip_5",r"/root/package/python_batch_test_results/TestPythonBatchWtar/ZipMany/source/to_zip_6",r"/root/package/python_batch_test_results/TestPythonBatchWtar/ZipMany/source/to_zip_7",r"/root/package/python_batch_test_results/TestPythonBatchWtar/ZipMany/source/to_zip_8",r"/root/package/python_batch_test_results/TestPythonBatchWtar/ZipMany/source/to_zip_9"], prog_num=3) as zip_flat_001_3:  # 0m:0.002s
+            zip_flat_001_3()
+
+with Stage(r"epilog", prog_num=4):  # 0m:0.001s
+    with PatchPyBatchWithTimings(r"/root/package/python_batch_test_results/TestPythonBatchWtar/ZipMany/1_WzipMany files.py", prog_num=5) as patch_py_batch_with_timings_002_5:  # 0m:0.010s
+        patch_py_batch_with_timings_002_5()
+
+log.info("Shakespeare says: All's Well That Ends Well")
+# eof
+
+# copy time 0m:0.001s
+# doit time 0m:0.002s
@@ -9,6 +9,8 @@ from pathlib import Path
 log = logging.getLogger()
 
 import csv
+import gc
+import itertools
 import sqlite3
 from contextlib import contextmanager
 from typing import Dict, Generator, List, Tuple
@@ -241,42 +243,22 @@ class SVNTable(object):
          FROM svn_item_t AS parent_t
          WHERE parent_t.path==svn_item_t.parent)
          """
+    # path is a materialized path of the tree: the descendants of a folder are all the items whose path
+    # starts with the folder's path followed by '/'. Since '0' is the character following '/', descendants
+    # of folder 'a/b' are exactly the items with 'a/b/' < path < 'a/b0', which is a single range scan
+    # on ix_svn_item_t_path, instead of a recursive walk over parent_id.
+    # Ancestors of an item are the folders whose paths are prefixes of the item's path, see mark_parent_folders.
     get_child_items_q = """
-        WITH RECURSIVE get_children(__ID) AS
-        (
-            SELECT first_item_t._id
-            FROM svn_item_t AS first_item_t
-            WHERE first_item_t.parent_id=:parent_id
-
-            UNION
-
-            SELECT child_item_t._id
-            FROM svn_item_t child_item_t, get_children
-            WHERE child_item_t.parent_id = get_children.__ID
-        )
         SELECT * FROM svn_item_t
-        WHERE _id IN get_children
+        WHERE path > :dir_path || '/' AND path < :dir_path || '0'
         {another_filter}
         ORDER BY parent_id
         """
     # noinspection SyntaxError
     count_child_items_q = """
-        WITH RECURSIVE get_children(__ID) AS
-        (
-            SELECT first_item_t._id
-            FROM svn_item_t AS first_item_t
-            WHERE first_item_t.parent_id=:parent_id
-
-            UNION
-
-            SELECT child_item_t._id
-            FROM svn_item_t child_item_t, get_children
-            WHERE child_item_t.parent_id = get_children.__ID
-        )
         SELECT COUNT(_id) FROM svn_item_t
-        WHERE _id IN get_children
+        WHERE path > :dir_path || '/' AND path < :dir_path || '0'
         {another_filter}
-        ORDER BY parent_id
         """
     get_immediate_child_items_q = """SELECT * FROM svn_item_t WHERE parent_id==:parent_id"""
 
@@ -356,6 +338,83 @@ class SVNTable(object):
         else:
             raise ValueError(f"Unknown read a_format {a_format}")
 
+    # columns copied to/from info_map snapshot, these are all the columns set by read_from_text
+    info_map_snapshot_columns = ("path", "flags", "revision", "checksum", "size", "url", "download_path",
+                                 "level", "parent", "leaf", "fileFlag", "wtarFlag", "unwtarred",
+                                 "required", "need_download", "symlinkFlag")
+
+    def read_from_file_with_snapshot(self, in_file, snapshot_file, snapshot_key, progress_callback=None) -> None:
+        """ same as read_from_file, but if snapshot_file was created from a file with the same snapshot_key,
+            rows are copied from snapshot_file in one step instead of parsing in_file.
+            Otherwise in_file is parsed and a new snapshot_file is written.
+            snapshot_key should identify the contents of in_file, e.g. it's checksum.
+        """
+        if in_file in self.files_read_list:
+            log.info(f"SVNTable.read_from_file_with_snapshot skipping '{in_file}': file was already read")
+            return
+
+        if self.load_info_map_snapshot(snapshot_file, snapshot_key, progress_callback=progress_callback):
+            self.comments.append(f"Original file {in_file}")
+            self.files_read_list.append(in_file)
+        else:
+            from_id = self.db.curs.execute("""SELECT COALESCE(MAX(_id), 0) FROM svn_item_t""").fetchone()[0]
+            self.read_from_file(in_file, progress_callback=progress_callback)
+            self.save_info_map_snapshot(snapshot_file, snapshot_key, from_id)
+
+    def load_info_map_snapshot(self, snapshot_file, snapshot_key, progress_callback=None) -> bool:
+        """ copy rows from snapshot_file to svn_item_t if snapshot_file exists and was saved with snapshot_key.
+            return True if rows were copied.
+        """
+        retVal = False
+        if not os.path.isfile(snapshot_file):
+            return retVal
+        columns = ", ".join(self.info_map_snapshot_columns)
+        try:
+            self.db.curs.execute("""ATTACH DATABASE ? AS snapshot_db""", (os.fspath(snapshot_file),))
+            try:
+                row = self.db.curs.execute("""SELECT snapshot_key FROM snapshot_db.snapshot_info_t""").fetchone()
+                if row is not None and row[0] == snapshot_key:
+                    description = f"read info_map snapshot from {snapshot_file}"
+                    with self.db.transaction(description=description, progress_callback=progress_callback) as curs:
+                        curs.execute(f"""INSERT INTO main.svn_item_t ({columns})
+                                         SELECT {columns} FROM snapshot_db.svn_item_t ORDER BY _id""")
+                        retVal = True
+            finally:
+                self.db.curs.execute("""DETACH DATABASE snapshot_db""")
+        except (sqlite3.Error, OSError) as ex:  # a broken snapshot is ignored and info_map is parsed
+            log.info(f"ignoring info_map snapshot {snapshot_file}; {ex}")
+            retVal = False
+        return retVal
+
+    def save_info_map_snapshot(self, snapshot_file, snapshot_key, from_id=0) -> None:
+        """ write rows of svn_item_t with _id > from_id to snapshot_file, tagged with snapshot_key.
+            snapshot is written to a temp file and renamed, so a partial snapshot is never used.
+        """
+        snapshot_file = os.fspath(snapshot_file)
+        temp_snapshot_file = snapshot_file + ".tmp"
+        utils.safe_remove_file(temp_snapshot_file)
+        columns = ", ".join(self.info_map_snapshot_columns)
+        snapshot_written = False
+        try:
+            self.db.curs.execute("""ATTACH DATABASE ? AS snapshot_db""", (temp_snapshot_file,))
+            try:
+                with self.db.transaction(description=f"write info_map snapshot {snapshot_file}") as curs:
+                    curs.execute(f"""CREATE TABLE snapshot_db.svn_item_t AS
+                                     SELECT _id, {columns} FROM main.svn_item_t WHERE _id > ?""", (from_id,))
+                    curs.execute("""CREATE TABLE snapshot_db.snapshot_info_t (snapshot_key TEXT)""")
+                    curs.execute("""INSERT INTO snapshot_db.snapshot_info_t (snapshot_key) VALUES (?)""", (snapshot_key,))
+                    snapshot_written = True
+            finally:
+                self.db.curs.execute("""DETACH DATABASE snapshot_db""")
+            if snapshot_written:
+                os.replace(temp_snapshot_file, snapshot_file)
+                utils.chown_chmod_on_path(snapshot_file)
+            else:
+                utils.safe_remove_file(temp_snapshot_file)
+        except (sqlite3.Error, OSError) as ex:
+            log.info(f"failed to write info_map snapshot {snapshot_file}; {ex}")
+            utils.safe_remove_file(temp_snapshot_file)
+
     def read_from_svn_info(self, rfd, progress_callback=None) -> None:
         """ reads new items from svn info items prepared by iter_svn_info
             items are inserted in lexicographic directory order, so '/'
@@ -428,8 +487,91 @@ class SVNTable(object):
             for rows in utils.iter_grouper(8192, row_yielder):
                 curs.executemany(insert_q, rows)
 
+    info_map_dl_path_re = re.compile(r"dl_path:'(?P<ld_path>.+)'")
+    info_map_line_defaults = ('!path!', '!flags!', '!repo-rev!', None, 0, None, None)  # path, flags, revision, checksum, size, url, dl_path
+    info_map_read_block_size = 64 * 1024  # number of lines parsed and inserted together by read_from_text
+    insert_info_map_rows_q = """
+                INSERT INTO svn_item_t (path, flags, revision,
+                                      checksum, size, url, download_path,
+                                      level, parent, leaf,
+                                      fileFlag, wtarFlag, unwtarred,
+                                      required, need_download,
+                                      symlinkFlag)
+                 VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?);
+                """
+
     def read_from_text(self, rfd, progress_callback=None):
-        dl_path_re = re.compile(r"dl_path:'(?P<ld_path>.+)'")
+        """ read info_map text lines from rfd.
+            Lines are parsed in blocks of info_map_read_block_size, and each calculated column
+            is computed for the whole block at once, see info_map_rows_from_csv_block.
+            Rows are identical to those created by read_from_text_by_row.
+        """
+        reader = csv.reader(rfd, skipinitialspace=True)
+        description = f"read info_map from {rfd.name}"
+        # parsing creates many small objects that are all alive until inserted, so cyclic garbage
+        # collection would repeatedly scan them and find nothing to collect
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with self.db.transaction(description=description, progress_callback=progress_callback) as curs:
+                while True:
+                    csv_block = list(itertools.islice(reader, self.info_map_read_block_size))
+                    if not csv_block:
+                        break
+                    curs.executemany(self.insert_info_map_rows_q, self.info_map_rows_from_csv_block(csv_block))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    @classmethod
+    def info_map_rows_from_csv_block(cls, csv_block) -> List[Tuple]:
+        """ convert a list of info_map lines, already split by csv.reader, to svn_item_t rows, see read_from_text """
+        rows = [row for row in csv_block if row and row[0][0] != '#']
+        for row in rows:
+            # when there are 6 items in row the last might be url or dl_path
+            # so if row is (path, flags, repo-rev, checksum, size, dl_path) insert a None for url so row will be:
+            # (path, flags, repo-rev, checksum, size, url, dl_path)
+            if len(row) == 6 and row[5].startswith("dl_path:"):
+                row.insert(5, None)
+            if len(row) < 7:
+                row.extend(cls.info_map_line_defaults[len(row):])
+            elif len(row) > 7:
+                raise ValueError(f"too many fields in info_map line {row}")
+        if not rows:
+            return []
+
+        paths, flags, revisions, checksums, sizes, urls, dl_paths = zip(*rows)
+        download_paths = [None if dl_path is None else cls.download_path_from_dl_path(dl_path) for dl_path in dl_paths]
+        levels = [path.count("/") + 1 for path in paths]
+        parents_and_leaves = [path.rpartition("/") for path in paths]
+        parents = [parent_and_leaf[0] for parent_and_leaf in parents_and_leaves]
+        leaves = [parent_and_leaf[2] for parent_and_leaf in parents_and_leaves]
+        file_flags = [1 if 'f' in flag else 0 for flag in flags]
+        # checking for ".wtar" first avoids running the regex on most paths
+        wtar_matches = [utils.wtar_file_re.match(path) if ".wtar" in path else None for path in paths]
+        wtar_flags = [0 if wtar_match is None else 1 for wtar_match in wtar_matches]
+        unwtarred = [path if wtar_match is None else wtar_match['base_name'] for path, wtar_match in zip(paths, wtar_matches)]
+        symlink_flags = [1 if path.endswith('.symlink') else 0 for path in paths]
+        zeros = itertools.repeat(0)
+
+        retVal = list(zip(paths, flags, revisions, checksums, sizes, urls, download_paths,
+                          levels, parents, leaves,
+                          file_flags, wtar_flags, unwtarred,
+                          zeros, zeros,  # required, need_download
+                          symlink_flags))
+        return retVal
+
+    @classmethod
+    def download_path_from_dl_path(cls, dl_path):
+        match = cls.info_map_dl_path_re.match(dl_path)
+        retVal = match['ld_path'] if match else dl_path
+        return retVal
+
+    def read_from_text_by_row(self, rfd, progress_callback=None):
+        """ read info_map text lines from rfd, one line at a time.
+            Replaced by read_from_text, kept as reference implementation for tests and benchmarks.
+        """
+        dl_path_re = self.info_map_dl_path_re
 
         def yield_row(_rfd_):
             reader = csv.reader(_rfd_, skipinitialspace=True)
@@ -440,9 +582,8 @@ class SVNTable(object):
                     # (path, flags, repo-rev, checksum, size, url, dl_path)
                     if len(row) == 6 and row[5].startswith("dl_path:"):
                         row.insert(5, None)
-                    info_map_line_defaults = ('!path!', '!flags!', '!repo-rev!', None, 0, None, None)
                     row_data = list(utils.iter_complete_to_longest(row,
-                                                                   info_map_line_defaults))  # path, flags, revision, checksum, size, url, dl_path
+                                                                   self.info_map_line_defaults))  # path, flags, revision, checksum, size, url, dl_path
                     if row_data[6] is not None:
                         match = dl_path_re.match(row_data[6])
                         if match:
@@ -465,17 +606,8 @@ class SVNTable(object):
         row_yielder = yield_row(rfd)
         description = f"read info_map from {rfd.name}"
         with self.db.transaction(description=description, progress_callback=progress_callback) as curs:
-            insert_q = """
-                INSERT INTO svn_item_t (path, flags, revision,
-                                      checksum, size, url, download_path,
-                                      level, parent, leaf,
-                                      fileFlag, wtarFlag, unwtarred,
-                                      required, need_download,
-                                      symlinkFlag)
-                 VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?);
-                """
             for rows in utils.iter_grouper(8192, row_yielder):
-                curs.executemany(insert_q, rows)
+                curs.executemany(self.insert_info_map_rows_q, rows)
 
     @staticmethod
     def get_wtar_file_status(file_name) -> Tuple[bool, bool]:
@@ -1069,21 +1201,10 @@ class SVNTable(object):
         file_or_dir_clause = {"file": "AND fileFlag=1", "dir": "AND fileFlag=0", "any": ""}[what]
 
         query_text = f"""
-            WITH RECURSIVE get_children(__ID) AS
-            (
-                SELECT first_item_t._id
-                FROM svn_item_t AS first_item_t
-                WHERE first_item_t.unwtarred == :dir_path
-
-                UNION
-
-                SELECT child_item_t._id
-                FROM svn_item_t child_item_t, get_children
-                WHERE child_item_t.parent_id = get_children.__ID
-            )
             SELECT _id, path, leaf, fileFlag
             FROM svn_item_t
-            WHERE svn_item_t._id IN (SELECT __ID FROM get_children)
+            WHERE (unwtarred == :dir_path
+                   OR (path > :dir_path || '/' AND path < :dir_path || '0'))
             {file_or_dir_clause}
             ORDER BY _id
             """
@@ -1097,21 +1218,10 @@ class SVNTable(object):
             results are recursive so files from sub folders are also returned
         """
         query_text = """
-            WITH RECURSIVE get_children(__ID) AS
-            (
-                SELECT first_item_t._id
-                FROM svn_item_t AS first_item_t
-                WHERE first_item_t.unwtarred == :dir_path
-
-                UNION
-
-                SELECT child_item_t._id
-                FROM svn_item_t child_item_t, get_children
-                WHERE child_item_t.parent_id = get_children.__ID
-            )
             SELECT *
             FROM svn_item_t
-            WHERE svn_item_t._id IN (SELECT __ID FROM get_children)
+            WHERE (unwtarred == :dir_path
+                   OR (path > :dir_path || '/' AND path < :dir_path || '0'))
             AND fileFlag=1
             ORDER BY _id
             """
@@ -1128,21 +1238,11 @@ class SVNTable(object):
         retVal: int = 0
         with self.db.selection() as curs:
             query_text = """
-                WITH RECURSIVE get_children(__ID, __PATH, __WTAR_FLAG) AS
-                (
-                    SELECT first_item_t._id, first_item_t.path, first_item_t.wtarFlag
-                    FROM svn_item_t AS first_item_t
-                    WHERE first_item_t.unwtarred == :dir_path
-
-                    UNION
-
-                    SELECT child_item_t._id, child_item_t.path, child_item_t.wtarFlag
-                    FROM svn_item_t child_item_t, get_children
-                    WHERE child_item_t.parent_id = get_children.__ID
-                )
                 SELECT COUNT(*)
-                FROM get_children
-                WHERE get_children.__WTAR_FLAG = 1
+                FROM svn_item_t
+                WHERE (unwtarred == :dir_path
+                       OR (path > :dir_path || '/' AND path < :dir_path || '0'))
+                AND wtarFlag = 1
                 """
             retVal = curs.execute(query_text, {'dir_path': dir_path}).fetchone()[0]
         return retVal
@@ -1165,7 +1265,7 @@ class SVNTable(object):
                     else:
                         query_text = self.get_child_items_q
                     query_text = query_text.format(another_filter="")
-                    curs.execute(query_text, {"parent_id": root_dir_item._id})
+                    curs.execute(query_text, {"parent_id": root_dir_item._id, "dir_path": root_dir_item.path})
                     retVal = curs.fetchall()
                     retVal = self.SVNRowListToObjects(retVal)
             else:
@@ -1208,36 +1308,44 @@ class SVNTable(object):
                 num_required_files = self.mark_required_for_file(source_path)
         return num_required_files
 
+    def mark_parent_folders(self, flag_name, description, progress_callback=None) -> int:
+        """ set flag_name=1 for all the ancestor folders of files that have flag_name==1.
+            Ancestors are found by walking up each file's parent path, the walk stops at the first
+            folder already found so each folder is visited once. Folders are then updated by path,
+            using ix_svn_item_t_path.
+            :return: number of folders that changed
+        """
+        retVal = 0
+        folder_paths = set()
+        with self.db.selection() as curs:
+            curs.execute(f"""SELECT DISTINCT parent FROM svn_item_t WHERE fileFlag==1 AND {flag_name}==1""")
+            for (parent_path,) in curs:
+                while parent_path and parent_path not in folder_paths:
+                    folder_paths.add(parent_path)
+                    parent_path = parent_path.rpartition("/")[0]
+        if folder_paths:
+            query_text = f"""UPDATE svn_item_t SET {flag_name}=1 WHERE path==? AND fileFlag==0 AND {flag_name}==0"""
+            with self.db.transaction(description=description, progress_callback=progress_callback) as curs:
+                curs.executemany(query_text, ((folder_path,) for folder_path in folder_paths))
+                retVal = curs.rowcount
+        return retVal
+
     def mark_required_completion(self, progress_callback=None) -> int:
         """ after some files were marked as required,
             mark their parent dirs are required as well
+            :return: number of dirs that were marked
         """
-        retVal = 0
-        query_text = """
-            WITH RECURSIVE get_parents(__ID, __PATH, __PARENT_ID) AS
-            (
-                SELECT file_item_t._id, file_item_t.path, file_item_t.parent_id
-                FROM svn_item_t AS file_item_t
-                WHERE file_item_t.fileFlag=1
-                AND file_item_t.required=1
-
-                UNION
-
-                SELECT parent_item_t._id, parent_item_t.path, parent_item_t.parent_id
-                FROM svn_item_t parent_item_t, get_parents
-                WHERE parent_item_t._id = get_parents.__PARENT_ID
-            )
-            UPDATE svn_item_t
-            SET required=1
-            WHERE _id IN (SELECT __ID FROM get_parents);
-            """
-        with self.db.transaction(description="mark_required_completion", progress_callback=progress_callback) as curs:
-            curs.execute(query_text)
-            retVal = curs.rowcount
+        retVal = self.mark_parent_folders("required", description="mark_required_completion", progress_callback=progress_callback)
         return retVal
 
-    def mark_need_download(self, progress_callback=None) -> None:
-        self.db.create_function("need_to_download_file", 2, utils.need_to_download_file)
+    def mark_need_download(self, checksum_cache=None, progress_callback=None) -> None:
+        """ mark required files that are missing or have wrong checksum as need_download
+            checksum_cache: optional utils.ChecksumCache to avoid re-checksumming files that did not change
+        """
+        if checksum_cache is not None:
+            self.db.create_function("need_to_download_file", 2, checksum_cache.need_to_download_file)
+        else:
+            self.db.create_function("need_to_download_file", 2, utils.need_to_download_file)
         # mark files that need download
         query_text = """
             UPDATE svn_item_t
@@ -1251,27 +1359,7 @@ class SVNTable(object):
                                  progress_callback_n_instructions=1024 * 10) as curs:
             curs.execute(query_text)
         # mark folders of files that need download
-        query_text = """
-            WITH RECURSIVE get_parents(__PARENT_ID) AS
-            (
-                SELECT file_item_t.parent_id
-                FROM svn_item_t AS file_item_t
-                WHERE file_item_t.fileFlag=1
-                AND file_item_t.need_download=1
-
-                UNION
-
-                SELECT parent_item_t.parent_id
-                FROM svn_item_t parent_item_t, get_parents
-                WHERE parent_item_t._id = get_parents.__PARENT_ID
-            )
-            UPDATE svn_item_t
-            SET need_download=1
-            WHERE _id IN (SELECT __PARENT_ID FROM get_parents)
-            """
-        with self.db.transaction(description="mark_need_download_recursive",
-                                 progress_callback=progress_callback) as curs:
-            curs.execute(query_text)
+        self.mark_parent_folders("need_download", description="mark_need_download_recursive", progress_callback=progress_callback)
 
     def mark_required_for_revision(self, required_revision) -> None:
         """ mark all files and dirs as required if they are of specific revision
@@ -1334,43 +1422,24 @@ class SVNTable(object):
             );
 
             -- mark files and folders that are children of those appearing in install_sources of required items
-            WITH RECURSIVE get_children(__ID) AS
-            (
-                SELECT first_item_t._id
-                FROM svn_item_t AS first_item_t
-                WHERE required==1 AND fileFlag==0
-
-                UNION
-
-                SELECT child_item_t._id
-                FROM svn_item_t child_item_t, get_children
-                WHERE child_item_t.parent_id = get_children.__ID
-            )
             UPDATE svn_item_t
             SET required=1
-            WHERE _id IN (SELECT __ID FROM get_children);
-
-            -- mark the parent folders of all required items
-            WITH RECURSIVE get_parents(__ID) AS
+            WHERE required==0
+            AND _id IN
             (
-                SELECT file_item_t.parent_id
-                FROM svn_item_t AS file_item_t
-                WHERE file_item_t.fileFlag=1
-                AND file_item_t.required=1
-
-                UNION
-
-                SELECT parent_item_t.parent_id
-                FROM svn_item_t parent_item_t, get_parents
-                WHERE parent_item_t._id = get_parents.__ID
-            )
-            UPDATE svn_item_t
-            SET required=1
-            WHERE _id IN (SELECT __ID FROM get_parents);
+                SELECT child_item_t._id
+                FROM svn_item_t AS folder_item_t
+                CROSS JOIN svn_item_t AS child_item_t  -- CROSS JOIN forces sqlite to loop on folders and range-search children
+                    ON child_item_t.path > folder_item_t.path || '/'
+                    AND child_item_t.path < folder_item_t.path || '0'
+                WHERE folder_item_t.required==1 AND folder_item_t.fileFlag==0
+            );
         """
         with self.db.transaction(description="mark_required_files_for_active_items",
                                  progress_callback=progress_callback) as curs:
             curs.executescript(script_text)
+        # mark the parent folders of all required items
+        self.mark_parent_folders("required", description="mark_required_files_for_active_items_parents", progress_callback=progress_callback)
 
     def get_download_roots(self) -> List[str]:
         query_text = """
@@ -1509,7 +1578,7 @@ class SVNTable(object):
             with self.db.selection() as curs:
                 query_text = self.count_child_items_q
                 query_text = query_text.format(another_filter="AND symlinkFlag==1")
-                curs.execute(query_text, {"parent_id": root_dir_item._id})
+                curs.execute(query_text, {"dir_path": root_dir_item.path})
                 retVal = curs.fetchone()[0]
         return retVal
 
@@ -1517,21 +1586,10 @@ class SVNTable(object):
         """ mark all files inside a dir as ignored """
         retVal: int = 0
         query_text = """
-            WITH RECURSIVE get_children(__ID) AS
-            (
-                SELECT first_item_t._id
-                FROM svn_item_t AS first_item_t
-                WHERE first_item_t.unwtarred == :dir_path
-
-                UNION
-
-                SELECT child_item_t._id
-                FROM svn_item_t child_item_t, get_children
-                WHERE child_item_t.parent_id == get_children.__ID
-            )
             UPDATE svn_item_t
             SET ignore=1
-            WHERE svn_item_t._id IN (SELECT __ID FROM get_children)
+            WHERE (unwtarred == :dir_path
+                   OR (path > :dir_path || '/' AND path < :dir_path || '0'))
             AND fileFlag==1
             """
         with self.db.transaction() as curs:
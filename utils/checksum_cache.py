@@ -0,0 +1,195 @@
+#!/usr/bin/env python3.12
+
+import os
+import stat
+import time
+import sqlite3
+import threading
+import logging
+from pathlib import Path
+
+import utils
+
+log = logging.getLogger(__name__)
+
+
+"""
+    ChecksumCache remembers the sha1 checksum of files between runs, so files that
+    did not change since the last time they were checksummed do not have to be read again.
+    A cached checksum is considered valid only if the file's size, mtime_ns and inode
+    are the same as when the checksum was calculated.
+    The cache is kept in a small sqlite file, usually in the bookkeeping folder.
+
+    Example:
+        with ChecksumCache("/path/to/bookkeeping/checksum_cache.sqlite") as cache:
+            if cache.need_to_download_file(file_path, expected_checksum):
+                ...
+
+    ChecksumCache(None) is a pass-through cache: nothing is remembered and all checksums are calculated.
+    If folder_snapshot (a utils.FolderSnapshot) is set, need_to_download_file takes the file's stat from it
+    instead of calling os.stat.
+"""
+
+
+class ChecksumCache(object):
+    # index of values in each entry of self.entries
+    SIZE, MTIME_NS, INODE, CHECKSUM, LAST_USED = range(5)
+    # last_used is only updated if older than this, to avoid rewriting the whole cache on each run
+    last_used_resolution_sec = 60 * 60 * 24
+
+    def __init__(self, cache_file_path=None, max_age_days=30, max_items=1000000) -> None:
+        self.cache_file_path = Path(cache_file_path) if cache_file_path else None
+        self.max_age_days = max_age_days
+        self.max_items = max_items
+        self.entries = dict()   # path -> [size, mtime_ns, inode, checksum, last_used]
+        self.dirty_paths = set()
+        self.lock = threading.Lock()
+        self.num_hits = 0
+        self.num_misses = 0
+        self.is_open = False
+        self.folder_snapshot = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self):
+        if self.cache_file_path and self.cache_file_path.is_file():
+            try:
+                with sqlite3.connect(os.fspath(self.cache_file_path)) as conn:
+                    for path, size, mtime_ns, inode, checksum, last_used in conn.execute(
+                            """SELECT path, size, mtime_ns, inode, checksum, last_used FROM checksum_cache_t"""):
+                        self.entries[path] = [size, mtime_ns, inode, checksum, last_used]
+                conn.close()
+            except sqlite3.DatabaseError as ex:
+                # a broken cache should never fail the caller, start with an empty cache
+                log.warning(f"""ignoring bad checksum cache {self.cache_file_path}; {ex}""")
+                self.entries.clear()
+                utils.safe_remove_file(self.cache_file_path)
+        self.is_open = True
+
+    def close(self):
+        if self.is_open:
+            self.save()
+            if self.num_hits or self.num_misses:
+                log.info(f"""checksum cache: {self.num_hits} hits, {self.num_misses} misses, {len(self.entries)} entries""")
+            self.entries.clear()
+            self.dirty_paths.clear()
+            self.is_open = False
+
+    def evict(self):
+        """ remove entries not used for more than max_age_days,
+            if still more than max_items remove the least recently used.
+            :return: list of removed paths
+        """
+        removed_paths = list()
+        oldest_allowed = int(time.time()) - self.max_age_days * 24 * 60 * 60
+        for path, entry in self.entries.items():
+            if entry[ChecksumCache.LAST_USED] < oldest_allowed:
+                removed_paths.append(path)
+        for path in removed_paths:
+            del self.entries[path]
+
+        num_over_max = len(self.entries) - self.max_items
+        if num_over_max > 0:
+            least_recently_used = sorted(self.entries.items(), key=lambda item: item[1][ChecksumCache.LAST_USED])[:num_over_max]
+            for path, _ in least_recently_used:
+                del self.entries[path]
+                removed_paths.append(path)
+        self.dirty_paths.difference_update(removed_paths)
+        return removed_paths
+
+    def save(self):
+        if not self.cache_file_path:
+            return
+        with self.lock:
+            removed_paths = self.evict()
+            if not removed_paths and not self.dirty_paths:
+                return
+            try:
+                self.cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(os.fspath(self.cache_file_path))
+                with conn:
+                    conn.execute("""CREATE TABLE IF NOT EXISTS checksum_cache_t
+                                    (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER,
+                                    checksum TEXT, last_used INTEGER)""")
+                    conn.executemany("""DELETE FROM checksum_cache_t WHERE path=?""", ((path,) for path in removed_paths))
+                    conn.executemany("""INSERT OR REPLACE INTO checksum_cache_t (path, size, mtime_ns, inode, checksum, last_used)
+                                        VALUES (?,?,?,?,?,?)""",
+                                     ((path, *self.entries[path]) for path in self.dirty_paths))
+                conn.close()
+                utils.chown_chmod_on_path(self.cache_file_path)
+                self.dirty_paths.clear()
+            except sqlite3.Error as ex:
+                log.warning(f"""failed to save checksum cache {self.cache_file_path}; {ex}""")
+
+    def get_file_checksum(self, file_path, follow_symlinks=True, the_stat=None):
+        """ return the sha1 checksum of a file, same as utils.get_file_checksum,
+            but avoid reading the file if it did not change since last time it was checksummed.
+            the_stat: the caller might already have the result of os.stat for file_path
+        """
+        if the_stat is None:
+            the_stat = os.stat(file_path, follow_symlinks=follow_symlinks)
+        if not stat.S_ISREG(the_stat.st_mode):  # symlinks (when not followed) are checksummed by their contents
+            return utils.get_file_checksum(file_path, follow_symlinks=follow_symlinks)
+
+        key = os.fspath(file_path)
+        now = int(time.time())
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None \
+                    and entry[ChecksumCache.SIZE] == the_stat.st_size \
+                    and entry[ChecksumCache.MTIME_NS] == the_stat.st_mtime_ns \
+                    and entry[ChecksumCache.INODE] == the_stat.st_ino:
+                self.num_hits += 1
+                if now - entry[ChecksumCache.LAST_USED] > ChecksumCache.last_used_resolution_sec:
+                    entry[ChecksumCache.LAST_USED] = now
+                    self.dirty_paths.add(key)
+                return entry[ChecksumCache.CHECKSUM]
+
+        retVal = utils.get_file_checksum(file_path, follow_symlinks=follow_symlinks)
+        with self.lock:
+            self.num_misses += 1
+            self.entries[key] = [the_stat.st_size, the_stat.st_mtime_ns, the_stat.st_ino, retVal, now]
+            self.dirty_paths.add(key)
+        return retVal
+
+    def check_file_checksum(self, file_path, expected_checksum):
+        """ same as utils.check_file_checksum, but using the cache """
+        retVal = False  # if file does not exist return False
+        if file_path and expected_checksum:
+            try:
+                retVal = utils.compare_checksums(self.get_file_checksum(file_path), expected_checksum)
+            except Exception:
+                pass
+        return retVal
+
+    def need_to_download_file(self, file_path, file_checksum):
+        """ same as utils.need_to_download_file, but using the cache,
+            can be registered as sqlite function
+        """
+        retVal = True
+        try:
+            the_stat = self.folder_snapshot.stat(file_path) if self.folder_snapshot is not None else os.stat(file_path)
+            if stat.S_ISREG(the_stat.st_mode):
+                retVal = not utils.compare_checksums(self.get_file_checksum(file_path, the_stat=the_stat), file_checksum)
+        except Exception:
+            pass
+        return retVal
+
+
+def checksum_cache_for_config_vars(config_vars) -> ChecksumCache:
+    """ create a ChecksumCache according to CHECKSUM_CACHE_PATH & friends.
+        If __NO_CHECKSUM_CACHE__ is true (--no-checksum-cache) or CHECKSUM_CACHE_PATH is not defined
+        a pass-through cache is returned.
+    """
+    cache_file_path = None
+    if not bool(config_vars.get("__NO_CHECKSUM_CACHE__", "False")) and "CHECKSUM_CACHE_PATH" in config_vars:
+        cache_file_path = config_vars["CHECKSUM_CACHE_PATH"].Path()
+    retVal = ChecksumCache(cache_file_path,
+                           max_age_days=int(config_vars.get("CHECKSUM_CACHE_MAX_AGE_DAYS", 30)),
+                           max_items=int(config_vars.get("CHECKSUM_CACHE_MAX_ITEMS", 1000000)))
+    return retVal
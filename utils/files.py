@@ -111,7 +111,8 @@ def chown_chmod_on_fd(fd, user=-1, group=-1):
     return f"""chown_chmod_on_fd: {fd.name} u:{user}, g:{group}"""
 
 
-def chown_chmod_on_path(in_path, user=-1, group=-1):
+def chown_on_path(in_path, user=-1, group=-1):
+    """ change owner of in_path to the acting user/group, if these were set, without changing permissions """
     if user == -1:
         user = global_acting_uid
     if group == -1:
@@ -124,7 +125,16 @@ def chown_chmod_on_path(in_path, user=-1, group=-1):
             elif hasattr(os, 'chown'):
                 os.chown(in_path, user, group)
         except Exception as ex:
-            log.warning(f"""chown_chmod_on_path: chown failed for {in_path}; {ex}""")
+            log.warning(f"""chown_on_path: chown failed for {in_path}; {ex}""")
+
+
+def chown_chmod_on_path(in_path, user=-1, group=-1):
+    if user == -1:
+        user = global_acting_uid
+    if group == -1:
+        group = global_acting_gid
+    if user != -1 or group != -1:
+        chown_on_path(in_path, user, group)
         try:
             if hasattr(os, 'chmod'):
                 os.chmod(in_path,
@@ -529,6 +539,55 @@ def smart_copy_file(source_path, destination_path):
             pass
 
 
+copy_file_data_buffer_size = 1024 * 1024
+
+
+def copy_file_data(rfd, wfd, count=-1, checksum_obj=None) -> int:
+    """ copy count bytes (or until end of file if count < 0) from the current position of rfd
+        to the current position of wfd, with constant memory. Return the number of bytes copied.
+        rfd, wfd should be opened in binary mode with buffering=0, since when possible copying
+        is done by the kernel with os.copy_file_range or os.sendfile, using the files' own positions.
+        If checksum_obj is given (e.g. hashlib.sha1()) it is updated with the copied data, in which case
+        data must pass through a buffer and kernel copy is not used.
+    """
+    retVal = 0
+    remaining = count if count >= 0 else sys.maxsize
+    if checksum_obj is None:
+        for kernel_copy in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+            if kernel_copy is None:
+                continue
+            try:
+                while remaining > 0:
+                    if kernel_copy is os.sendfile:
+                        num_copied = os.sendfile(wfd.fileno(), rfd.fileno(), None, min(remaining, 1 << 30))
+                    else:
+                        num_copied = kernel_copy(rfd.fileno(), wfd.fileno(), min(remaining, 1 << 30))
+                    if num_copied == 0:
+                        return retVal
+                    retVal += num_copied
+                    remaining -= num_copied
+                return retVal
+            except (OSError, TypeError, ValueError):
+                # not supported for these files (e.g. different file systems, sendfile to a file on Mac),
+                # the files' positions were advanced by what was copied so far, the next method can continue from there
+                pass
+
+    buff = bytearray(min(copy_file_data_buffer_size, remaining))
+    buff_view = memoryview(buff)
+    while remaining > 0:
+        num_read = rfd.readinto(buff_view[:min(len(buff), remaining)])
+        if not num_read:
+            break
+        if checksum_obj is not None:
+            checksum_obj.update(buff_view[:num_read])
+        num_written = 0
+        while num_written < num_read:  # raw write might write less than requested
+            num_written += wfd.write(buff_view[num_written:num_read])
+        retVal += num_read
+        remaining -= num_read
+    return retVal
+
+
 def find_split_files(first_file: Path):
     try:
         retVal = list()
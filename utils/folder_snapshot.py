@@ -0,0 +1,127 @@
+#!/usr/bin/env python3.12
+
+import os
+import re
+import sys
+import stat
+import logging
+from collections import namedtuple, defaultdict
+
+log = logging.getLogger(__name__)
+
+
+"""
+    FolderSnapshot scans a folder tree once with os.scandir and remembers, for each file and folder,
+    the few stat fields needed by the code that checks the folder: mode, size, mtime_ns and inode.
+    Code that would otherwise walk or stat the same tree again can query the snapshot instead.
+    Items are keyed by their path relative to the top folder, '/' separated on all platforms.
+    The snapshot is not updated when the disk changes, so it should only be used while
+    nothing else changes the folder, e.g. while creating the sync instructions.
+
+    Example:
+        snapshot = FolderSnapshot("/path/to/sync/folder").scan()
+        the_stat = snapshot.stat("/path/to/sync/folder/a/b.txt")  # no system call
+"""
+
+# same field names as os.stat_result, so a SnapshotStat can be used where a stat result is expected
+SnapshotStat = namedtuple("SnapshotStat", ["st_mode", "st_size", "st_mtime_ns", "st_ino"])
+
+
+class FolderSnapshot(object):
+    def __init__(self, top_folder) -> None:
+        self.top_folder = os.fspath(top_folder)
+        self.top_prefix = os.path.join(self.top_folder, "")
+        self.entries = dict()  # partial path -> SnapshotStat
+        self.num_hits = 0
+        self.num_misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def scan(self):
+        """ scan the top folder, lstat'ing each item once. Symbolic links are not followed.
+            return self, so a snapshot can be created and scanned in one line
+        """
+        self.entries.clear()
+        folders_to_scan = [("", self.top_folder)]
+        while folders_to_scan:
+            partial_folder, full_folder = folders_to_scan.pop()
+            try:
+                with os.scandir(full_folder) as it:
+                    for item in it:
+                        try:
+                            item_stat = item.stat(follow_symlinks=False)
+                            # on Windows scandir does not supply the inode, which ChecksumCache needs for files
+                            inode = item.inode() if sys.platform == 'win32' and stat.S_ISREG(item_stat.st_mode) else item_stat.st_ino
+                        except OSError as ex:
+                            log.debug(f"""FolderSnapshot failed to stat {item.path}; {ex}""")
+                            continue
+                        partial_path = partial_folder + item.name
+                        self.entries[partial_path] = SnapshotStat(item_stat.st_mode, item_stat.st_size, item_stat.st_mtime_ns, inode)
+                        if stat.S_ISDIR(item_stat.st_mode):
+                            folders_to_scan.append((partial_path + "/", item.path))
+            except OSError as ex:
+                log.debug(f"""FolderSnapshot failed to scan {full_folder}; {ex}""")
+        return self
+
+    def partial_path_of(self, full_path):
+        """ return the snapshot key for full_path, or None if full_path is not under the top folder """
+        retVal = None
+        full_path = os.fspath(full_path)
+        if full_path.startswith(self.top_prefix):
+            retVal = full_path[len(self.top_prefix):]
+            if os.sep != "/":
+                retVal = retVal.replace(os.sep, "/")
+        return retVal
+
+    def stat(self, full_path):
+        """ same as os.stat(full_path) but answered from the snapshot when possible.
+            Paths outside the top folder, paths not in the snapshot and symbolic links
+            (which os.stat follows) are stat'ed from disk.
+        """
+        retVal = None
+        partial_path = self.partial_path_of(full_path)
+        if partial_path is not None:
+            retVal = self.entries.get(partial_path)
+        if retVal is None or stat.S_ISLNK(retVal.st_mode):
+            self.num_misses += 1
+            retVal = os.stat(full_path)
+        else:
+            self.num_hits += 1
+        return retVal
+
+    def top_folders_emptied_by_removing(self, partial_paths_to_remove, files_to_ignore=()):
+        """ return the top-most folders (as partial paths, "" for the top folder itself) that will be empty
+            after removing the files in partial_paths_to_remove, including folders that are already empty.
+            Files whose name matches one of files_to_ignore regexes do not keep a folder from being empty,
+            same as RemoveEmptyFolders's files_to_ignore.
+        """
+        partial_paths_to_remove = set(partial_paths_to_remove)
+        # addition of "a^" to make sure empty files_to_ignore does not ignore any file
+        files_to_ignore_regex = re.compile("|".join(list(files_to_ignore) + ["a^"]))
+        num_remaining_items = defaultdict(int)  # folder -> number of items that will remain in the folder
+        num_remaining_items[""] = 0
+        for partial_path, item_stat in self.entries.items():
+            parent_folder, _, item_name = partial_path.rpartition("/")
+            if stat.S_ISDIR(item_stat.st_mode):
+                num_remaining_items[partial_path] += 0
+            elif partial_path in partial_paths_to_remove or files_to_ignore_regex.match(item_name):
+                continue
+            num_remaining_items[parent_folder] += 1
+
+        emptied_folders = set()
+        folders_to_check = [folder for folder, num_items in num_remaining_items.items() if num_items == 0]
+        while folders_to_check:
+            folder = folders_to_check.pop()
+            emptied_folders.add(folder)
+            if folder:
+                parent_folder = folder.rpartition("/")[0]
+                num_remaining_items[parent_folder] -= 1
+                if num_remaining_items[parent_folder] == 0:
+                    folders_to_check.append(parent_folder)
+
+        if "" in emptied_folders:
+            retVal = [""]
+        else:
+            retVal = sorted(folder for folder in emptied_folders if folder.rpartition("/")[0] not in emptied_folders)
+        return retVal
@@ -298,6 +298,28 @@ def get_buffer_checksum(buff):
     return retVal
 
 
+# size of buffer used when checksumming files, files are read and hashed one buffer at a time
+# so memory does not grow with the file's size. hashlib releases the GIL while hashing such buffers.
+checksum_read_buffer_size = 1024 * 1024
+
+
+def get_stream_checksum(rfd, buffer_size=None):
+    """ return the sha1 checksum of the contents of a binary file-like object, reading it in chunks.
+        The same buffer is reused for all reads, so memory does not depend on the size of the stream.
+    """
+    if buffer_size is None:
+        buffer_size = checksum_read_buffer_size
+    sha1ner = hashlib.sha1()
+    buff = bytearray(buffer_size)
+    buff_view = memoryview(buff)
+    num_read = rfd.readinto(buff)
+    while num_read:
+        sha1ner.update(buff_view[:num_read])
+        num_read = rfd.readinto(buff)
+    retVal = sha1ner.hexdigest()
+    return retVal
+
+
 def compare_checksums(_1st_checksum, _2nd_checksum):
     retVal = _1st_checksum.lower() == _2nd_checksum.lower()
     return retVal
@@ -313,25 +335,27 @@ def check_file_checksum(file_path, expected_checksum):
     retVal = False  # if file does not exist return False
     if file_path and expected_checksum:  # prevent reading the file if file_path or expected_checksum is None
         try:
-            with open(file_path, "rb") as rfd:
-                retVal = check_buffer_checksum(rfd.read(), expected_checksum)
+            with open(file_path, "rb", buffering=0) as rfd:
+                retVal = compare_checksums(get_stream_checksum(rfd), expected_checksum)
         except:
             pass
     return retVal
 
 
-def get_file_checksum(file_path, follow_symlinks=True):
+def get_file_checksum(file_path, follow_symlinks=True, buffer_size=None):
     """ return the sha1 checksum of the contents of a file.
         If file_path is a symbolic link and follow_symlinks is True
             the file pointed by the symlink is checksumed.
         If file_path is a symbolic link and follow_symlinks is False
             the contents of the symlink is checksumed - by calling os.readlink.
+        The file is read in chunks of buffer_size (default: checksum_read_buffer_size)
+            so large files are never read into memory as a whole.
     """
     if os.path.islink(file_path) and not follow_symlinks:
         retVal = get_buffer_checksum(os.readlink(file_path).encode())
     else:
-        with open(file_path, "rb") as rfd:
-            retVal = get_buffer_checksum(rfd.read())
+        with open(file_path, "rb", buffering=0) as rfd:
+            retVal = get_stream_checksum(rfd, buffer_size)
     return retVal
 
 
@@ -629,7 +653,12 @@ def original_names_from_wtars_names(original_list):
     return replaced_list
 
 
-def get_recursive_checksums(some_path, ignore=None):
+def manifest_entry(the_stat, the_checksum=None):
+    """ return the manifest entry get_recursive_checksums keeps for a file: [size, mtime_ns, ctime_ns, inode, checksum] """
+    return [the_stat.st_size, the_stat.st_mtime_ns, the_stat.st_ctime_ns, the_stat.st_ino, the_checksum]
+
+
+def get_recursive_checksums(some_path, ignore=None, manifest=None, root_folder=None):
     """ If some_path is a file return a dict mapping the file's path to it's sha1 checksum
         and mapping "total_checksum" to the files checksum, e.g.
         assuming /a/b/c.txt is a file
@@ -650,25 +679,53 @@ def get_recursive_checksums(some_path, ignore=None):
         Note:
             - If you have a file called total_checksum you're f**d.
             - Symlinks are not followed and are checksum as regular files (by calling readlink).
+
+        manifest: optional dict mapping each file's path (same as the keys of the returned dict) to an entry
+            returned by manifest_entry: [size, mtime_ns, ctime_ns, inode, checksum].
+            Files whose stat values are the same as in the manifest are not read, the checksum from the manifest is used.
+            ctime_ns and inode are also compared, because mtime can be set back by the writer of a file, and a file can be
+            replaced by another one with the same size and mtime.
+            The manifest is updated in place to reflect the files that were found.
+        root_folder: optional folder some_path is relative to, instead of the current working directory.
+            Returned paths are still relative to root_folder, so the result is the same as calling
+            get_recursive_checksums after changing directory to root_folder, but can be called from several threads.
     """
     if ignore is None:
         ignore = ()
     retVal = dict()
+
+    def checksum_of(path, normalized_path):
+        if manifest is None:
+            return get_file_checksum(path, follow_symlinks=False)
+        the_stat = os.lstat(path)
+        found_entry = manifest.get(normalized_path)
+        if found_entry is not None and found_entry[:-1] == manifest_entry(the_stat)[:-1]:
+            the_checksum = found_entry[-1]
+        else:
+            the_checksum = get_file_checksum(path, follow_symlinks=False)
+        found_in_manifest[normalized_path] = manifest_entry(the_stat, the_checksum)
+        return the_checksum
+
+    found_in_manifest = dict()
+    some_path = os.fspath(some_path)
+    full_path = os.path.join(root_folder, some_path) if root_folder is not None else some_path
     some_path_dir, some_path_leaf = os.path.split(some_path)
     if some_path_leaf not in ignore:
-        if os.path.isfile(some_path):
-            retVal[some_path_leaf] = get_file_checksum(some_path, follow_symlinks=False)
-        elif os.path.isdir(some_path):
-            for item in utils.scandir_walk(some_path, report_dirs=False):
+        if os.path.isfile(full_path):
+            retVal[some_path_leaf] = checksum_of(full_path, some_path_leaf)
+        elif os.path.isdir(full_path):
+            for item in utils.scandir_walk(full_path, report_dirs=False):
                 item_path_dir, item_path_leaf = os.path.split(item.path)
                 if item_path_leaf not in ignore:
-                    the_checksum = get_file_checksum(item.path, follow_symlinks=False)
-                    normalized_path = PurePath(item.path).as_posix()
-                    retVal[normalized_path] = the_checksum
+                    normalized_path = PurePath(some_path + item.path[len(full_path):]).as_posix()
+                    retVal[normalized_path] = checksum_of(item.path, normalized_path)
 
         checksum_list = sorted(list(retVal.keys()) + list(retVal.values()))
         string_of_checksums = "".join(checksum_list)
         retVal['total_checksum'] = get_buffer_checksum(string_of_checksums.encode())
+    if manifest is not None:
+        manifest.clear()
+        manifest.update(found_in_manifest)
     return retVal
 
 
@@ -2,6 +2,7 @@
 
 import io
 import os
+import bisect
 import stat
 import tarfile
 from typing import Union
@@ -12,7 +13,9 @@ from typing import Union
     were one continuous file. Open mode parameter can either be
     'r' for text files or 'rb' for binary files. readline is not supported
     nor is writing.
-    MultiFileReader implements the io.RawIOBase interface.
+    MultiFileReader implements the io.RawIOBase interface. In binary mode
+    reading is done with readinto directly to the caller's buffer, and each part
+    is buffered, so reading split files is as fast as reading one file.
 
     Example:
         fd = MultiFileReader('r', ['a.txt', 'b.txt'])
@@ -29,6 +32,9 @@ from typing import Union
 
 
 class MultiFileReader(io.RawIOBase):
+    # each part is opened with a buffer of this size, so the many small reads tarfile/bz2 do are served from memory
+    part_buffer_size = 1024 * 1024
+
     class OpenFileData(object):
         def __init__(self, path_to_file) -> None:
             self.path_to_file = path_to_file
@@ -39,7 +45,10 @@ class MultiFileReader(io.RawIOBase):
         def open(self, mode):
             the_stats = os.lstat(self.path_to_file)
             self.size = the_stats[stat.ST_SIZE]
-            self.fd = open(self.path_to_file, mode)
+            if 'b' in mode:
+                self.fd = open(self.path_to_file, mode, buffering=MultiFileReader.part_buffer_size)
+            else:
+                self.fd = open(self.path_to_file, mode)
 
         def close(self):
             if self.fd is not None:
@@ -53,6 +62,7 @@ class MultiFileReader(io.RawIOBase):
         self.mode = mode
         self.the_files = [MultiFileReader.OpenFileData(path) for path in paths]
         self.num_files = len(self.the_files)
+        self.starting_positions = list()  # starting_pos of each file, for bisecting in seek
         self.total_size = -1
         self.current_fd_index = -1
         self.empty_buffer: Union[str, bytes] = ''
@@ -72,6 +82,7 @@ class MultiFileReader(io.RawIOBase):
             a_file.open(self.mode)
             a_file.starting_pos = running_size
             running_size += a_file.size
+        self.starting_positions = [a_file.starting_pos for a_file in self.the_files]
         self.total_size = running_size
         self.current_fd_index = 0
 
@@ -79,6 +90,7 @@ class MultiFileReader(io.RawIOBase):
         for a_file in self.the_files:
             a_file.close()
         del self.the_files[:]
+        self.starting_positions = list()
         self.total_size = -1
         self.current_fd_index = -1
         self.num_files = -1
@@ -122,42 +134,83 @@ class MultiFileReader(io.RawIOBase):
         elif whence == io.SEEK_END:  # offset should be negative
             abs_pos += self.total_size
 
-        for i_file in range(len(self.the_files)):
-            if self.the_files[i_file].starting_pos <= abs_pos <= self.the_files[i_file].starting_pos + self.the_files[i_file].size:
-                new_pos_in_file = abs_pos - self.the_files[i_file].starting_pos
-                self.the_files[i_file].fd.seek(new_pos_in_file)
-                self.current_fd_index = i_file
-                break
+        if 0 <= abs_pos <= self.total_size and self.num_files > 0:
+            # the last file starting at or before abs_pos, empty files are skipped when reading
+            i_file = bisect.bisect_right(self.starting_positions, abs_pos) - 1
+            self.the_files[i_file].fd.seek(abs_pos - self.the_files[i_file].starting_pos)
+            self.current_fd_index = i_file
         return abs_pos
 
     def __next_file(self):
         self.current_fd_index += 1
-        if self.current_fd_index < len(self.the_files):
+        if self.current_fd_index < self.num_files:
             self.the_files[self.current_fd_index].fd.seek(0)
 
+    def readinto(self, buffer):
+        """ read directly into buffer, moving to the next file(s) as needed - without intermediate bytes objects """
+        if self.current_fd_index >= self.num_files:
+            return 0
+        # common case: buffer is filled from the current file
+        num_read = self.the_files[self.current_fd_index].fd.readinto(buffer)
+        if num_read == len(buffer) and num_read:
+            return num_read
+        with memoryview(buffer) as buffer_view, buffer_view.cast("B") as byte_view:
+            buffer_size = len(byte_view)
+            while num_read < buffer_size and self.current_fd_index < self.num_files:
+                num_read_from_file = self.the_files[self.current_fd_index].fd.readinto(byte_view[num_read:])
+                if num_read_from_file:
+                    num_read += num_read_from_file
+                else:
+                    self.__next_file()
+        return num_read
+
     def read(self, size=-1):
-        buff = self.empty_buffer
-        if size == -1:  # read everything
-            while self.current_fd_index < len(self.the_files):
-                buff += self.the_files[self.current_fd_index].fd.read(-1)
+        if self.mode and 'b' not in self.mode:
+            return self.__read_text(size)
+        if size is None or size < 0:
+            return self.readall()
+        if self.current_fd_index >= self.num_files:
+            return self.empty_buffer
+        # common case: all bytes are read from the current file
+        buff = self.the_files[self.current_fd_index].fd.read(size)
+        if len(buff) == size:
+            return buff
+        buffs = [buff]
+        size -= len(buff)
+        while size > 0 and self.current_fd_index < self.num_files:
+            buff = self.the_files[self.current_fd_index].fd.read(size)
+            if buff:
+                buffs.append(buff)
+                size -= len(buff)
+            else:
                 self.__next_file()
-        else:
-            if self.current_fd_index < len(self.the_files):
-                a_file = self.the_files[self.current_fd_index]
-                buff = a_file.fd.read(size)
-                if not buff:
-                    self.__next_file()
-                    buff = self.read(size)
-                else:
-                    bytes_read = len(buff)
-                    if bytes_read < size:
-                        self.__next_file()
-                        buff += self.read(size-len(buff))
-        return buff
+        return self.empty_buffer.join(buffs)
 
     def readall(self):
-        buff = self.read(size=-1)
-        return buff
+        if self.mode and 'b' not in self.mode:
+            return self.__read_text(-1)
+        return self.__read_to_end()
+
+    def __read_to_end(self):
+        buffs = list()
+        while self.current_fd_index < self.num_files:
+            buffs.append(self.the_files[self.current_fd_index].fd.read())
+            self.__next_file()
+        return self.empty_buffer.join(buffs)
+
+    def __read_text(self, size=-1):
+        if size is None or size < 0:
+            return self.__read_to_end()
+        buffs = list()
+        while self.current_fd_index < self.num_files and size != 0:
+            buff = self.the_files[self.current_fd_index].fd.read(size)
+            if buff:
+                buffs.append(buff)
+                if size > 0:
+                    size -= len(buff)
+            else:
+                self.__next_file()
+        return self.empty_buffer.join(buffs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3.12
+
+import io
+import os
+import bz2
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+
+"""
+    ParallelBZ2Writer compresses data written to it in several threads.
+    The uncompressed stream is cut into chunks of fixed size, each chunk is compressed
+    as an independent bz2 stream and the compressed streams are written to the
+    output file one after the other, in order. The result is a multi-stream bz2 file
+    which Python's bz2 module (and therefore tarfile) decompresses as if it was one stream.
+    Since chunk boundaries depend only on the data, the output is the same for the same
+    input regardless of the number of threads.
+    bz2.compress releases the GIL, so threads are enough to use several cores.
+    ParallelBZ2Writer implements the write part of io.RawIOBase interface.
+
+    Example:
+        with ParallelBZ2Writer('a.tar.bz2', compresslevel=1, max_workers=8) as wfd:
+            with tarfile.open(fileobj=wfd, mode="w") as tar:
+                tar.add("a")
+"""
+
+
+class ParallelBZ2Writer(io.RawIOBase):
+    default_chunk_size = 4 * 1024 * 1024
+
+    def __init__(self, path_to_file, compresslevel=9, max_workers=None, chunk_size=None) -> None:
+        super().__init__()
+        self.path_to_file = path_to_file
+        self.compresslevel = compresslevel
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or ParallelBZ2Writer.default_chunk_size
+        self.fd = None
+        self.executor = None
+        self.pending_chunks = collections.deque()  # futures of chunks being compressed, in order of the uncompressed data
+        self.current_chunk = bytearray()
+        self.uncompressed_size = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, etype, value, traceback):
+        self.close()
+
+    def open(self):
+        self.fd = open(self.path_to_file, "wb")
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def close(self):
+        if self.fd is not None:
+            try:
+                if self.current_chunk:
+                    self.__compress_chunk(bytes(self.current_chunk))
+                    self.current_chunk = bytearray()
+                while self.pending_chunks:
+                    self.__write_oldest_chunk()
+            finally:
+                self.executor.shutdown(wait=True, cancel_futures=True)
+                self.executor = None
+                self.fd.close()
+                self.fd = None
+        super().close()
+
+    def __compress_chunk(self, chunk):
+        self.pending_chunks.append(self.executor.submit(bz2.compress, chunk, self.compresslevel))
+        # limit the memory taken by chunks waiting to be written
+        while len(self.pending_chunks) > 2 * self.max_workers:
+            self.__write_oldest_chunk()
+
+    def __write_oldest_chunk(self):
+        self.fd.write(self.pending_chunks.popleft().result())
+
+    def isatty(self):
+        return False
+
+    def fileno(self):
+        raise io.UnsupportedOperation("ParallelBZ2Writer does not have a fileno")
+
+    def seekable(self):
+        return False
+
+    def readable(self):
+        return False
+
+    def writable(self):
+        return self.fd is not None
+
+    def tell(self):
+        """ position in the uncompressed stream """
+        return self.uncompressed_size
+
+    def write(self, buff):
+        self.current_chunk += buff
+        while len(self.current_chunk) >= self.chunk_size:
+            self.__compress_chunk(bytes(self.current_chunk[:self.chunk_size]))
+            del self.current_chunk[:self.chunk_size]
+        num_written = memoryview(buff).nbytes
+        self.uncompressed_size += num_written
+        return num_written
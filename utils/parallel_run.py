@@ -4,12 +4,12 @@
 import subprocess
 import sys
 import os
-import time
 import signal
+import selectors
+import threading
+import time
 import logging
 import psutil
-from itertools import repeat
-from concurrent import futures
 from threading import Timer
 
 import utils
@@ -46,8 +46,7 @@ def run_processes_in_parallel(commands, shell=False, do_enqueue_output=True, abo
         lists_of_command_lists = utils.partition_list(commands, lambda c: c[0] == "wait")
 
         for command_list in lists_of_command_lists:
-            with futures.ThreadPoolExecutor(len(command_list)) as executor:
-                list(executor.map(run_process, command_list, repeat(shell), repeat(do_enqueue_output), repeat(abort_file)))
+            run_process_group(command_list, shell, do_enqueue_output, abort_file)
         log.debug('Finished all processes')
         exit_val = 0
         killall_and_exit()
@@ -64,35 +63,61 @@ def run_process(command, shell, do_enqueue_output=True, abort_file=None):
         shell: Running the command in a shell
         do_enqueue_output: Printing sub-process output to the log file.
                            Should be used only when calling processes that are not instl.
-                           The option blocks the main process and can't be used when using abort_file.
         abort_file: Using an abort file to monitor and killing the process in case the file was deleted.
-                    This option overrides do_enqueue_output to be able to monitor the abort file.
+                    This option overrides do_enqueue_output.
+    """
+    run_process_group([command], shell, do_enqueue_output, abort_file)
+
+
+def run_process_group(command_list, shell, do_enqueue_output=True, abort_file=None):
+    """
+    Run all commands in command_list concurrently and wait for all of them to finish.
+    The supervising thread does not poll: output of all processes is read as it arrives
+    by OutputLogger, and the processes are waited for with blocking waits.
+    Termination because of a deleted abort_file is detected by a watchdog timer which kills the processes.
+    If some commands failed, the exception of the first one (in command_list order) is raised
+    after all processes have finished.
     """
     global exit_val
     global process_list
     if abort_file is not None:  # Disabling enqueue_output if abort file is used.
         do_enqueue_output = False
-    a_process = launch_process(command, shell, do_enqueue_output)
-    process_list.append(a_process)
+    launched = list()  # (command, process or the exception raised when launching)
     t = None
     if abort_file is not None:
         t = ContinuousTimer(1, check_abort_file, args=[abort_file])
         t.start()
 
     try:
-        while True:
-            if do_enqueue_output:  # Calling enqueue_output only if abort file is not used.
-                enqueue_output(a_process)
-            status = a_process.poll()
-            if status is not None:  # None means it's still alive
+        for command in command_list:
+            try:
+                a_process = launch_process(command, shell, do_enqueue_output)
+                process_list.append(a_process)
+                launched.append((command, a_process))
+            except RuntimeError as ex:
+                launched.append((command, ex))
+
+        if do_enqueue_output:
+            OutputLogger([a_process for command, a_process in launched if isinstance(a_process, subprocess.Popen)]).log_until_closed()
+
+        first_error = None
+        for command, a_process in launched:
+            if isinstance(a_process, Exception):
+                error = a_process
+            else:
+                status = a_process.wait()
                 log.debug(f'Process finished - {command}')
+                error = None
                 if aborted:
                     exit_val = status
-                    raise ProcessTerminatedExternally(command)
+                    error = ProcessTerminatedExternally(command)
                 elif status != 0:
                     exit_val = status
-                    raise RuntimeError(f'Command failed {command}')
-                break
+                    error = RuntimeError(f'Command failed {command}')
+            if first_error is None:
+                first_error = error
+        if first_error is not None:
+            raise first_error
     finally:
         if t is not None:
             t.cancel()
@@ -109,7 +134,7 @@ def launch_process(command, shell, do_enqueue_output):
     if getattr(os, "setsid", None):  # UNIX
         kwargs['preexec_fn'] = os.setsid
     if do_enqueue_output:
-        kwargs.update({'stdout': subprocess.PIPE, 'stderr': subprocess.PIPE, 'bufsize': 128})
+        kwargs.update({'stdout': subprocess.PIPE, 'stderr': subprocess.PIPE, 'bufsize': 0})
     try:
         a_process = subprocess.Popen(full_command, shell=shell, env=os.environ, **kwargs)
     except Exception as e:
@@ -118,31 +143,90 @@ def launch_process(command, shell, do_enqueue_output):
     return a_process
 
 
-def enqueue_output(a_process):
-    out = a_process.stdout
-    try:
-        buffer = ''
-        while True:
-            time.sleep(0)  # Releasing thread to yield other threads to do work
-            if a_process.poll() is not None:
-                break
-            b = out.read(128).decode('utf-8', errors='backslashreplace')  # Reading stream to buffer
-            if b:
-                buffer += b
-                if '\n' in buffer:
-                    to_print = buffer.split('\n')
-                    for line in to_print[:-1]:  # Logging every line except the last one in the buffer
-                        log.info(line.strip('\r\n'))
-                    if to_print[-1].endswith('\n'):  # In case the last line in the buffer ends with a newline
-                        log.info(to_print[-1].strip('\r\n'))
-                    else:
-                        buffer = to_print[-1]  # Store the rest for the next round of read
-
-    except ValueError as e:
-        pass  # on mac the stdout is closed when the process is terminated. In this case we ignore
-    finally:
-        if not out.closed:
-            out.close()
+class OutputLogger:
+    """
+    Log, line by line, the stdout & stderr of several processes as the output arrives.
+    On Unix all pipes are multiplexed with one selector in the calling thread.
+    On Windows pipes cannot be selected, so each pipe is drained by a thread doing blocking reads.
+    Either way nothing spins while the processes are quiet.
+    """
+    read_size = 64 * 1024
+    idle_timeout = 1.0  # seconds without output after which exited processes are checked
+
+    def __init__(self, processes) -> None:
+        self.pipes = dict()  # pipe -> (process, partial last line)
+        for a_process in processes:
+            for pipe in (a_process.stdout, a_process.stderr):
+                if pipe is not None:
+                    self.pipes[pipe] = [a_process, b'']
+
+    def log_until_closed(self):
+        if sys.platform == 'win32':
+            self.log_with_threads()
+        else:
+            self.log_with_selector()
+
+    def log_with_selector(self):
+        with selectors.DefaultSelector() as selector:
+            for pipe in self.pipes:
+                selector.register(pipe, selectors.EVENT_READ)
+            while selector.get_map():
+                events = selector.select(timeout=self.idle_timeout)
+                for key, _ in events:
+                    if not self.read_available(key.fileobj):
+                        selector.unregister(key.fileobj)
+                        self.close_pipe(key.fileobj)
+                if not events:
+                    # a process that has exited might have left its pipes open in a child process
+                    # that still runs in the background, stop waiting for such pipes
+                    for key in list(selector.get_map().values()):
+                        if self.pipes[key.fileobj][0].poll() is not None:
+                            selector.unregister(key.fileobj)
+                            self.close_pipe(key.fileobj)
+
+    def log_with_threads(self):
+        last_read_time = {pipe: time.monotonic() for pipe in self.pipes}
+
+        def drain(pipe):
+            while self.read_available(pipe):
+                last_read_time[pipe] = time.monotonic()
+            self.close_pipe(pipe)
+        readers = {pipe: threading.Thread(target=drain, args=(pipe,), daemon=True) for pipe in self.pipes}
+        for reader in readers.values():
+            reader.start()
+        while readers:
+            for pipe, reader in list(readers.items()):
+                reader.join(timeout=self.idle_timeout)
+                if not reader.is_alive():
+                    del readers[pipe]
+                elif self.pipes[pipe][0].poll() is not None and time.monotonic() - last_read_time[pipe] >= self.idle_timeout:
+                    # same as the idle check in log_with_selector: a child that still runs in the background
+                    # might hold the pipe of an exited process open, stop waiting for the (daemon) reader
+                    del readers[pipe]
+
+    def read_available(self, pipe):
+        """ read once from pipe and log the complete lines, return False when pipe reached EOF """
+        try:
+            data = os.read(pipe.fileno(), self.read_size)
+        except (OSError, ValueError):  # on mac the stdout is closed when the process is terminated
+            data = b''
+        if data:
+            lines = (self.pipes[pipe][1] + data).split(b'\n')
+            self.pipes[pipe][1] = lines.pop()  # Store the incomplete last line for the next read
+            for line in lines:
+                self.log_line(line)
+        return len(data) > 0
+
+    def close_pipe(self, pipe):
+        if self.pipes[pipe][1]:
+            self.log_line(self.pipes[pipe][1])
+            self.pipes[pipe][1] = b''
+        if not pipe.closed:
+            pipe.close()
+
+    @staticmethod
+    def log_line(line):
+        log.info(line.decode('utf-8', errors='backslashreplace').strip('\r\n'))
 
 
 def check_abort_file(abort_file):
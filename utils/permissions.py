@@ -0,0 +1,191 @@
+#!/usr/bin/env python3.12
+
+import os
+import re
+import stat
+import threading
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+
+"""
+    RecursivePermissions changes the mode, owner and flags of a file or of a whole folder tree
+    in-process, instead of calling chmod -R, chown -R or chflags -R.
+    Each item is lstat'ed once, and items that already have the required mode/owner/flags are not touched.
+    Symbolic links are not followed: the owner of a link is changed with lchown,
+    mode and flags of links are not changed (chmod -R does the same).
+    Sub-folders of the top folder can be processed in parallel by several threads.
+    With dry_run=True nothing is changed, only the statistics of what would have changed are collected.
+
+    Example:
+        changer = RecursivePermissions(mode="a+rwX", user_id=501, group_id=20, max_workers=4)
+        statistics = changer("/path/to/folder")
+        if changer.errors:
+            ...
+"""
+
+who_masks = {'u': stat.S_ISUID | stat.S_IRWXU,
+             'g': stat.S_ISGID | stat.S_IRWXG,
+             'o': stat.S_ISVTX | stat.S_IRWXO}
+who_masks['a'] = who_masks['u'] | who_masks['g'] | who_masks['o']
+perm_bits = {'r': 0o444, 'w': 0o222, 'x': 0o111, 's': stat.S_ISUID | stat.S_ISGID, 't': stat.S_ISVTX}
+all_exec = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+
+symbolic_clause_re = re.compile(r"""^(?P<who>[ugoa]*)(?P<actions>([+\-=][rwxXst]*)+)$""")
+symbolic_action_re = re.compile(r"""(?P<operation>[+\-=])(?P<perm>[rwxXst]*)""")
+octal_mode_re = re.compile(r"""^(0o)?(?P<octal>[0-7]{1,4})$""")
+
+
+def parse_chmod_mode(mode):
+    """ parse a chmod mode: a number, an octal string (e.g. "755") or a symbolic string (e.g. "u+rwx,go+rX")
+        return a list of actions, each a tuple (who_mask, operation, bits, conditional_exec)
+        that can be applied with apply_chmod_mode
+        raise ValueError if mode cannot be parsed
+    """
+    retVal = list()
+    if isinstance(mode, int):
+        retVal.append((0o7777, '=', stat.S_IMODE(mode), False))
+        return retVal
+    octal_match = octal_mode_re.match(mode)
+    if octal_match:
+        retVal.append((0o7777, '=', int(octal_match.group('octal'), 8), False))
+        return retVal
+    for clause in mode.split(","):
+        clause_match = symbolic_clause_re.match(clause)
+        if not clause_match:
+            raise ValueError(f"invalid symbolic mode for chmod: {mode}")
+        who_mask = 0
+        for w in clause_match.group('who') or 'a':
+            who_mask |= who_masks[w]
+        for action_match in symbolic_action_re.finditer(clause_match.group('actions')):
+            bits = 0
+            for p in action_match.group('perm'):
+                if p != 'X':
+                    bits |= perm_bits[p]
+            retVal.append((who_mask, action_match.group('operation'), bits & who_mask, 'X' in action_match.group('perm')))
+    return retVal
+
+
+def apply_chmod_mode(chmod_actions, current_mode, is_dir):
+    """ return the mode resulting from applying chmod_actions (as returned by parse_chmod_mode) to current_mode
+        'X' means exec permission for folders, and for files that already have some exec permission
+    """
+    retVal = stat.S_IMODE(current_mode)
+    for who_mask, operation, bits, conditional_exec in chmod_actions:
+        if conditional_exec and (is_dir or retVal & all_exec):
+            bits |= all_exec & who_mask
+        if operation == '+':
+            retVal |= bits
+        elif operation == '-':
+            retVal &= ~bits
+        else:
+            retVal = (retVal & ~who_mask) | bits
+    return retVal
+
+
+class RecursivePermissions(object):
+    default_max_workers = 1
+
+    @classmethod
+    def set_default_max_workers(cls, max_workers):
+        cls.default_max_workers = max(1, int(max_workers))
+
+    def __init__(self, mode=None, user_id=-1, group_id=-1, flags_to_set=0, flags_to_clear=0,
+                 recursive=True, max_workers=None, dry_run=False) -> None:
+        self.chmod_actions = parse_chmod_mode(mode) if mode is not None else None
+        self.user_id = int(user_id)
+        self.group_id = int(group_id)
+        self.flags_to_set = flags_to_set
+        self.flags_to_clear = flags_to_clear
+        if not hasattr(os, "chflags"):  # flags are not supported on this platform (e.g. linux)
+            self.flags_to_set = self.flags_to_clear = 0
+        self.recursive = recursive
+        self.max_workers = max_workers or RecursivePermissions.default_max_workers
+        self.dry_run = dry_run
+        self.statistics = Counter()
+        self.errors = list()  # list of (path, exception) for items that could not be changed
+        self.lock = threading.Lock()
+
+    def __call__(self, top_path):
+        """ change top_path and, if recursive, everything under it
+            raise FileNotFoundError if top_path does not exist, other errors are collected in self.errors
+        """
+        top_path = os.fspath(top_path)
+        top_stat = os.lstat(top_path)
+        statistics = Counter()
+        self.change_item(top_path, top_stat, statistics)
+        self.add_statistics(statistics)
+        if self.recursive and stat.S_ISDIR(top_stat.st_mode):
+            sub_folders = self.change_folder_items(top_path)
+            if self.max_workers > 1 and len(sub_folders) > 1:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    list(executor.map(self.change_tree, sub_folders))
+            else:
+                for sub_folder in sub_folders:
+                    self.change_tree(sub_folder)
+        return self.statistics
+
+    def change_tree(self, top_folder):
+        """ change all items under top_folder, top_folder itself was already changed """
+        folders_to_scan = [top_folder]
+        while folders_to_scan:
+            folders_to_scan.extend(self.change_folder_items(folders_to_scan.pop()))
+
+    def change_folder_items(self, folder):
+        """ change the items directly under folder, return the list of sub-folders """
+        retVal = list()
+        statistics = Counter()
+        try:
+            with os.scandir(folder) as it:
+                for item in it:
+                    try:
+                        item_stat = item.stat(follow_symlinks=False)
+                    except OSError as ex:
+                        self.add_error(item.path, ex)
+                        continue
+                    self.change_item(item.path, item_stat, statistics)
+                    if stat.S_ISDIR(item_stat.st_mode):
+                        retVal.append(item.path)
+        except OSError as ex:
+            self.add_error(folder, ex)
+        self.add_statistics(statistics)
+        return retVal
+
+    def change_item(self, item_path, item_stat, statistics):
+        statistics["examined"] += 1
+        is_link = stat.S_ISLNK(item_stat.st_mode)
+        try:
+            # flags are changed first, since e.g. a locked file's mode cannot be changed
+            if (self.flags_to_set or self.flags_to_clear) and not is_link:
+                new_flags = (item_stat.st_flags | self.flags_to_set) & ~self.flags_to_clear
+                if new_flags != item_stat.st_flags:
+                    if not self.dry_run:
+                        os.chflags(item_path, new_flags, follow_symlinks=False)
+                    statistics["flags_changed"] += 1
+            if (self.user_id, self.group_id) != (-1, -1):
+                if (self.user_id not in (-1, item_stat.st_uid)) or (self.group_id not in (-1, item_stat.st_gid)):
+                    if not self.dry_run:
+                        os.chown(item_path, self.user_id, self.group_id, follow_symlinks=False)
+                        # chown clears the setuid/setgid bits, so the mode is calculated from the current stat
+                        item_stat = os.lstat(item_path)
+                    statistics["owner_changed"] += 1
+            if self.chmod_actions is not None and not is_link:
+                new_mode = apply_chmod_mode(self.chmod_actions, item_stat.st_mode, stat.S_ISDIR(item_stat.st_mode))
+                if new_mode != stat.S_IMODE(item_stat.st_mode):
+                    if not self.dry_run:
+                        os.chmod(item_path, new_mode)
+                    statistics["mode_changed"] += 1
+        except OSError as ex:
+            self.add_error(item_path, ex)
+
+    def add_statistics(self, statistics):
+        with self.lock:
+            self.statistics.update(statistics)
+
+    def add_error(self, item_path, ex):
+        log.debug(f"failed to change permissions of {item_path}: {ex}")
+        with self.lock:
+            self.errors.append((item_path, ex))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3.12
+
+"""
+    benchmark reading split files with MultiFileReader against reading the same data from one file,
+    both by reading in small chunks (the way tarfile and bz2 read) and by unwtarring a split wtar.
+    Run from the repository root:
+        python -m utils.test.benchmark_multi_file [size_in_MB] [num_parts]
+"""
+
+import os
+import sys
+import time
+import tarfile
+import tempfile
+from pathlib import Path
+
+import utils
+
+
+def read_in_chunks(fd, chunk_size):
+    num_read = 0
+    buff = fd.read(chunk_size)
+    while buff:
+        num_read += len(buff)
+        buff = fd.read(chunk_size)
+    return num_read
+
+
+def readinto_in_chunks(fd, chunk_size):
+    num_read = 0
+    buff = bytearray(chunk_size)
+    num_read_now = fd.readinto(buff)
+    while num_read_now:
+        num_read += num_read_now
+        num_read_now = fd.readinto(buff)
+    return num_read
+
+
+def split_file(file_path, num_parts):
+    data = Path(file_path).read_bytes()
+    part_size = -(-len(data) // num_parts)
+    retVal = list()
+    for i in range(num_parts):
+        part_path = Path(f"{file_path}.a{chr(ord('a') + i)}")
+        part_path.write_bytes(data[i * part_size:(i + 1) * part_size])
+        retVal.append(part_path)
+    return retVal
+
+
+def time_it(what, func):
+    time1 = time.perf_counter()
+    result = func()
+    time2 = time.perf_counter()
+    print(f"{what}: {time2 - time1:.3f} seconds ({result})")
+
+
+def main(size_in_mb, num_parts):
+    with tempfile.TemporaryDirectory() as temp_folder:
+        data_path = Path(temp_folder, "data.bin")
+        data_path.write_bytes(os.urandom(size_in_mb * 1024 * 1024))
+        data_parts = split_file(data_path, num_parts)
+
+        for read_func in (read_in_chunks, readinto_in_chunks):
+            for chunk_size in (512, 64 * 1024):
+                def read_one_file():
+                    with open(data_path, "rb") as fd:
+                        return read_func(fd, chunk_size)
+
+                def read_split_files():
+                    with utils.MultiFileReader("rb", data_parts) as fd:
+                        return read_func(fd, chunk_size)
+
+                time_it(f"{read_func.__name__}({chunk_size}) one file", read_one_file)
+                time_it(f"{read_func.__name__}({chunk_size}) {num_parts} parts", read_split_files)
+
+        def readall_one_file():
+            with open(data_path, "rb") as fd:
+                return len(fd.read())
+
+        def readall_split_files():
+            with utils.MultiFileReader("rb", data_parts) as fd:
+                return len(fd.read())
+
+        time_it("read() one file", readall_one_file)
+        time_it(f"read() {num_parts} parts", readall_split_files)
+
+        folder_to_wtar = Path(temp_folder, "folder")
+        folder_to_wtar.mkdir()
+        for i in range(16):
+            folder_to_wtar.joinpath(f"file{i}.bin").write_bytes(os.urandom(size_in_mb * 1024 * 1024 // 16))
+        wtar_path = Path(temp_folder, "folder.wtar")
+        with tarfile.open(wtar_path, "w:bz2", compresslevel=1) as tar:
+            tar.add(folder_to_wtar, arcname="folder")
+        wtar_parts = split_file(wtar_path, num_parts)
+
+        def unwtar(fd, where):
+            with tarfile.open(fileobj=fd) as tar:
+                tar.extractall(Path(temp_folder, where))
+            return "extracted"
+
+        def unwtar_one_file():
+            with open(wtar_path, "rb") as fd:
+                return unwtar(fd, "unwtarred_one")
+
+        def unwtar_split_files():
+            with utils.MultiFileReader("br", wtar_parts) as fd:
+                return unwtar(fd, "unwtarred_split")
+
+        time_it("unwtar one file", unwtar_one_file)
+        time_it(f"unwtar {num_parts} parts", unwtar_split_files)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 256,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 8)
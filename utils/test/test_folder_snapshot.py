@@ -0,0 +1,66 @@
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils import FolderSnapshot, ChecksumCache, get_file_checksum
+
+
+class TestFolderSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_folder = tempfile.TemporaryDirectory()
+        self.top = Path(self.temp_folder.name, "sync")
+        for partial_path in ("Mac/a/1.txt", "Mac/a/2.txt", "Mac/b/c/3.txt", "Mac/b/4.txt", "Mac/d/.DS_Store",
+                             "bookkeeping/have.txt", "top.txt"):
+            self.top.joinpath(partial_path).parent.mkdir(parents=True, exist_ok=True)
+            self.top.joinpath(partial_path).write_text(partial_path)
+        self.top.joinpath("Mac", "empty").mkdir()
+        self.snapshot = FolderSnapshot(self.top).scan()
+
+    def tearDown(self):
+        self.temp_folder.cleanup()
+
+    def test_scan(self):
+        self.assertEqual(len(self.snapshot), 14)  # 7 files, 7 folders
+        self.assertTrue(stat.S_ISDIR(self.snapshot.entries["Mac/b/c"].st_mode))
+        file_stat = os.stat(self.top.joinpath("Mac", "b", "c", "3.txt"))
+        snapshot_stat = self.snapshot.entries["Mac/b/c/3.txt"]
+        self.assertEqual((snapshot_stat.st_mode, snapshot_stat.st_size, snapshot_stat.st_mtime_ns, snapshot_stat.st_ino),
+                         (file_stat.st_mode, file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino))
+
+    def test_stat(self):
+        with mock.patch("os.stat", side_effect=AssertionError("os.stat should not be called")):
+            self.assertEqual(self.snapshot.stat(self.top.joinpath("Mac", "a", "1.txt")).st_size, len("Mac/a/1.txt"))
+        # paths not in the snapshot are stat'ed from disk
+        self.top.joinpath("Mac", "new.txt").write_text("new")
+        self.assertEqual(self.snapshot.stat(self.top.joinpath("Mac", "new.txt")).st_size, 3)
+        with self.assertRaises(FileNotFoundError):
+            self.snapshot.stat(self.top.joinpath("Mac", "missing.txt"))
+        self.assertEqual((self.snapshot.num_hits, self.snapshot.num_misses), (1, 2))
+
+    def test_need_to_download_file(self):
+        file_path = os.fspath(self.top.joinpath("Mac", "a", "2.txt"))
+        checksum = get_file_checksum(file_path)
+        with ChecksumCache() as cache:
+            cache.folder_snapshot = self.snapshot
+            with mock.patch("os.stat", side_effect=AssertionError("os.stat should not be called")):
+                self.assertFalse(cache.need_to_download_file(file_path, checksum))
+                self.assertTrue(cache.need_to_download_file(file_path, "0" * 40))
+            self.assertTrue(cache.need_to_download_file(os.fspath(self.top.joinpath("Mac", "missing.txt")), checksum))
+
+    def test_top_folders_emptied_by_removing(self):
+        self.assertEqual(self.snapshot.top_folders_emptied_by_removing([]), ["Mac/empty"])
+        self.assertEqual(self.snapshot.top_folders_emptied_by_removing(["Mac/a/1.txt"]), ["Mac/empty"])
+        self.assertEqual(self.snapshot.top_folders_emptied_by_removing(["Mac/a/1.txt", "Mac/a/2.txt", "Mac/b/c/3.txt"]),
+                         ["Mac/a", "Mac/b/c", "Mac/empty"])
+        self.assertEqual(self.snapshot.top_folders_emptied_by_removing(["Mac/b/c/3.txt", "Mac/b/4.txt"], files_to_ignore=[r"\.DS_Store"]),
+                         ["Mac/b", "Mac/d", "Mac/empty"])
+        all_mac_files = ["Mac/a/1.txt", "Mac/a/2.txt", "Mac/b/c/3.txt", "Mac/b/4.txt", "Mac/d/.DS_Store"]
+        self.assertEqual(self.snapshot.top_folders_emptied_by_removing(all_mac_files), ["Mac"])
+        self.assertEqual(self.snapshot.top_folders_emptied_by_removing(all_mac_files + ["bookkeeping/have.txt", "top.txt"]), [""])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils import MultiFileReader
+
+
+class TestMultiFileReader(unittest.TestCase):
+    def setUp(self):
+        self.temp_folder = tempfile.TemporaryDirectory()
+        part_sizes = (3000, 0, 1, 4000, 0, 1999)  # empty parts should be skipped
+        self.data = os.urandom(sum(part_sizes))
+        self.parts = list()
+        start = 0
+        for i, part_size in enumerate(part_sizes):
+            part_path = Path(self.temp_folder.name, f"data.wtar.a{chr(ord('a') + i)}")
+            part_path.write_bytes(self.data[start:start + part_size])
+            self.parts.append(part_path)
+            start += part_size
+
+    def tearDown(self):
+        self.temp_folder.cleanup()
+
+    def test_read(self):
+        for chunk_size in (1, 7, 512, 2999, 3000, 3001, 100000):
+            with MultiFileReader("rb", self.parts) as fd:
+                buffs = list()
+                buff = fd.read(chunk_size)
+                while buff:
+                    self.assertLessEqual(len(buff), chunk_size)
+                    buffs.append(buff)
+                    buff = fd.read(chunk_size)
+                self.assertEqual(b"".join(buffs), self.data, f"chunk_size={chunk_size}")
+                self.assertEqual(fd.tell(), len(self.data))
+        with MultiFileReader("rb", self.parts) as fd:
+            self.assertEqual(fd.read(), self.data)
+            self.assertEqual(fd.read(), b"")
+
+    def test_readinto(self):
+        with MultiFileReader("rb", self.parts) as fd:
+            buff = bytearray(2500)
+            self.assertEqual(fd.readinto(buff), 2500)
+            self.assertEqual(buff, self.data[:2500])
+            self.assertEqual(fd.readinto(buff), 2500)  # crossing from first part to fourth
+            self.assertEqual(buff, self.data[2500:5000])
+            array_buff = memoryview(bytearray(8000)).cast("I")  # not a byte buffer
+            self.assertEqual(fd.readinto(array_buff), 4000)
+            self.assertEqual(array_buff.tobytes()[:4000], self.data[5000:])
+            self.assertEqual(fd.readinto(buff), 0)
+
+        # with readinto MultiFileReader can be wrapped with io.BufferedReader
+        with MultiFileReader("rb", self.parts) as fd:
+            self.assertEqual(io.BufferedReader(fd, buffer_size=4096).read(), self.data)
+
+    def test_seek(self):
+        with MultiFileReader("rb", self.parts) as fd:
+            for pos in (0, 1, 2999, 3000, 3001, 7000, 7001, 8999, 9000, 5):
+                self.assertEqual(fd.seek(pos), pos)
+                self.assertEqual(fd.tell(), pos)
+                self.assertEqual(fd.read(10), self.data[pos:pos + 10], f"pos={pos}")
+            fd.seek(-10, io.SEEK_END)
+            self.assertEqual(fd.read(), self.data[-10:])
+            fd.seek(100)
+            fd.seek(-50, io.SEEK_CUR)
+            self.assertEqual(fd.read(3000), self.data[50:3050])
+
+    def test_text(self):
+        text_parts = list()
+        for i, text in enumerate(("abc", "", "def\nghi")):
+            text_path = Path(self.temp_folder.name, f"text{i}.txt")
+            text_path.write_text(text)
+            text_parts.append(text_path)
+        with MultiFileReader("r", text_parts) as fd:
+            self.assertEqual(fd.read(4), "abcd")
+            self.assertEqual(fd.read(), "ef\nghi")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import sys
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils import RecursivePermissions, parse_chmod_mode, apply_chmod_mode
+
+
+class TestChmodMode(unittest.TestCase):
+    def apply(self, mode, current_mode, is_dir=False):
+        return apply_chmod_mode(parse_chmod_mode(mode), current_mode, is_dir)
+
+    def test_symbolic(self):
+        self.assertEqual(self.apply("u+rwx,go+rx", 0o600), 0o755)
+        self.assertEqual(self.apply("a+rw", 0o644), 0o666)
+        self.assertEqual(self.apply("go-w", 0o777), 0o755)
+        self.assertEqual(self.apply("u=rw", 0o777), 0o677)
+        self.assertEqual(self.apply("a=r", 0o4777), 0o444)
+        self.assertEqual(self.apply("u+x-w", 0o644), 0o544)
+        self.assertEqual(self.apply("+x", 0o644), 0o755)
+
+    def test_big_X(self):
+        self.assertEqual(self.apply("a+X", 0o644), 0o644)
+        self.assertEqual(self.apply("a+X", 0o744), 0o755)
+        self.assertEqual(self.apply("a+X", 0o644, is_dir=True), 0o755)
+
+    def test_numeric(self):
+        self.assertEqual(self.apply(0o750, 0o644), 0o750)
+        self.assertEqual(self.apply("750", 0o644), 0o750)
+
+    def test_invalid(self):
+        for bad_mode in ("a=rwi", "", "u+r,", "z+x"):
+            with self.assertRaises(ValueError, msg=bad_mode):
+                parse_chmod_mode(bad_mode)
+
+
+@unittest.skipIf(sys.platform == 'win32', "posix only test")
+class TestRecursivePermissions(unittest.TestCase):
+    def setUp(self):
+        self.temp_folder = tempfile.TemporaryDirectory()
+        self.top = Path(self.temp_folder.name, "top")
+        self.num_items = 1  # top
+        for sub in ("a", "b", "c/d"):
+            sub_folder = self.top.joinpath(sub)
+            sub_folder.mkdir(parents=True)
+            for i in range(5):
+                sub_folder.joinpath(f"file{i}").write_text(sub)
+        self.num_items += 4 + 15  # 4 folders, 15 files
+        self.top.joinpath("a", "link").symlink_to("file0")
+        self.num_items += 1
+        for item in self.top.rglob("*"):
+            if not item.is_symlink():
+                os.chmod(item, 0o700 if item.is_dir() else 0o600)
+        os.chmod(self.top, 0o700)
+
+    def tearDown(self):
+        self.temp_folder.cleanup()
+
+    def modes(self):
+        return {os.fspath(item): stat.S_IMODE(item.lstat().st_mode) for item in [self.top, *self.top.rglob("*")]}
+
+    def test_dry_run(self):
+        modes_before = self.modes()
+        statistics = RecursivePermissions(mode="u+rwx,go+rx", dry_run=True)(self.top)
+        self.assertEqual(statistics["examined"], self.num_items)
+        self.assertEqual(statistics["mode_changed"], self.num_items - 1)  # symlink mode is not changed
+        self.assertEqual(self.modes(), modes_before)
+
+    def test_change_and_skip_unchanged(self):
+        for max_workers in (1, 4):
+            changer = RecursivePermissions(mode="a+rX", max_workers=max_workers)
+            statistics = changer(self.top)
+            self.assertEqual(changer.errors, [])
+            self.assertEqual(statistics["mode_changed"], self.num_items - 1)
+            for item_path, item_mode in self.modes().items():
+                if not os.path.islink(item_path):
+                    self.assertEqual(item_mode, 0o755 if os.path.isdir(item_path) else 0o644, item_path)
+            # second time nothing needs to change
+            statistics = RecursivePermissions(mode="a+rX", max_workers=max_workers)(self.top)
+            self.assertEqual(statistics["examined"], self.num_items)
+            self.assertEqual(statistics["mode_changed"], 0)
+            RecursivePermissions(mode="go-rx")(self.top)
+
+    def test_not_recursive(self):
+        statistics = RecursivePermissions(mode="a+rX", recursive=False)(self.top)
+        self.assertEqual(statistics["examined"], 1)
+        self.assertEqual(stat.S_IMODE(self.top.stat().st_mode), 0o755)
+        self.assertEqual(stat.S_IMODE(self.top.joinpath("a").stat().st_mode), 0o700)
+
+    @unittest.skipUnless(hasattr(os, "geteuid") and os.geteuid() == 0, "changing owner requires root")
+    def test_owner(self):
+        changer = RecursivePermissions(user_id=12345, group_id=-1, max_workers=2)
+        statistics = changer(self.top)
+        self.assertEqual(statistics["owner_changed"], self.num_items)
+        for item in [self.top, *self.top.rglob("*")]:
+            self.assertEqual(item.lstat().st_uid, 12345)
+        self.assertNotEqual(self.top.joinpath("a", "link").lstat().st_gid, 12345)
+        statistics = RecursivePermissions(user_id=12345, group_id=-1)(self.top)
+        self.assertEqual(statistics["owner_changed"], 0)
+
+    @unittest.skipUnless(hasattr(os, "geteuid") and os.geteuid() == 0, "changing owner requires root")
+    def test_owner_and_setuid(self):
+        """ chown clears setuid, so the mode should be set after changing the owner """
+        setuid_file = self.top.joinpath("a", "file1")
+        os.chmod(setuid_file, 0o4755)
+        changer = RecursivePermissions(user_id=12345, group_id=-1, mode="u+s", recursive=False)
+        changer(setuid_file)
+        self.assertEqual(changer.errors, [])
+        self.assertEqual(setuid_file.lstat().st_uid, 12345)
+        self.assertEqual(stat.S_IMODE(setuid_file.lstat().st_mode), 0o4755)
+
+    def test_missing(self):
+        with self.assertRaises(FileNotFoundError):
+            RecursivePermissions(mode="a+r")(self.top.joinpath("no-such-folder"))
+
+
+if __name__ == '__main__':
+    unittest.main()